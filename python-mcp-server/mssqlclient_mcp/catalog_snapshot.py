@@ -0,0 +1,604 @@
+"""Whole-database catalog snapshots loaded with a handful of set-based queries."""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import (
+    ForeignKey,
+    StoredProcedureInfo,
+    StoredProcedureParameter,
+    TableColumnInfo,
+    TableDescription,
+    TableIndex,
+    TableInfo,
+    TableSchemaInfo,
+)
+
+# sys.objects types kept in a snapshot: tables, views and procedures
+# (the same types sys.procedures lists)
+TABLE_TYPES = ("U", "V")
+PROCEDURE_TYPES = ("P", "PC", "X", "RF")
+
+# Above this many changed objects a refresh reloads all details rather than
+# listing the object ids in the detail queries
+MAX_INCREMENTAL_OBJECTS = 500
+
+# Most tables describe_tables returns per call (each name takes two of the
+# 2100 parameters a statement may have)
+MAX_DESCRIBED_TABLES = 500
+
+OBJECTS_QUERY = """
+    SELECT
+        o.object_id AS ObjectId,
+        s.name AS SchemaName,
+        o.name AS ObjectName,
+        RTRIM(o.type) AS ObjectType,
+        o.create_date AS CreateDate,
+        o.modify_date AS ModifyDate,
+        ISNULL(USER_NAME(o.principal_id), '') AS Owner
+    FROM sys.objects o
+    JOIN sys.schemas s ON o.schema_id = s.schema_id
+    WHERE o.is_ms_shipped = 0
+        AND o.type IN ('U', 'V', 'P', 'PC', 'X', 'RF')
+"""
+
+# Tables matched by describe_tables; {match} joins a VALUES table of
+# requested (schema, name) pairs or filters on a LIKE pattern
+TABLE_MATCH_QUERY = """
+    SELECT TOP (?)
+        o.object_id AS ObjectId,
+        s.name AS SchemaName,
+        o.name AS ObjectName,
+        RTRIM(o.type) AS ObjectType,
+        o.create_date AS CreateDate,
+        o.modify_date AS ModifyDate,
+        ISNULL(USER_NAME(o.principal_id), '') AS Owner
+    FROM sys.tables o
+    JOIN sys.schemas s ON o.schema_id = s.schema_id
+    {match}
+    WHERE o.is_ms_shipped = 0 {pattern_filter}
+    ORDER BY s.name, o.name
+"""
+
+COLUMNS_QUERY = """
+    SELECT
+        o.object_id AS ObjectId,
+        c.COLUMN_NAME,
+        c.DATA_TYPE,
+        CAST(ISNULL(c.CHARACTER_MAXIMUM_LENGTH, -1) AS VARCHAR(20)) AS MAX_LENGTH,
+        c.IS_NULLABLE
+    FROM INFORMATION_SCHEMA.COLUMNS c
+    JOIN sys.schemas s ON s.name = c.TABLE_SCHEMA
+    JOIN sys.objects o ON o.schema_id = s.schema_id AND o.name = c.TABLE_NAME
+    WHERE o.is_ms_shipped = 0 {object_filter}
+    ORDER BY o.object_id, c.ORDINAL_POSITION
+"""
+
+INDEXES_QUERY = """
+    SELECT
+        o.object_id AS ObjectId,
+        i.name AS IndexName,
+        i.type_desc AS IndexType,
+        i.is_primary_key AS IsPrimaryKey,
+        i.is_unique AS IsUnique,
+        i.is_unique_constraint AS IsUniqueConstraint,
+        STRING_AGG(
+            CASE WHEN ic.is_included_column = 0 THEN c.name ELSE NULL END,
+            ', '
+        ) WITHIN GROUP (ORDER BY ic.key_ordinal) AS KeyColumns,
+        STRING_AGG(
+            CASE WHEN ic.is_included_column = 1 THEN c.name ELSE NULL END,
+            ', '
+        ) AS IncludedColumns
+    FROM sys.indexes i
+    INNER JOIN sys.index_columns ic ON i.object_id = ic.object_id AND i.index_id = ic.index_id
+    INNER JOIN sys.columns c ON ic.object_id = c.object_id AND ic.column_id = c.column_id
+    INNER JOIN sys.tables o ON i.object_id = o.object_id
+    WHERE o.is_ms_shipped = 0 {object_filter}
+    GROUP BY o.object_id, i.index_id, i.name, i.type_desc, i.is_primary_key, i.is_unique, i.is_unique_constraint
+    ORDER BY o.object_id, i.index_id
+"""
+
+FOREIGN_KEYS_QUERY = """
+    SELECT
+        o.object_id AS ObjectId,
+        fk.name AS ForeignKeyName,
+        OBJECT_SCHEMA_NAME(fk.parent_object_id) + '.' + OBJECT_NAME(fk.parent_object_id) AS TableName,
+        COL_NAME(fkc.parent_object_id, fkc.parent_column_id) AS ColumnName,
+        OBJECT_SCHEMA_NAME(fk.referenced_object_id) + '.' + OBJECT_NAME(fk.referenced_object_id) AS ReferencedTable,
+        COL_NAME(fkc.referenced_object_id, fkc.referenced_column_id) AS ReferencedColumn,
+        fk.delete_referential_action_desc AS DeleteAction,
+        fk.update_referential_action_desc AS UpdateAction
+    FROM sys.foreign_keys fk
+    INNER JOIN sys.foreign_key_columns fkc ON fk.object_id = fkc.constraint_object_id
+    INNER JOIN sys.tables o ON fk.parent_object_id = o.object_id
+    WHERE o.is_ms_shipped = 0 {object_filter}
+    ORDER BY o.object_id, fk.name, fkc.constraint_column_id
+"""
+
+PARAMETERS_QUERY = """
+    SELECT
+        o.object_id AS ObjectId,
+        p.name AS ParameterName,
+        p.parameter_id AS ParameterId,
+        t.name AS DataType,
+        p.max_length AS MaxLength,
+        p.precision AS Precision,
+        p.scale AS Scale,
+        p.is_output AS IsOutput,
+        p.has_default_value AS HasDefaultValue,
+        CAST(p.default_value AS NVARCHAR(MAX)) AS DefaultValue,
+        p.is_nullable AS IsNullable
+    FROM sys.parameters p
+    JOIN sys.types t ON p.user_type_id = t.user_type_id
+    JOIN sys.procedures o ON p.object_id = o.object_id
+    WHERE o.is_ms_shipped = 0 {object_filter}
+    ORDER BY o.object_id, p.parameter_id
+"""
+
+
+@dataclass(slots=True)
+class CatalogObject:
+    """A table, view or procedure with the metadata the tools report for it."""
+
+    object_id: int
+    schema_name: str
+    name: str
+    object_type: str
+    create_date: datetime
+    modify_date: datetime
+    owner: str
+    columns: List[TableColumnInfo] = field(default_factory=list)
+    indexes: List[TableIndex] = field(default_factory=list)
+    foreign_keys: List[ForeignKey] = field(default_factory=list)
+    parameters: List[StoredProcedureParameter] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        """Lower-cased schema.name, matching the metadata cache's object keys."""
+        return f"{self.schema_name}.{self.name}".lower()
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of a database's catalog at one schema version.
+
+    Refreshing builds a new snapshot that shares the unchanged objects, so
+    callers holding an older snapshot are never disturbed.
+    """
+
+    def __init__(self, database_name: str, schema_version: str, objects: Dict[int, CatalogObject]):
+        """
+        Initialize the snapshot.
+
+        Args:
+            database_name: Name of the database, as reported by DB_NAME()
+            schema_version: Schema version the snapshot was loaded under
+            objects: Catalog objects by object_id
+        """
+        self.database_name = database_name
+        self.schema_version = schema_version
+        self.objects = objects
+        self._by_key = {obj.key: obj for obj in objects.values()}
+
+    def find(self, object_key: str, object_types: Iterable[str]) -> Optional[CatalogObject]:
+        """Look up an object by its normalized schema.name key."""
+        obj = self._by_key.get(object_key)
+        return obj if obj is not None and obj.object_type in object_types else None
+
+    def _sorted(self, object_types: Iterable[str]) -> List[CatalogObject]:
+        objects = [obj for obj in self.objects.values() if obj.object_type in object_types]
+        objects.sort(key=lambda obj: (obj.schema_name.lower(), obj.name.lower()))
+        return objects
+
+    def list_tables(self) -> List[TableInfo]:
+        """User tables in list_tables order, without row counts."""
+        return [
+            TableInfo(
+                schema=obj.schema_name,
+                name=obj.name,
+                create_date=obj.create_date,
+                modify_date=obj.modify_date,
+                row_count=None,
+                table_type="Normal",
+            )
+            for obj in self._sorted(("U",))
+        ]
+
+    def list_stored_procedures(self) -> List[StoredProcedureInfo]:
+        """Procedures in list_stored_procedures order."""
+        return [
+            StoredProcedureInfo(
+                schema_name=obj.schema_name,
+                name=obj.name,
+                create_date=obj.create_date,
+                modify_date=obj.modify_date,
+                owner=obj.owner,
+                is_function=obj.object_type != "P",
+                parameters=[],
+            )
+            for obj in self._sorted(PROCEDURE_TYPES)
+        ]
+
+    def table_schema(self, table_name: str, object_key: str) -> TableSchemaInfo:
+        """
+        Columns of a table or view.
+
+        Raises:
+            ValueError: If the table is not in the snapshot
+        """
+        obj = self.find(object_key, TABLE_TYPES)
+        if obj is None or not obj.columns:
+            raise ValueError(
+                f"Table '{table_name}' does not exist in database '{self.database_name}' "
+                "or you don't have permission to access it"
+            )
+        return TableSchemaInfo(
+            table_name=table_name,
+            database_name=self.database_name,
+            description="",
+            columns=list(obj.columns),
+        )
+
+    def table_indexes(self, object_key: str) -> List[TableIndex]:
+        """Indexes of a table, empty when the table is unknown."""
+        obj = self.find(object_key, ("U",))
+        return list(obj.indexes) if obj else []
+
+    def table_foreign_keys(self, object_key: str) -> List[ForeignKey]:
+        """Foreign keys declared on a table, empty when the table is unknown."""
+        obj = self.find(object_key, ("U",))
+        return list(obj.foreign_keys) if obj else []
+
+    def procedure_parameters(self, object_key: str) -> List[StoredProcedureParameter]:
+        """Parameters of a procedure, empty when the procedure is unknown."""
+        obj = self.find(object_key, PROCEDURE_TYPES)
+        return list(obj.parameters) if obj else []
+
+    def match_tables(
+        self, object_keys: Optional[List[str]], pattern: Optional[str], limit: int
+    ) -> List[CatalogObject]:
+        """Tables with the given keys, or whose names match a LIKE pattern."""
+        if object_keys is not None:
+            found = (self.find(key, ("U",)) for key in object_keys)
+            unique = {obj.object_id: obj for obj in found if obj is not None}
+            return sorted(unique.values(), key=lambda obj: (obj.schema_name.lower(), obj.name.lower()))[:limit]
+
+        regex = like_pattern_regex(pattern or "%")
+        return [
+            obj
+            for obj in self._sorted(("U",))
+            if regex.fullmatch(f"{obj.schema_name}.{obj.name}") or regex.fullmatch(obj.name)
+        ][:limit]
+
+
+def like_pattern_regex(pattern: str) -> "re.Pattern[str]":
+    """Translate a T-SQL LIKE pattern (%, _, [...]) to a case-insensitive regex."""
+    parts = []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        elif char == "[" and "]" in pattern[position + 1:]:
+            end = pattern.index("]", position + 1)
+            body = pattern[position + 1:end]
+            negate = body.startswith("^")
+            body = re.escape(body[1:] if negate else body).replace("\\-", "-")
+            parts.append(f"[{'^' if negate else ''}{body}]")
+            position = end
+        else:
+            parts.append(re.escape(char))
+        position += 1
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def describe_table(obj: CatalogObject) -> TableDescription:
+    """Combine the columns, indexes and foreign keys of a table."""
+    return TableDescription(
+        schema_name=obj.schema_name,
+        table_name=obj.name,
+        columns=list(obj.columns),
+        indexes=list(obj.indexes),
+        foreign_keys=list(obj.foreign_keys),
+    )
+
+
+def _read_objects(cursor: Any) -> Dict[int, CatalogObject]:
+    """Read the object list (names and modify dates only)."""
+    cursor.execute(OBJECTS_QUERY)
+    return {
+        row.ObjectId: CatalogObject(
+            object_id=row.ObjectId,
+            schema_name=row.SchemaName,
+            name=row.ObjectName,
+            object_type=row.ObjectType,
+            create_date=row.CreateDate,
+            modify_date=row.ModifyDate,
+            owner=row.Owner,
+        )
+        for row in cursor.fetchall()
+    }
+
+
+def _load_details(
+    cursor: Any,
+    objects: Dict[int, CatalogObject],
+    object_ids: Optional[Set[int]],
+    include_parameters: bool = True,
+) -> None:
+    """
+    Fill in columns, indexes, foreign keys and parameters.
+
+    Args:
+        cursor: Cursor on the snapshot's database
+        objects: Objects to fill in, by object_id
+        object_ids: Objects whose details to load, or None for all of them;
+            each detail query joins them as a VALUES table
+        include_parameters: Also load procedure parameters
+    """
+    params: Tuple[int, ...] = ()
+    object_filter = ""
+    if object_ids is not None:
+        if not object_ids:
+            return
+        params = tuple(sorted(object_ids))
+        values = ", ".join("(?)" for _ in params)
+        object_filter = f"AND o.object_id IN (SELECT w.id FROM (VALUES {values}) AS w(id))"
+
+    def rows(query: str) -> List[Any]:
+        cursor.execute(query.format(object_filter=object_filter), *params)
+        return [row for row in cursor.fetchall() if row.ObjectId in objects]
+
+    for row in rows(COLUMNS_QUERY):
+        objects[row.ObjectId].columns.append(
+            TableColumnInfo(
+                name=row.COLUMN_NAME,
+                data_type=row.DATA_TYPE,
+                max_length=row.MAX_LENGTH,
+                is_nullable=row.IS_NULLABLE,
+            )
+        )
+
+    for row in rows(INDEXES_QUERY):
+        objects[row.ObjectId].indexes.append(
+            TableIndex(
+                index_name=row.IndexName,
+                index_type=row.IndexType,
+                is_primary_key=bool(row.IsPrimaryKey),
+                is_unique=bool(row.IsUnique),
+                is_unique_constraint=bool(row.IsUniqueConstraint),
+                columns=row.KeyColumns.split(", ") if row.KeyColumns else [],
+                included_columns=row.IncludedColumns.split(", ") if row.IncludedColumns else [],
+            )
+        )
+
+    for row in rows(FOREIGN_KEYS_QUERY):
+        objects[row.ObjectId].foreign_keys.append(
+            ForeignKey(
+                constraint_name=row.ForeignKeyName,
+                table_name=row.TableName,
+                column_name=row.ColumnName,
+                referenced_table=row.ReferencedTable,
+                referenced_column=row.ReferencedColumn,
+                delete_action=row.DeleteAction,
+                update_action=row.UpdateAction,
+            )
+        )
+
+    if not include_parameters:
+        return
+
+    for row in rows(PARAMETERS_QUERY):
+        objects[row.ObjectId].parameters.append(
+            StoredProcedureParameter(
+                parameter_name=row.ParameterName,
+                parameter_id=row.ParameterId,
+                data_type=row.DataType,
+                max_length=row.MaxLength,
+                precision=row.Precision,
+                scale=row.Scale,
+                is_output=bool(row.IsOutput),
+                has_default_value=bool(row.HasDefaultValue),
+                default_value=row.DefaultValue,
+                is_nullable=bool(row.IsNullable),
+            )
+        )
+
+
+def load_catalog_snapshot(cursor: Any, database_name: str, schema_version: str) -> CatalogSnapshot:
+    """
+    Load a full snapshot: the object list plus one query per metadata kind.
+
+    Args:
+        cursor: Cursor on the database to snapshot
+        database_name: Name of the database, as reported by DB_NAME()
+        schema_version: Schema version read before loading
+
+    Returns:
+        The new snapshot
+    """
+    objects = _read_objects(cursor)
+    _load_details(cursor, objects, None)
+    return CatalogSnapshot(database_name, schema_version, objects)
+
+
+def describe_tables(
+    cursor: Any,
+    names: Optional[List[Tuple[str, str]]],
+    pattern: Optional[str],
+    limit: int = MAX_DESCRIBED_TABLES,
+) -> List[CatalogObject]:
+    """
+    Load the tables named, or matching a LIKE pattern, with all their details.
+
+    One query resolves the tables, then one query per metadata kind reads
+    columns, indexes and foreign keys for all of them at once.
+
+    Args:
+        cursor: Cursor on the database
+        names: (schema, table) pairs, or None to match on pattern
+        pattern: LIKE pattern matched against schema.table and table
+        limit: Most tables to return
+
+    Returns:
+        Matched tables in schema, name order
+    """
+    params: List[Any] = [limit]
+    match = ""
+    pattern_filter = ""
+    if names is not None:
+        if not names:
+            return []
+        values = ", ".join("(?, ?)" for _ in names)
+        match = (
+            f"JOIN (VALUES {values}) AS w(SchemaName, TableName) "
+            "ON s.name = w.SchemaName AND o.name = w.TableName"
+        )
+        for schema_name, table_name in names:
+            params.extend((schema_name, table_name))
+    else:
+        pattern_filter = "AND (s.name + '.' + o.name LIKE ? OR o.name LIKE ?)"
+        params.extend((pattern, pattern))
+
+    cursor.execute(TABLE_MATCH_QUERY.format(match=match, pattern_filter=pattern_filter), *params)
+    objects = {
+        row.ObjectId: CatalogObject(
+            object_id=row.ObjectId,
+            schema_name=row.SchemaName,
+            name=row.ObjectName,
+            object_type=row.ObjectType,
+            create_date=row.CreateDate,
+            modify_date=row.ModifyDate,
+            owner=row.Owner,
+        )
+        for row in cursor.fetchall()
+    }
+    _load_details(cursor, objects, set(objects), include_parameters=False)
+    return list(objects.values())
+
+
+def refresh_catalog_snapshot(
+    cursor: Any, snapshot: CatalogSnapshot, schema_version: str
+) -> Tuple[CatalogSnapshot, int]:
+    """
+    Bring a snapshot up to date by reloading only objects that changed.
+
+    An object is reloaded when it is new, or its modify_date or name moved.
+    Index and constraint changes bump their table's modify_date. Tables with
+    a foreign key to a changed or dropped table are reloaded too, since the
+    key reports the referenced table by name.
+
+    Args:
+        cursor: Cursor on the snapshot's database
+        snapshot: Snapshot to refresh (left unchanged)
+        schema_version: Schema version read before refreshing
+
+    Returns:
+        Tuple of (new snapshot, number of objects reloaded)
+    """
+    objects = _read_objects(cursor)
+
+    changed: Set[int] = set()
+    for object_id, obj in objects.items():
+        previous = snapshot.objects.get(object_id)
+        if previous is None or (previous.modify_date, previous.key) != (obj.modify_date, obj.key):
+            changed.add(object_id)
+
+    moved_names = {
+        previous.key
+        for object_id, previous in snapshot.objects.items()
+        if object_id in changed or object_id not in objects
+    }
+    for object_id, previous in snapshot.objects.items():
+        if object_id in objects and any(
+            fk.referenced_table.lower() in moved_names for fk in previous.foreign_keys
+        ):
+            changed.add(object_id)
+
+    # Unchanged objects carry over with their details
+    for object_id in objects.keys() - changed:
+        objects[object_id] = snapshot.objects[object_id]
+
+    if len(changed) > MAX_INCREMENTAL_OBJECTS:
+        reload = {object_id: objects[object_id] for object_id in changed}
+        _load_details(cursor, reload, None)
+    else:
+        _load_details(cursor, objects, changed)
+
+    return CatalogSnapshot(snapshot.database_name, schema_version, objects), len(changed)
+
+
+class CatalogSnapshotStore:
+    """Current catalog snapshot per (server, database), with load counters."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._snapshots: Dict[Tuple[str, str], CatalogSnapshot] = {}
+        self._lock = threading.Lock()
+        self._refresh_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._hits = 0
+        self._loads = 0
+        self._refreshes = 0
+        self._objects_reloaded = 0
+
+    def refresh_lock(self, server: str, database: str) -> threading.Lock:
+        """
+        Lock held while loading or refreshing one database's snapshot, so only
+        one caller queries its catalog while other databases stay available.
+        """
+        with self._lock:
+            return self._refresh_locks.setdefault((server, database), threading.Lock())
+
+    def get(self, server: str, database: str, schema_version: str) -> Optional[CatalogSnapshot]:
+        """Return the snapshot if it was loaded under the given schema version."""
+        with self._lock:
+            snapshot = self._snapshots.get((server, database))
+            if snapshot is not None and snapshot.schema_version == schema_version:
+                self._hits += 1
+                return snapshot
+            return None
+
+    def latest(self, server: str, database: str) -> Optional[CatalogSnapshot]:
+        """Return the snapshot regardless of its schema version."""
+        with self._lock:
+            return self._snapshots.get((server, database))
+
+    def put(
+        self, server: str, database: str, snapshot: CatalogSnapshot, objects_reloaded: Optional[int] = None
+    ) -> None:
+        """
+        Store a loaded or refreshed snapshot.
+
+        Args:
+            objects_reloaded: Objects reloaded by a refresh, None for a full load
+        """
+        with self._lock:
+            self._snapshots[(server, database)] = snapshot
+            if objects_reloaded is None:
+                self._loads += 1
+            else:
+                self._refreshes += 1
+                self._objects_reloaded += objects_reloaded
+
+    def clear(self) -> None:
+        """Drop all snapshots."""
+        with self._lock:
+            self._snapshots.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return snapshot sizes and load counters."""
+        with self._lock:
+            return {
+                "databases": len(self._snapshots),
+                "objects": sum(len(s.objects) for s in self._snapshots.values()),
+                "hits": self._hits,
+                "loads": self._loads,
+                "refreshes": self._refreshes,
+                "objectsReloaded": self._objects_reloaded,
+            }
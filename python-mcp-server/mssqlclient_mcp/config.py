@@ -22,6 +22,52 @@ class DatabaseConfiguration:
     max_concurrent_sessions: int = 10
     session_cleanup_interval_minutes: int = 60
     total_tool_call_timeout_seconds: Optional[int] = 120
+    pool_min_size: int = 0
+    pool_max_size: int = 20
+    pool_idle_timeout_seconds: int = 300
+    pool_reset_on_return: bool = False
+    db_executor_workers: int = 8
+    db_executor_queue_depth: int = 64
+    list_tables_row_count_strategy: str = "catalog"
+    exact_row_count_max_tables: int = 100
+    exact_row_count_parallelism: int = 4
+    query_max_rows: int = 100
+    query_server_row_cap: bool = False
+    query_fetch_batch_size: int = 500
+
+    # Estimated-plan cost guard for execute_query and start_query (0 disables a limit)
+    query_cost_guard: bool = False
+    query_cost_max_subtree_cost: float = 0.0
+    query_cost_max_estimated_rows: float = 0.0
+    query_cost_action: str = "reject"
+
+    # Opt-in cache of execute_query results keyed by normalized query text
+    query_result_cache: bool = False
+    query_result_cache_ttl_seconds: int = 60
+    query_result_cache_max_bytes: int = 32 * 1024 * 1024
+    query_result_cache_validate: bool = True
+
+    page_max_bytes: int = 1_000_000
+    page_ttl_seconds: int = 300
+    page_max_open_results: int = 10
+    metadata_cache_enabled: bool = True
+    metadata_cache_max_bytes: int = 16 * 1024 * 1024
+    metadata_cache_validation_seconds: int = 5
+    metadata_cache_file: Optional[str] = None
+    catalog_snapshot_enabled: bool = False
+
+    # Background session results (bytes kept in memory before spilling to disk)
+    session_spill_threshold_bytes: int = 8 * 1024 * 1024
+    session_spill_directory: Optional[str] = None
+    session_results_max_bytes: int = 256 * 1024 * 1024
+
+    # Sessions waiting for a slot once max_concurrent_sessions are running
+    session_queue_max_length: int = 50
+    session_queue_timeout_seconds: int = 60
+    session_max_per_database: int = 0
+    session_priority_aging_seconds: int = 30
+    session_interactive_max_seconds: float = 2.0
+    session_batch_min_seconds: float = 30.0
 
     @classmethod
     def from_env(cls) -> "DatabaseConfiguration":
@@ -43,6 +89,43 @@ class DatabaseConfiguration:
             max_concurrent_sessions=int(os.getenv("MAX_CONCURRENT_SESSIONS", "10")),
             session_cleanup_interval_minutes=int(os.getenv("SESSION_CLEANUP_INTERVAL_MINUTES", "60")),
             total_tool_call_timeout_seconds=int(timeout) if (timeout := os.getenv("TOTAL_TOOL_CALL_TIMEOUT_SECONDS")) else 120,
+            pool_min_size=int(os.getenv("POOL_MIN_SIZE", "0")),
+            pool_max_size=int(os.getenv("POOL_MAX_SIZE", "20")),
+            pool_idle_timeout_seconds=int(os.getenv("POOL_IDLE_TIMEOUT_SECONDS", "300")),
+            pool_reset_on_return=os.getenv("POOL_RESET_ON_RETURN", "false").lower() == "true",
+            db_executor_workers=int(os.getenv("DB_EXECUTOR_WORKERS", "8")),
+            db_executor_queue_depth=int(os.getenv("DB_EXECUTOR_QUEUE_DEPTH", "64")),
+            list_tables_row_count_strategy=os.getenv("LIST_TABLES_ROW_COUNT_STRATEGY", "catalog").lower(),
+            exact_row_count_max_tables=int(os.getenv("EXACT_ROW_COUNT_MAX_TABLES", "100")),
+            exact_row_count_parallelism=int(os.getenv("EXACT_ROW_COUNT_PARALLELISM", "4")),
+            query_max_rows=int(os.getenv("QUERY_MAX_ROWS", "100")),
+            query_server_row_cap=os.getenv("QUERY_SERVER_ROW_CAP", "false").lower() == "true",
+            query_fetch_batch_size=int(os.getenv("QUERY_FETCH_BATCH_SIZE", "500")),
+            query_cost_guard=os.getenv("QUERY_COST_GUARD", "false").lower() == "true",
+            query_cost_max_subtree_cost=float(os.getenv("QUERY_COST_MAX_SUBTREE_COST", "0")),
+            query_cost_max_estimated_rows=float(os.getenv("QUERY_COST_MAX_ESTIMATED_ROWS", "0")),
+            query_cost_action=os.getenv("QUERY_COST_ACTION", "reject").lower(),
+            query_result_cache=os.getenv("QUERY_RESULT_CACHE", "false").lower() == "true",
+            query_result_cache_ttl_seconds=int(os.getenv("QUERY_RESULT_CACHE_TTL_SECONDS", "60")),
+            query_result_cache_max_bytes=int(os.getenv("QUERY_RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            query_result_cache_validate=os.getenv("QUERY_RESULT_CACHE_VALIDATE", "true").lower() == "true",
+            page_max_bytes=int(os.getenv("PAGE_MAX_BYTES", "1000000")),
+            page_ttl_seconds=int(os.getenv("PAGE_TTL_SECONDS", "300")),
+            page_max_open_results=int(os.getenv("PAGE_MAX_OPEN_RESULTS", "10")),
+            metadata_cache_enabled=os.getenv("METADATA_CACHE_ENABLED", "true").lower() == "true",
+            metadata_cache_max_bytes=int(os.getenv("METADATA_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+            metadata_cache_validation_seconds=int(os.getenv("METADATA_CACHE_VALIDATION_SECONDS", "5")),
+            metadata_cache_file=os.getenv("METADATA_CACHE_FILE") or None,
+            catalog_snapshot_enabled=os.getenv("CATALOG_SNAPSHOT_ENABLED", "false").lower() == "true",
+            session_spill_threshold_bytes=int(os.getenv("SESSION_SPILL_THRESHOLD_BYTES", str(8 * 1024 * 1024))),
+            session_spill_directory=os.getenv("SESSION_SPILL_DIRECTORY") or None,
+            session_results_max_bytes=int(os.getenv("SESSION_RESULTS_MAX_BYTES", str(256 * 1024 * 1024))),
+            session_queue_max_length=int(os.getenv("SESSION_QUEUE_MAX_LENGTH", "50")),
+            session_queue_timeout_seconds=int(os.getenv("SESSION_QUEUE_TIMEOUT_SECONDS", "60")),
+            session_max_per_database=int(os.getenv("SESSION_MAX_PER_DATABASE", "0")),
+            session_priority_aging_seconds=int(os.getenv("SESSION_PRIORITY_AGING_SECONDS", "30")),
+            session_interactive_max_seconds=float(os.getenv("SESSION_INTERACTIVE_MAX_SECONDS", "2")),
+            session_batch_min_seconds=float(os.getenv("SESSION_BATCH_MIN_SECONDS", "30")),
         )
 
     @staticmethod
@@ -0,0 +1,424 @@
+"""Connection pooling for SQL Server connections."""
+
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import pyodbc
+
+# Emulates sp_reset_connection for connections handed back to the pool:
+# rolls back open transactions and restores the SET options a previous
+# borrower may have changed. Temp tables the borrower created are dropped
+# by name after this, see ConnectionPool._reset.
+RESET_CONNECTION_SQL = """
+    SET NOCOUNT ON;
+    IF @@TRANCOUNT > 0 ROLLBACK TRANSACTION;
+    SET ROWCOUNT 0;
+    SET TEXTSIZE -1;
+    SET LOCK_TIMEOUT -1;
+    SET XACT_ABORT OFF;
+    SET IMPLICIT_TRANSACTIONS OFF;
+    SET TRANSACTION ISOLATION LEVEL READ COMMITTED;
+    SET NOCOUNT OFF;
+"""
+
+# Query timeout for the reset batch; a hung reset discards the connection
+RESET_TIMEOUT_SECONDS = 5
+
+
+def _quote(name: str) -> str:
+    """Quote a name as a T-SQL [identifier]."""
+    return "[" + name.replace("]", "]]") + "]"
+
+
+class PooledConnection:
+    """A borrowed connection that returns itself to its pool when closed."""
+
+    def __init__(
+        self,
+        pool: "ConnectionPool",
+        key: str,
+        connection: pyodbc.Connection,
+        database_name: str,
+    ):
+        self._pool = pool
+        self._key = key
+        self._connection = connection
+        self._database_name = database_name
+        self._released = False
+        self._broken = False
+        self._state_changed = False
+        self._temp_tables: Set[str] = set()
+
+    @property
+    def raw(self) -> pyodbc.Connection:
+        """The underlying pyodbc connection."""
+        return self._connection
+
+    @property
+    def timeout(self) -> int:
+        """Query timeout in seconds applied to statements on this connection."""
+        return self._connection.timeout
+
+    @timeout.setter
+    def timeout(self, seconds: int) -> None:
+        self._connection.timeout = seconds
+
+    def cursor(self) -> pyodbc.Cursor:
+        """Create a cursor on the underlying connection."""
+        return self._connection.cursor()
+
+    def mark_state_changed(self, temp_tables: Iterable[str] = ()) -> None:
+        """
+        Note that session state was changed, forcing a reset on return.
+
+        Args:
+            temp_tables: Local temp tables the borrower may have created,
+                dropped by the reset
+        """
+        self._state_changed = True
+        self._temp_tables.update(temp_tables)
+
+    def invalidate(self) -> None:
+        """Mark the connection as unusable so it is discarded instead of reused."""
+        self._broken = True
+
+    def close(self) -> None:
+        """Return the connection to the pool."""
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+@dataclass
+class _IdleConnection:
+    """An idle physical connection waiting in the pool."""
+
+    connection: pyodbc.Connection
+    database_name: str
+    idle_since: float
+
+
+@dataclass
+class _KeyPool:
+    """Connections for a single target database."""
+
+    database_name: Optional[str] = None
+    idle: Deque[_IdleConnection] = field(default_factory=deque)
+    in_use: int = 0
+    pending: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.idle) + self.in_use + self.pending
+
+
+class ConnectionPool:
+    """Bounded pool of SQL Server connections keyed by target database."""
+
+    def __init__(
+        self,
+        connect: Callable[[Optional[str]], pyodbc.Connection],
+        min_size: int = 0,
+        max_size: int = 20,
+        idle_timeout_seconds: int = 300,
+        reset_on_return: bool = False,
+        acquire_timeout_seconds: int = 15,
+    ):
+        """
+        Initialize the connection pool.
+
+        Args:
+            connect: Factory opening a new physical connection for a database
+            min_size: Connections opened per database on its first use and
+                kept despite idle eviction
+            max_size: Maximum connections (idle and in use) per database
+            idle_timeout_seconds: Idle time after which a connection is closed
+            reset_on_return: Reset session state on every return, not only
+                after a borrower marked it changed
+            acquire_timeout_seconds: Time to wait for a free connection
+        """
+        if max_size < 1:
+            raise ValueError("Pool max size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("Pool min size must be between 0 and max size")
+
+        self._connect = connect
+        self._min_size = min_size
+        self._max_size = max_size
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._reset_on_return = reset_on_return
+        self._acquire_timeout_seconds = acquire_timeout_seconds
+        self._pools: Dict[str, _KeyPool] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._created = 0
+        self._reused = 0
+        self._evicted = 0
+        self._discarded = 0
+
+    @staticmethod
+    def _key(database_name: Optional[str]) -> str:
+        return (database_name or "").lower()
+
+    def acquire(self, database_name: Optional[str] = None) -> PooledConnection:
+        """
+        Borrow a connection for the given database.
+
+        Args:
+            database_name: Optional database name (None for the default database)
+
+        Returns:
+            PooledConnection that returns to the pool when closed
+
+        Raises:
+            RuntimeError: If the pool is closed or no connection frees up in time
+        """
+        key = self._key(database_name)
+        deadline = time.monotonic() + self._acquire_timeout_seconds
+
+        expired: List[pyodbc.Connection] = []
+        try:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+
+                    expired.extend(self._evict_idle_locked())
+                    pool = self._pools.get(key)
+                    if pool is None:
+                        pool = self._pools[key] = _KeyPool(database_name)
+                        if self._min_size > 1:
+                            # This call opens one; the rest are opened alongside it
+                            threading.Thread(
+                                target=self._fill, args=(key,), name="mssql-pool-fill", daemon=True
+                            ).start()
+
+                    if pool.idle:
+                        idle = pool.idle.pop()
+                        pool.in_use += 1
+                        self._reused += 1
+                        return PooledConnection(self, key, idle.connection, idle.database_name)
+
+                    if pool.total < self._max_size:
+                        pool.pending += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RuntimeError(
+                            f"Connection pool exhausted for database "
+                            f"'{database_name or '(default)'}' "
+                            f"({self._max_size} connections in use)"
+                        )
+                    self._condition.wait(remaining)
+        finally:
+            # Closed once the lock is released; closing can block on the network
+            self._close_all(expired)
+
+        # Open the physical connection outside the lock; the handshake is slow
+        try:
+            connection, current_database = self._open(database_name)
+        except Exception:
+            with self._condition:
+                pool.pending -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            pool.pending -= 1
+            pool.in_use += 1
+            self._created += 1
+
+        return PooledConnection(self, key, connection, current_database)
+
+    def _open(self, database_name: Optional[str]) -> Tuple[pyodbc.Connection, str]:
+        """Open a physical connection and read the database it landed in."""
+        connection = self._connect(database_name)
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT DB_NAME()")
+                current_database = cursor.fetchone()[0]
+            finally:
+                cursor.close()
+        except Exception:
+            self._close_quietly(connection)
+            raise
+        return connection, current_database
+
+    def _fill(self, key: str) -> int:
+        """
+        Open idle connections for a database until it holds min_size.
+
+        Returns:
+            Number of connections opened
+        """
+        opened = 0
+        while True:
+            with self._condition:
+                pool = self._pools.get(key)
+                if self._closed or pool is None or pool.total >= self._min_size:
+                    return opened
+                pool.pending += 1
+
+            try:
+                connection, current_database = self._open(pool.database_name)
+            except Exception as e:
+                with self._condition:
+                    pool.pending -= 1
+                    self._condition.notify()
+                print(f"Connection pool fill failed: {e}", file=sys.stderr)
+                return opened
+
+            with self._condition:
+                pool.pending -= 1
+                self._created += 1
+                opened += 1
+                if self._closed:
+                    self._close_quietly(connection)
+                    return opened
+                # Newest on the right, like returned connections, so the
+                # eviction scan from the left meets the oldest first
+                pool.idle.append(
+                    _IdleConnection(connection, current_database, time.monotonic())
+                )
+                self._condition.notify()
+
+    def maintain(self) -> None:
+        """Close expired idle connections and top every database back up to min_size."""
+        with self._condition:
+            expired = self._evict_idle_locked()
+            keys = list(self._pools)
+        self._close_all(expired)
+
+        if self._min_size > 0:
+            for key in keys:
+                self._fill(key)
+
+    def _release(self, pooled: PooledConnection) -> None:
+        """Return a borrowed connection, resetting or discarding it."""
+        connection = pooled.raw
+        reusable = not pooled._broken and not self._closed
+
+        if reusable:
+            try:
+                # Replace the borrower's query timeout; a reset stuck behind
+                # a lock must not hold the returning thread indefinitely
+                connection.timeout = RESET_TIMEOUT_SECONDS
+                if self._reset_on_return or pooled._state_changed:
+                    self._reset(connection, pooled._database_name, pooled._temp_tables)
+                else:
+                    connection.rollback()
+            except pyodbc.Error:
+                reusable = False
+
+        with self._condition:
+            pool = self._pools.setdefault(pooled._key, _KeyPool(pooled._database_name))
+            pool.in_use -= 1
+            if reusable and not self._closed:
+                pool.idle.append(
+                    _IdleConnection(connection, pooled._database_name, time.monotonic())
+                )
+            else:
+                self._discarded += 1
+            self._condition.notify()
+
+        if not reusable:
+            self._close_quietly(connection)
+
+    @staticmethod
+    def _reset(
+        connection: pyodbc.Connection, database_name: str, temp_tables: Iterable[str] = ()
+    ) -> None:
+        """Reset session state so the next borrower sees a clean connection."""
+        statements = [RESET_CONNECTION_SQL]
+        for name in sorted(temp_tables):
+            # OBJECT_ID resolves #names to this session's table only
+            literal = _quote(name).replace("'", "''")
+            statements.append(
+                f"IF OBJECT_ID(N'tempdb..{literal}') IS NOT NULL DROP TABLE {_quote(name)};"
+            )
+        statements.append(f"USE {_quote(database_name)};")
+
+        cursor = connection.cursor()
+        try:
+            # One round trip for the whole reset
+            cursor.execute("\n".join(statements))
+        finally:
+            cursor.close()
+        connection.commit()
+
+    def _evict_idle_locked(self) -> List[pyodbc.Connection]:
+        """
+        Remove connections idle for longer than the idle timeout.
+
+        Returns:
+            The removed connections, for the caller to close after
+            releasing the lock
+        """
+        if self._idle_timeout_seconds <= 0:
+            return []
+
+        cutoff = time.monotonic() - self._idle_timeout_seconds
+        expired = []
+        for pool in self._pools.values():
+            # Oldest connections sit at the left end of the deque
+            while pool.idle and pool.total > self._min_size and pool.idle[0].idle_since < cutoff:
+                expired.append(pool.idle.popleft().connection)
+
+        self._evicted += len(expired)
+        return expired
+
+    @classmethod
+    def _close_all(cls, connections: Iterable[pyodbc.Connection]) -> None:
+        for connection in connections:
+            cls._close_quietly(connection)
+
+    @staticmethod
+    def _close_quietly(connection: pyodbc.Connection) -> None:
+        try:
+            connection.close()
+        except pyodbc.Error:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool counters for observability."""
+        with self._condition:
+            return {
+                "minSize": self._min_size,
+                "maxSize": self._max_size,
+                "created": self._created,
+                "reused": self._reused,
+                "evicted": self._evicted,
+                "discarded": self._discarded,
+                "databases": {
+                    key or "(default)": {"idle": len(pool.idle), "inUse": pool.in_use}
+                    for key, pool in self._pools.items()
+                },
+            }
+
+    def close(self) -> None:
+        """Close all idle connections; borrowed ones are closed when returned."""
+        with self._condition:
+            self._closed = True
+            idle = [item.connection for pool in self._pools.values() for item in pool.idle]
+            for pool in self._pools.values():
+                pool.idle.clear()
+            self._condition.notify_all()
+
+        for connection in idle:
+            self._close_quietly(connection)
@@ -0,0 +1,184 @@
+"""Pre-execution cost checks based on SQL Server estimated plans."""
+
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+SHOWPLAN_NAMESPACE = {"sp": "http://schemas.microsoft.com/sqlserver/2004/07/showplan"}
+
+# Operators listed when a query is rejected
+TOP_OPERATOR_COUNT = 5
+
+
+@dataclass
+class PlanOperator:
+    """One operator of an estimated plan, costed without its inputs."""
+
+    physical_op: str
+    object_name: Optional[str]
+    cost: float
+    estimated_rows: float
+
+    def describe(self) -> str:
+        """Render the operator for an error message."""
+        target = f" {self.object_name}" if self.object_name else ""
+        return f"{self.physical_op}{target} (cost {self.cost:.2f}, rows {self.estimated_rows:,.0f})"
+
+
+@dataclass
+class PlanEstimate:
+    """Estimated cost of a batch, summed over its statements."""
+
+    subtree_cost: float
+    estimated_rows: float
+    top_operators: List[PlanOperator] = field(default_factory=list)
+
+
+class QueryCostExceededError(RuntimeError):
+    """Raised when a query's estimated plan exceeds the configured cost limits."""
+
+    def __init__(self, estimate: PlanEstimate, reasons: List[str]):
+        self.estimate = estimate
+        self.reasons = reasons
+        operators = "; ".join(op.describe() for op in estimate.top_operators) or "none reported"
+        super().__init__(
+            f"Query rejected by cost guard: {', '.join(reasons)}. "
+            f"Top cost operators: {operators}"
+        )
+
+
+def parse_showplan(plans: List[str]) -> PlanEstimate:
+    """
+    Summarize SHOWPLAN_XML documents returned for a batch.
+
+    Statement costs are summed; the estimated row count is the largest
+    of any statement. Each operator's own cost is its subtree cost less
+    that of its direct child operators.
+
+    Args:
+        plans: ShowPlanXML documents, one per result row
+
+    Returns:
+        PlanEstimate with the most expensive operators first
+    """
+    subtree_cost = 0.0
+    estimated_rows = 0.0
+    operators: List[PlanOperator] = []
+
+    for plan in plans:
+        root = ElementTree.fromstring(plan)
+        for statement in root.iterfind(".//sp:StmtSimple", SHOWPLAN_NAMESPACE):
+            subtree_cost += float(statement.get("StatementSubTreeCost", 0))
+            estimated_rows = max(estimated_rows, float(statement.get("StatementEstRows", 0)))
+
+        for relop in root.iterfind(".//sp:RelOp", SHOWPLAN_NAMESPACE):
+            children = relop.findall("./*/sp:RelOp", SHOWPLAN_NAMESPACE)
+            own_cost = float(relop.get("EstimatedTotalSubtreeCost", 0)) - sum(
+                float(child.get("EstimatedTotalSubtreeCost", 0)) for child in children
+            )
+            operators.append(
+                PlanOperator(
+                    physical_op=relop.get("PhysicalOp", "?"),
+                    object_name=_operator_object(relop),
+                    cost=max(0.0, own_cost),
+                    estimated_rows=float(relop.get("EstimateRows", 0)),
+                )
+            )
+
+    operators.sort(key=lambda op: op.cost, reverse=True)
+    return PlanEstimate(subtree_cost, estimated_rows, operators[:TOP_OPERATOR_COUNT])
+
+
+def _operator_object(relop: ElementTree.Element) -> Optional[str]:
+    """Name of the table or index an operator reads, if any."""
+    target = relop.find("./*/sp:Object", SHOWPLAN_NAMESPACE)
+    if target is None:
+        return None
+    parts = [target.get(name) for name in ("Schema", "Table")]
+    name = ".".join(part for part in parts if part)
+    index = target.get("Index")
+    return f"{name}.{index}" if index else name or None
+
+
+def check_limits(
+    estimate: PlanEstimate, max_subtree_cost: float, max_estimated_rows: float
+) -> List[str]:
+    """
+    Compare an estimate against the configured limits (0 disables a limit).
+
+    Returns:
+        Reasons the estimate is over a limit, empty when it is within both
+    """
+    reasons = []
+    if max_subtree_cost > 0 and estimate.subtree_cost > max_subtree_cost:
+        reasons.append(
+            f"estimated subtree cost {estimate.subtree_cost:.2f} exceeds "
+            f"QUERY_COST_MAX_SUBTREE_COST ({max_subtree_cost:g})"
+        )
+    if max_estimated_rows > 0 and estimate.estimated_rows > max_estimated_rows:
+        reasons.append(
+            f"estimated rows {estimate.estimated_rows:,.0f} exceed "
+            f"QUERY_COST_MAX_ESTIMATED_ROWS ({max_estimated_rows:g})"
+        )
+    return reasons
+
+
+class PlanEstimateCache:
+    """LRU cache of plan estimates keyed by (server, database, normalized query)."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached estimates
+            ttl_seconds: Age after which an estimate is fetched again, since
+                statistics (and therefore estimates) change as data grows
+        """
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._estimates: OrderedDict[Tuple[str, str, str], Tuple[PlanEstimate, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._rejections = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[PlanEstimate]:
+        """Return a cached estimate that is younger than the TTL."""
+        with self._lock:
+            entry = self._estimates.get(key)
+            if entry is None or time.monotonic() - entry[1] > self._ttl_seconds:
+                if entry is not None:
+                    del self._estimates[key]
+                self._misses += 1
+                return None
+
+            self._estimates.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[str, str, str], estimate: PlanEstimate) -> None:
+        """Store an estimate, evicting the least recently used one when full."""
+        with self._lock:
+            self._estimates[key] = (estimate, time.monotonic())
+            self._estimates.move_to_end(key)
+            while len(self._estimates) > self._max_entries:
+                self._estimates.popitem(last=False)
+
+    def record_rejection(self) -> None:
+        """Count a query turned away by the guard."""
+        with self._lock:
+            self._rejections += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss and rejection counters."""
+        with self._lock:
+            return {
+                "entries": len(self._estimates),
+                "hits": self._hits,
+                "misses": self._misses,
+                "rejections": self._rejections,
+            }
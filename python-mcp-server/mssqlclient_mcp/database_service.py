@@ -1,11 +1,18 @@
 """Database service for SQL Server operations."""
 
+import asyncio
 import pyodbc
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Callable, TypeVar, Set, Iterator
+from dataclasses import replace
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+import math
+import os
 import uuid
+import sys
 import threading
+import time
 from .models import (
     TableInfo,
     TableColumnInfo,
@@ -16,14 +23,73 @@ from .models import (
     QuerySession,
     SessionStatus,
     SessionType,
+    SessionPriority,
     StoredProcedureParameter,
     ServerCapability,
     TableIndex,
     ForeignKey,
     TableStatistics,
+    RowCountStrategy,
+    QueryResult,
+    TableDescription,
 )
 from .config import DatabaseConfiguration
-from .type_mapper import convert_parameters_for_execution
+from .connection_pool import ConnectionPool, PooledConnection
+from .executor import BlockingExecutor
+from .metadata_cache import MetadataCache, SCHEMA_VERSION_QUERY
+from .metadata_store import SNAPSHOT_KIND, PersistentMetadataStore
+from .catalog_snapshot import (
+    MAX_DESCRIBED_TABLES,
+    CatalogSnapshot,
+    CatalogSnapshotStore,
+    describe_table,
+    describe_tables,
+    load_catalog_snapshot,
+    refresh_catalog_snapshot,
+)
+from .procedure_cache import ProcedurePlan, ProcedurePlanCache
+from .pagination import CursorPageSource, ResultPage, ResultPager
+from .cost_guard import (
+    PlanEstimate,
+    PlanEstimateCache,
+    QueryCostExceededError,
+    check_limits,
+    parse_showplan,
+)
+from .result_cache import (
+    LAST_UPDATE_COLUMN,
+    LAST_UPDATE_JOIN,
+    TABLE_VERSION_QUERY,
+    QueryResultCache,
+    ResultCacheKey,
+)
+from .singleflight import SingleFlight
+from .sql_text import (
+    created_temp_tables,
+    is_single_select,
+    normalize_query_text,
+    referenced_tables,
+    uses_nondeterministic_functions,
+)
+from .type_mapper import compile_row_converter, compile_text_row_converter
+from .result_store import ByteCounter, ResultBuffer
+from .scheduler import CostHistory, SessionScheduler
+from .timeouts import (
+    SESSION_LIMIT,
+    STATEMENT_LIMIT,
+    QueryTimeoutError,
+    bind_statement_timeout,
+    is_query_timeout,
+    statement_timeout_error,
+)
+
+T = TypeVar("T")
+
+
+def _track_session_state(conn: PooledConnection, query: str) -> None:
+    """Have the pool reset a connection after a batch that may change its session state."""
+    if not is_single_select(query):
+        conn.mark_state_changed(created_temp_tables(query))
 
 
 class DatabaseService:
@@ -33,9 +99,316 @@ class DatabaseService:
         """Initialize the database service."""
         self.connection_string = config.connection_string
         self.config = config
+        self._pool = ConnectionPool(
+            connect=self._connect,
+            min_size=config.pool_min_size,
+            max_size=config.pool_max_size,
+            idle_timeout_seconds=config.pool_idle_timeout_seconds,
+            reset_on_return=config.pool_reset_on_return,
+            acquire_timeout_seconds=config.connection_timeout_seconds,
+        )
+        self._executor = BlockingExecutor(
+            max_workers=config.db_executor_workers,
+            max_queue_depth=config.db_executor_queue_depth,
+        )
+        self.metadata_cache = MetadataCache(
+            max_bytes=config.metadata_cache_max_bytes,
+            validation_interval_seconds=config.metadata_cache_validation_seconds,
+        )
+        self.metadata_store = (
+            PersistentMetadataStore(os.path.expanduser(config.metadata_cache_file))
+            if config.metadata_cache_file
+            else None
+        )
+        self.catalog_snapshots = CatalogSnapshotStore()
+        self.procedure_plans = ProcedurePlanCache()
+        self.plan_estimates = PlanEstimateCache()
+        self.result_cache = QueryResultCache(
+            max_bytes=config.query_result_cache_max_bytes,
+            ttl_seconds=config.query_result_cache_ttl_seconds,
+        )
+        # Cleared when the login lacks VIEW SERVER STATE for the usage DMV
+        self._index_usage_visible = True
+        self.single_flight = SingleFlight()
+        self.pager = ResultPager(
+            page_max_rows=config.query_max_rows,
+            page_max_bytes=config.page_max_bytes,
+            ttl_seconds=config.page_ttl_seconds,
+            max_open=config.page_max_open_results,
+        )
+
+    def _get_connection(
+        self,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+        limit: str = STATEMENT_LIMIT,
+    ) -> PooledConnection:
+        """
+        Borrow a pooled database connection with its query timeout applied.
+
+        The timeout defaults to DEFAULT_COMMAND_TIMEOUT_SECONDS and is cut
+        short by whatever remains of the current tool call budget. Closing
+        the returned connection hands it back to the pool.
+
+        Raises:
+            QueryTimeoutError: If the tool call budget is already spent
+        """
+        seconds = timeout_seconds or self.config.default_command_timeout_seconds
+        timeout = bind_statement_timeout(seconds, limit)
+
+        conn = self._pool.acquire(database_name)
+        try:
+            conn.timeout = timeout
+        except pyodbc.Error:
+            conn.invalidate()
+            conn.close()
+            raise
+        return conn
+
+    @contextmanager
+    def _borrowed(
+        self,
+        conn: Optional[PooledConnection],
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> Iterator[PooledConnection]:
+        """Use the caller's connection if given, otherwise borrow one for the block."""
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._get_connection(database_name, timeout_seconds)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    async def run_blocking(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run blocking driver work on the database executor.
+
+        Raises:
+            QueryTimeoutError: If a statement hit its query timeout
+        """
+        return await self._executor.run(self._call_reporting_timeouts, func, *args)
+
+    async def run_coalesced(
+        self,
+        operation: str,
+        database_name: Optional[str],
+        key: Tuple[Any, ...],
+        func: Callable[..., T],
+        *args: Any,
+    ) -> T:
+        """
+        Run blocking driver work once for all identical concurrent calls.
+
+        Calls with the same operation, key and (server, database) scope that
+        arrive while one is running share its result instead of borrowing
+        connections of their own.
+        """
+        scope = self._cache_scope(database_name)
+        return await self.single_flight.run(
+            operation, (*scope, *key), lambda: self.run_blocking(func, *args)
+        )
+
+    @staticmethod
+    def _call_reporting_timeouts(func: Callable[..., T], *args: Any) -> T:
+        """Call func, reporting driver query timeouts against the limit that set them."""
+        try:
+            return func(*args)
+        except pyodbc.Error as e:
+            if is_query_timeout(e):
+                raise statement_timeout_error() from e
+            raise
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool counters."""
+        return self._pool.stats()
+
+    def executor_stats(self) -> Dict[str, int]:
+        """Return queued and active database executor work counters."""
+        return self._executor.stats()
+
+    def maintain(self) -> None:
+        """
+        Periodic housekeeping: close paginated results idle past their TTL,
+        evict idle pooled connections and refill the pool to its minimum.
+        """
+        self.pager.expire_idle()
+        self._pool.maintain()
+
+    def close(self) -> None:
+        """Stop the database executor and close all pooled connections."""
+        self._executor.shutdown()
+        self._pool.close()
+        if self.metadata_store is not None:
+            self.metadata_store.close()
+
+    def coalescing_stats(self) -> Dict[str, Any]:
+        """Return counters of executions shared by identical concurrent calls."""
+        return self.single_flight.stats()
+
+    def metadata_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return metadata, catalog snapshot, procedure plan and plan estimate cache counters."""
+        stats = {
+            "metadata": self.metadata_cache.stats(),
+            "catalogSnapshots": self.catalog_snapshots.stats(),
+            "procedurePlans": self.procedure_plans.stats(),
+            "planEstimates": self.plan_estimates.stats(),
+        }
+        if self.metadata_store is not None:
+            stats["metadataFile"] = self.metadata_store.stats()
+        return stats
+
+    def _connection_setting(self, *names: str) -> str:
+        """Read a value such as Server= or Database= from the connection string."""
+        for part in self.connection_string.split(";"):
+            key, _, value = part.partition("=")
+            if key.strip().lower() in names:
+                return value.strip()
+        return ""
+
+    def _cache_scope(self, database_name: Optional[str]) -> Tuple[str, str]:
+        """Return the (server, database) pair metadata cache keys are scoped to."""
+        server = self._connection_setting("server", "data source", "address").lower()
+        database = database_name or self._connection_setting("database", "initial catalog")
+        return server, database.lower()
+
+    @staticmethod
+    def _split_object_name(object_name: str) -> Tuple[str, str]:
+        """Split a possibly schema-qualified object name into (schema, name)."""
+        schema_name = "dbo"
+        name_only = object_name or ""
+        if "." in name_only:
+            parts = name_only.split(".", 1)
+            schema_name = parts[0].strip("[]")
+            name_only = parts[1].strip("[]")
+        return schema_name, name_only
+
+    @classmethod
+    def _object_key(cls, object_name: str) -> str:
+        """Normalize a possibly schema-qualified object name for cache lookups."""
+        schema_name, name_only = cls._split_object_name(object_name)
+        return f"{schema_name}.{name_only}".lower()
+
+    def _schema_version(
+        self, database_name: Optional[str] = None, conn: Optional[PooledConnection] = None
+    ) -> str:
+        """Return the database's schema version, querying it when not recently checked."""
+        server, database = self._cache_scope(database_name)
+        version = self.metadata_cache.known_version(server, database)
+        if version is not None:
+            return version
+
+        with self._borrowed(conn, database_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute(SCHEMA_VERSION_QUERY)
+            row = cursor.fetchone()
+            version = f"{row.ObjectCount}:{row.LastModified}:{row.ObjectChecksum}"
+
+        self.metadata_cache.record_version(server, database, version)
+        return version
+
+    def _cached_metadata(
+        self,
+        database_name: Optional[str],
+        kind: str,
+        object_name: str,
+        loader: Callable[[], T],
+        conn: Optional[PooledConnection] = None,
+        refresh: bool = False,
+    ) -> T:
+        """
+        Return catalog metadata from the cache, loading it on a miss or schema change.
+
+        Misses in memory fall back to the metadata cache file, when one is
+        configured, before querying the catalog. With refresh, the value is
+        loaded again and replaces the cached copies.
+        """
+        if not self.config.metadata_cache_enabled:
+            return loader()
+
+        server, database = self._cache_scope(database_name)
+        object_key = self._object_key(object_name)
+        key = (server, database, kind, object_key)
+        version = self._schema_version(database_name, conn)
+
+        if not refresh:
+            cached: Optional[T] = self.metadata_cache.get(key, version)
+            if cached is not None:
+                return cached
+
+        store = self.metadata_store
+        stored = (
+            store.get(server, database, kind, object_key, version)
+            if store and not refresh
+            else None
+        )
+        value: T
+        if stored is not None:
+            value = stored[0]
+        else:
+            value = loader()
+            if store is not None:
+                store.put(server, database, kind, object_key, value, version)
+
+        self.metadata_cache.put(key, value, version)
+        return value
+
+    def catalog_snapshot_sync(
+        self,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+        conn: Optional[PooledConnection] = None,
+    ) -> CatalogSnapshot:
+        """
+        Return the database's catalog snapshot at its current schema version.
+
+        The first call loads the whole catalog, or starts from the copy in
+        the metadata cache file; after a schema change only objects whose
+        modify_date moved are read again. When conn is given, catalog
+        queries run on it instead of a pooled connection.
+        """
+        server, database = self._cache_scope(database_name)
+        version = self._schema_version(database_name, conn)
+        snapshot = self.catalog_snapshots.get(server, database, version)
+        if snapshot is not None:
+            return snapshot
+
+        with self.catalog_snapshots.refresh_lock(server, database):
+            # Another caller may have loaded it while this one waited
+            snapshot = self.catalog_snapshots.get(server, database, version)
+            if snapshot is not None:
+                return snapshot
+
+            previous = self.catalog_snapshots.latest(server, database)
+            if previous is None and self.metadata_store is not None:
+                # A snapshot from an earlier run is current as is, or at
+                # least a base for an incremental refresh
+                stored = self.metadata_store.get(server, database, SNAPSHOT_KIND, "", None)
+                previous = stored[0] if stored and isinstance(stored[0], CatalogSnapshot) else None
+                if previous is not None and previous.schema_version == version:
+                    self.catalog_snapshots.put(server, database, previous, 0)
+                    return previous
+
+            with self._borrowed(conn, database_name, timeout_seconds) as conn:
+                cursor = conn.cursor()
+                if previous is None:
+                    cursor.execute("SELECT DB_NAME()")
+                    current_db = cursor.fetchone()[0]
+                    snapshot = load_catalog_snapshot(cursor, current_db, version)
+                    self.catalog_snapshots.put(server, database, snapshot)
+                else:
+                    snapshot, reloaded = refresh_catalog_snapshot(cursor, previous, version)
+                    self.catalog_snapshots.put(server, database, snapshot, reloaded)
+
+            if self.metadata_store is not None:
+                self.metadata_store.put(server, database, SNAPSHOT_KIND, "", snapshot, version)
+            return snapshot
 
-    def _get_connection(self, database_name: Optional[str] = None) -> pyodbc.Connection:
-        """Get a database connection."""
+    def _connect(self, database_name: Optional[str] = None) -> pyodbc.Connection:
+        """Open a new physical database connection."""
         connection_string = self.connection_string
 
         # If a specific database is requested, modify the connection string
@@ -70,33 +443,110 @@ class DatabaseService:
         self,
         database_name: Optional[str] = None,
         timeout_seconds: Optional[int] = None,
+        row_count_strategy: Optional[RowCountStrategy] = None,
+    ) -> List[TableInfo]:
+        """
+        List all tables in the database.
+
+        Args:
+            database_name: Optional database name
+            timeout_seconds: Optional timeout in seconds
+            row_count_strategy: How to obtain row counts (defaults to configuration)
+
+        Returns:
+            List of TableInfo objects
+        """
+        strategy = row_count_strategy or self.default_row_count_strategy()
+        scope = self._cache_scope(database_name)
+        return await self.single_flight.run(
+            "list_tables",
+            (*scope, strategy),
+            lambda: self._list_tables(database_name, timeout_seconds, strategy),
+        )
+
+    async def _list_tables(
+        self,
+        database_name: Optional[str],
+        timeout_seconds: Optional[int],
+        strategy: RowCountStrategy,
+    ) -> List[TableInfo]:
+        """List tables, then count rows in parallel for the exact strategy."""
+        tables = await self.run_blocking(
+            self.list_tables_sync, database_name, timeout_seconds, strategy
+        )
+        if strategy == RowCountStrategy.EXACT:
+            await self._count_rows_exact(
+                tables[: self.config.exact_row_count_max_tables], database_name, timeout_seconds
+            )
+        return tables
+
+    def list_tables_sync(
+        self,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+        row_count_strategy: Optional[RowCountStrategy] = None,
     ) -> List[TableInfo]:
-        """List all tables in the database."""
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        """
+        Blocking implementation of :meth:`list_tables`.
+
+        Exact row counts are left as None here; :meth:`list_tables` fills
+        them in afterwards on several pooled connections.
+        """
+        strategy = row_count_strategy or self.default_row_count_strategy()
+        if strategy == RowCountStrategy.NONE and self.config.catalog_snapshot_enabled:
+            # Row counts change without a schema change, so only the
+            # count-free listing comes from the snapshot
+            return self.catalog_snapshot_sync(database_name, timeout_seconds).list_tables()
+
+        conn = self._get_connection(database_name, timeout_seconds)
 
         try:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout
-            # Connection timeout is already set when creating the connection
 
-            # Query to get table information
-            query = """
-                SELECT
-                    s.name AS SchemaName,
-                    t.name AS TableName,
-                    t.create_date AS CreateDate,
-                    t.modify_date AS ModifyDate,
-                    'Normal' AS TableType
-                FROM
-                    sys.tables t
-                JOIN
-                    sys.schemas s ON t.schema_id = s.schema_id
-                WHERE
-                    t.is_ms_shipped = 0
-                ORDER BY
-                    s.name, t.name
-            """
+            # Query to get table information; the catalog strategy reads row
+            # counts from partition metadata in the same set-based query
+            if strategy == RowCountStrategy.CATALOG:
+                query = """
+                    SELECT
+                        s.name AS SchemaName,
+                        t.name AS TableName,
+                        t.create_date AS CreateDate,
+                        t.modify_date AS ModifyDate,
+                        'Normal' AS TableType,
+                        rc.TableRowCount
+                    FROM
+                        sys.tables t
+                    JOIN
+                        sys.schemas s ON t.schema_id = s.schema_id
+                    LEFT JOIN (
+                        SELECT p.object_id, SUM(p.rows) AS TableRowCount
+                        FROM sys.partitions p
+                        WHERE p.index_id IN (0, 1)  -- heap or clustered index only
+                        GROUP BY p.object_id
+                    ) rc ON rc.object_id = t.object_id
+                    WHERE
+                        t.is_ms_shipped = 0
+                    ORDER BY
+                        s.name, t.name
+                """
+            else:
+                query = """
+                    SELECT
+                        s.name AS SchemaName,
+                        t.name AS TableName,
+                        t.create_date AS CreateDate,
+                        t.modify_date AS ModifyDate,
+                        'Normal' AS TableType,
+                        CAST(NULL AS BIGINT) AS TableRowCount
+                    FROM
+                        sys.tables t
+                    JOIN
+                        sys.schemas s ON t.schema_id = s.schema_id
+                    WHERE
+                        t.is_ms_shipped = 0
+                    ORDER BY
+                        s.name, t.name
+                """
 
             cursor.execute(query)
             tables = []
@@ -107,22 +557,84 @@ class DatabaseService:
                     name=row.TableName,
                     create_date=row.CreateDate,
                     modify_date=row.ModifyDate,
+                    row_count=row.TableRowCount,
                     table_type=row.TableType,
                 )
                 tables.append(table)
+        finally:
+            conn.close()
 
-            # Enhance with row counts
-            for table in tables:
-                try:
-                    count_query = f"SELECT COUNT(*) FROM [{table.schema}].[{table.name}]"
-                    cursor.execute(count_query)
-                    count = cursor.fetchone()[0]
-                    table.row_count = count
-                except Exception as e:
-                    # If counting fails, just skip
-                    pass
-
-            return tables
+        return tables
+
+    def default_row_count_strategy(self) -> RowCountStrategy:
+        """Row count strategy configured for list_tables."""
+        return RowCountStrategy(self.config.list_tables_row_count_strategy)
+
+    async def _count_rows_exact(
+        self,
+        tables: List[TableInfo],
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> None:
+        """
+        Fill in exact row counts on up to EXACT_ROW_COUNT_PARALLELISM pooled
+        connections at once, through the database executor.
+
+        The timeout covers all counts together: each table is given only what
+        is left of it. Tables that cannot be counted (for example for lack of
+        permission) keep a row count of None. A timeout ends the listing and
+        stops tables not yet started.
+
+        Raises:
+            QueryTimeoutError: If the counts run past the timeout
+        """
+        seconds = timeout_seconds or self.config.default_command_timeout_seconds
+        deadline = time.monotonic() + seconds
+        pending = iter(tables)
+
+        async def count_next() -> None:
+            # Workers share the iterator, so each table is counted once
+            for table in pending:
+                await self.run_blocking(
+                    self._count_table_rows, table, database_name, seconds, deadline
+                )
+
+        workers = [
+            asyncio.ensure_future(count_next())
+            for _ in range(min(max(1, self.config.exact_row_count_parallelism), len(tables)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    def _count_table_rows(
+        self,
+        table: TableInfo,
+        database_name: Optional[str],
+        seconds: int,
+        deadline: float,
+    ) -> None:
+        """Count one table's rows on a borrowed connection within the shared deadline."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise QueryTimeoutError(STATEMENT_LIMIT, seconds)
+
+        schema = table.schema.replace("]", "]]")
+        name = table.name.replace("]", "]]")
+        conn = self._get_connection(database_name, max(1, math.ceil(remaining)))
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT_BIG(*) FROM [{schema}].[{name}]")
+            table.row_count = cursor.fetchone()[0]
+        except pyodbc.Error as e:
+            if is_query_timeout(e):
+                # Report the timeout of the whole listing, not the slice left of it
+                error = statement_timeout_error()
+                if error.limit == STATEMENT_LIMIT:
+                    error = QueryTimeoutError(STATEMENT_LIMIT, seconds)
+                raise error from e
         finally:
             conn.close()
 
@@ -133,12 +645,45 @@ class DatabaseService:
         timeout_seconds: Optional[int] = None,
     ) -> TableSchemaInfo:
         """Get schema information for a specific table."""
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        return await self.run_coalesced(
+            "get_table_schema",
+            database_name,
+            (self._object_key(table_name),),
+            self.get_table_schema_sync,
+            table_name,
+            database_name,
+            timeout_seconds,
+        )
+
+    def get_table_schema_sync(
+        self,
+        table_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> TableSchemaInfo:
+        """Blocking implementation of :meth:`get_table_schema`."""
+        if self.config.catalog_snapshot_enabled:
+            snapshot = self.catalog_snapshot_sync(database_name, timeout_seconds)
+            return snapshot.table_schema(table_name, self._object_key(table_name))
+
+        return self._cached_metadata(
+            database_name,
+            "table_schema",
+            table_name,
+            lambda: self._load_table_schema(table_name, database_name, timeout_seconds),
+        )
+
+    def _load_table_schema(
+        self,
+        table_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> TableSchemaInfo:
+        """Read column metadata for a table from the catalog."""
+        conn = self._get_connection(database_name, timeout_seconds)
 
         try:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
 
             # Parse schema and table name
             schema_name = "dbo"
@@ -200,50 +745,400 @@ class DatabaseService:
         query: str,
         database_name: Optional[str] = None,
         timeout_seconds: Optional[int] = None,
-    ) -> List[Dict[str, Any]]:
-        """Execute a SQL query and return results."""
+        max_rows: Optional[int] = None,
+        paginate: bool = False,
+        server_row_cap: Optional[bool] = None,
+        use_result_cache: bool = True,
+    ) -> QueryResult:
+        """
+        Execute a SQL query and return at most max_rows rows.
+
+        Args:
+            query: SQL query to execute
+            database_name: Optional database name
+            timeout_seconds: Optional timeout in seconds
+            max_rows: Row limit, or page size when paginating (defaults to configuration)
+            paginate: Keep the cursor open and return a continuation token
+                when more rows are available
+            server_row_cap: Have the server stop producing rows past the limit
+                (defaults to QUERY_SERVER_ROW_CAP; ignored when paginating)
+            use_result_cache: Allow serving and storing a cached result when
+                QUERY_RESULT_CACHE is enabled
+
+        Returns:
+            QueryResult, flagged as truncated when more rows were available
+            and as cached when served from the result cache
+        """
+        args = (
+            query,
+            database_name,
+            timeout_seconds,
+            max_rows,
+            paginate,
+            server_row_cap,
+            use_result_cache,
+        )
+        # Paginated results own a cursor and writes must each run, so only
+        # plain reads are shared between identical concurrent calls
+        if paginate or not is_single_select(query):
+            return await self.run_blocking(self.execute_query_sync, *args)
+
+        # Only calls allowing the same statement time share a run; each
+        # caller's wait is still cut short by its own tool call budget
+        effective_timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        key = (
+            normalize_query_text(query),
+            max_rows,
+            server_row_cap,
+            use_result_cache,
+            effective_timeout,
+        )
+        return await self.run_coalesced(
+            "execute_query", database_name, key, self.execute_query_sync, *args
+        )
+
+    def execute_query_sync(
+        self,
+        query: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        paginate: bool = False,
+        server_row_cap: Optional[bool] = None,
+        use_result_cache: bool = True,
+    ) -> QueryResult:
+        """Blocking implementation of :meth:`execute_query`."""
         if not query or not query.strip():
             raise ValueError("Query cannot be empty")
 
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        row_limit = max_rows or self.config.query_max_rows
+        if server_row_cap is None:
+            server_row_cap = self.config.query_server_row_cap
+        # Only a lone SELECT is capped; SET ROWCOUNT would also cut writes short
+        cap = row_limit if server_row_cap and not paginate and is_single_select(query) else None
+
+        # Temp tables and table variables make a result private to one connection
+        tables = None
+        cache_key: Optional[ResultCacheKey] = None
+        if (
+            self.config.query_result_cache
+            and use_result_cache
+            and not paginate
+            and is_single_select(query)
+            and not uses_nondeterministic_functions(query)
+        ):
+            tables = referenced_tables(query)
+            if tables is not None:
+                server, database = self._cache_scope(database_name)
+                cache_key = (server, database, normalize_query_text(query), row_limit, cap is not None)
+                cached = self._cached_query_result(cache_key, tables, database_name, timeout_seconds)
+                if cached is not None:
+                    return cached
+
+        conn = self._get_connection(database_name, timeout_seconds)
 
         try:
+            # Read before the query so a change made while it runs leaves the
+            # stored fingerprint stale rather than the cached rows
+            fingerprint = None
+            if (
+                cache_key is not None
+                and tables is not None
+                and self.config.query_result_cache_validate
+            ):
+                fingerprint = self._tables_fingerprint(tables, conn=conn)
+                if fingerprint is None:
+                    # Changes to what the query reads cannot be detected
+                    cache_key = None
+
+            _track_session_state(conn, query)
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
-            cursor.execute(query)
+            if cap is not None:
+                # One row past the limit tells a capped result from an exact fit.
+                # Kept on the query's first line so error line numbers still match.
+                conn.mark_state_changed()
+                cursor.execute(f"SET ROWCOUNT {cap + 1}; {query}")
+            else:
+                cursor.execute(query)
 
             # Get column names
             columns = [column[0] for column in cursor.description] if cursor.description else []
+        except Exception:
+            conn.close()
+            raise
 
-            # Fetch results
-            rows = cursor.fetchall()
-            results = []
+        if not columns:
+            conn.close()
+            return QueryResult(columns=[], rows=[], row_limit=row_limit, server_row_cap=cap)
 
-            for row in rows:
-                result = {}
-                for i, value in enumerate(row):
-                    # Convert datetime objects to strings for JSON serialization
-                    if isinstance(value, datetime):
-                        result[columns[i]] = value.isoformat()
-                    else:
-                        result[columns[i]] = value
-                results.append(result)
-
-            return results
+        # Positional tuples; column names are carried once in QueryResult.columns
+        convert_row = compile_row_converter(cursor.description)
+
+        # Stream rows in batches and stop reading at the row limit
+        source = CursorPageSource(
+            conn, cursor, columns, convert_row, self.config.query_fetch_batch_size
+        )
+
+        if paginate:
+            page = self.pager.first_page(source, row_limit)
+            return QueryResult(
+                columns=columns,
+                rows=page.rows,
+                truncated=page.continuation_token is not None,
+                row_limit=row_limit,
+                continuation_token=page.continuation_token,
+            )
+
+        try:
+            rows, exhausted = source.fetch(row_limit)
+        finally:
+            # Cancels the rest of the result on the server when truncated
+            source.close()
+
+        result = QueryResult(
+            columns=columns,
+            rows=rows,
+            truncated=not exhausted,
+            row_limit=row_limit,
+            server_row_cap=cap,
+        )
+        if cache_key is not None:
+            self.result_cache.put(cache_key, result, fingerprint)
+        return result
+
+    def _cached_query_result(
+        self,
+        key: ResultCacheKey,
+        tables: List[str],
+        database_name: Optional[str],
+        timeout_seconds: Optional[int],
+    ) -> Optional[QueryResult]:
+        """Return a cached result if it is fresh and its tables are unchanged."""
+        entry = self.result_cache.get(key)
+        if entry is None:
+            return None
+
+        result, fingerprint, age = entry
+        if fingerprint is not None:
+            current = self._tables_fingerprint(tables, database_name, timeout_seconds)
+            if current is None or current != fingerprint:
+                self.result_cache.invalidate(key)
+                return None
+
+        self.result_cache.record_hit()
+        return replace(result, cached=True, cache_age_seconds=age)
+
+    def _tables_fingerprint(
+        self,
+        tables: List[str],
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+        conn: Optional[PooledConnection] = None,
+    ) -> Optional[str]:
+        """
+        Fingerprint the tables a cached query reads.
+
+        Data changes are detected through the last user update in
+        sys.dm_db_index_usage_stats. Without VIEW SERVER STATE only tables
+        under change tracking can be validated.
+
+        Returns:
+            Schema, row count, last update and change tracking state of the
+            tables, or None when a change to them could go unnoticed: the
+            query names no tables, or reads a view, function, synonym or
+            another database's object, or an untracked table while the
+            usage statistics cannot be read
+        """
+        if not tables:
+            return None
+
+        with self._borrowed(conn, database_name, timeout_seconds) as conn:
+            cursor = conn.cursor()
+            row = None
+            index_usage = self._index_usage_visible
+            if index_usage:
+                try:
+                    cursor.execute(self._table_version_query(tables, True), *tables)
+                    row = cursor.fetchone()
+                except pyodbc.Error as e:
+                    if is_query_timeout(e):
+                        raise
+                    index_usage = self._index_usage_visible = False
+                    print(
+                        f"Result cache: index usage statistics unavailable ({e}); "
+                        "only change-tracked tables are cached",
+                        file=sys.stderr,
+                    )
+            if row is None:
+                cursor.execute(self._table_version_query(tables, False), *tables)
+                row = cursor.fetchone()
+
+        if row.TableCount != row.NameCount:
+            return None
+        if not index_usage and row.TrackedCount != row.NameCount:
+            return None
+        return (
+            f"{row.NameCount}:{row.LastModified}:{row.TotalRows}:"
+            f"{row.LastUpdate}:{row.ChangeVersion}"
+        )
+
+    @staticmethod
+    def _table_version_query(tables: List[str], index_usage: bool) -> str:
+        """TABLE_VERSION_QUERY for the given names, with or without the usage DMV."""
+        return TABLE_VERSION_QUERY.format(
+            placeholders=", ".join("(?)" for _ in tables),
+            last_update=LAST_UPDATE_COLUMN if index_usage else "NULL",
+            usage_join=LAST_UPDATE_JOIN if index_usage else "",
+        )
+
+    async def check_query_cost(
+        self,
+        query: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> Optional[PlanEstimate]:
+        """
+        Check a query's estimated plan against the configured cost limits.
+
+        Args:
+            query: SQL query about to be executed
+            database_name: Optional database name
+            timeout_seconds: Optional timeout in seconds
+
+        Returns:
+            The estimate, or None if the guard is off or no plan could be produced
+
+        Raises:
+            QueryCostExceededError: If the estimate exceeds a limit
+            QueryTimeoutError: If the plan could not be estimated in time
+        """
+        return await self.run_blocking(
+            self.check_query_cost_sync, query, database_name, timeout_seconds
+        )
+
+    def check_query_cost_sync(
+        self,
+        query: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> Optional[PlanEstimate]:
+        """Blocking implementation of :meth:`check_query_cost`."""
+        if not self.config.query_cost_guard:
+            return None
+
+        try:
+            estimate = self.estimate_query_cost_sync(query, database_name, timeout_seconds)
+        except pyodbc.Error as e:
+            if is_query_timeout(e):
+                # A plan that cannot even be compiled in time is no cheap query
+                raise
+            # E.g. batches referencing temp tables they create; let execution report it
+            print(f"Cost guard could not estimate query plan: {e}", file=sys.stderr)
+            return None
+
+        reasons = check_limits(
+            estimate,
+            self.config.query_cost_max_subtree_cost,
+            self.config.query_cost_max_estimated_rows,
+        )
+        if reasons:
+            self.plan_estimates.record_rejection()
+            raise QueryCostExceededError(estimate, reasons)
+        return estimate
+
+    def estimate_query_cost_sync(
+        self,
+        query: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> PlanEstimate:
+        """
+        Get a query's estimated plan without executing it (SET SHOWPLAN_XML ON).
+
+        Estimates are cached by normalized query text, so repeating a query
+        does not cost a second round trip.
+        """
+        server, database = self._cache_scope(database_name)
+        key = (server, database, normalize_query_text(query))
+        estimate = self.plan_estimates.get(key)
+        if estimate is not None:
+            return estimate
+
+        conn = self._get_connection(database_name, timeout_seconds)
+        try:
+            cursor = conn.cursor()
+            # SHOWPLAN_XML must be the only statement in its batch
+            cursor.execute("SET SHOWPLAN_XML ON")
+            try:
+                cursor.execute(query)
+                plans: List[str] = []
+                while True:
+                    if cursor.description:
+                        plans.extend(row[0] for row in cursor.fetchall())
+                    if not cursor.nextset():
+                        break
+            finally:
+                try:
+                    cursor.execute("SET SHOWPLAN_XML OFF")
+                except pyodbc.Error:
+                    # Would keep returning plans instead of results; never reuse it
+                    conn.invalidate()
         finally:
             conn.close()
 
+        estimate = parse_showplan(plans)
+        self.plan_estimates.put(key, estimate)
+        return estimate
+
+    async def fetch_next_page(
+        self,
+        continuation_token: str,
+        max_rows: Optional[int] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> ResultPage:
+        """
+        Fetch the next page of a paginated query or session result.
+
+        Args:
+            continuation_token: Token returned with the previous page
+            max_rows: Optional page size
+            timeout_seconds: Optional timeout in seconds for reading the page
+
+        Returns:
+            ResultPage with a new continuation token when more rows remain
+        """
+        return await self.run_blocking(
+            self.fetch_next_page_sync, continuation_token, max_rows, timeout_seconds
+        )
+
+    def fetch_next_page_sync(
+        self,
+        continuation_token: str,
+        max_rows: Optional[int] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> ResultPage:
+        """Blocking implementation of :meth:`fetch_next_page`."""
+        # Each page is its own tool call, so the open cursor gets this call's budget
+        seconds = timeout_seconds or self.config.default_command_timeout_seconds
+        timeout = bind_statement_timeout(seconds)
+        return self.pager.next_page(continuation_token, max_rows, timeout)
+
     async def list_databases(
         self, timeout_seconds: Optional[int] = None
     ) -> List[DatabaseInfo]:
         """List all databases on the server."""
-        conn = self._get_connection()
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        return await self.run_coalesced(
+            "list_databases", None, (), self.list_databases_sync, timeout_seconds
+        )
+
+    def list_databases_sync(
+        self, timeout_seconds: Optional[int] = None
+    ) -> List[DatabaseInfo]:
+        """Blocking implementation of :meth:`list_databases`."""
+        conn = self._get_connection(timeout_seconds=timeout_seconds)
 
         try:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
 
             query = """
                 SELECT
@@ -277,12 +1172,28 @@ class DatabaseService:
         timeout_seconds: Optional[int] = None,
     ) -> List[StoredProcedureInfo]:
         """List all stored procedures in the database."""
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        return await self.run_coalesced(
+            "list_stored_procedures",
+            database_name,
+            (),
+            self.list_stored_procedures_sync,
+            database_name,
+            timeout_seconds,
+        )
+
+    def list_stored_procedures_sync(
+        self,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> List[StoredProcedureInfo]:
+        """Blocking implementation of :meth:`list_stored_procedures`."""
+        if self.config.catalog_snapshot_enabled:
+            return self.catalog_snapshot_sync(database_name, timeout_seconds).list_stored_procedures()
+
+        conn = self._get_connection(database_name, timeout_seconds)
 
         try:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
 
             query = """
                 SELECT
@@ -328,15 +1239,30 @@ class DatabaseService:
         timeout_seconds: Optional[int] = None,
     ) -> str:
         """Get the definition of a stored procedure."""
+        return await self.run_coalesced(
+            "get_stored_procedure_definition",
+            database_name,
+            (self._object_key(procedure_name),),
+            self.get_stored_procedure_definition_sync,
+            procedure_name,
+            database_name,
+            timeout_seconds,
+        )
+
+    def get_stored_procedure_definition_sync(
+        self,
+        procedure_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> str:
+        """Blocking implementation of :meth:`get_stored_procedure_definition`."""
         if not procedure_name or not procedure_name.strip():
             raise ValueError("Procedure name cannot be empty")
 
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        conn = self._get_connection(database_name, timeout_seconds)
 
         try:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
 
             # Parse schema and procedure name
             schema_name = "dbo"
@@ -379,6 +1305,7 @@ class DatabaseService:
         parameters: Dict[str, Any],
         database_name: Optional[str] = None,
         timeout_seconds: Optional[int] = None,
+        refresh_metadata: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Execute a stored procedure with type-safe parameters.
@@ -388,6 +1315,7 @@ class DatabaseService:
             parameters: Dictionary of parameter names -> values
             database_name: Optional database name
             timeout_seconds: Optional timeout in seconds
+            refresh_metadata: Reload the cached procedure plan from the catalog
 
         Returns:
             List of result rows as dictionaries
@@ -395,60 +1323,55 @@ class DatabaseService:
         Raises:
             ValueError: If required parameters missing or type conversion fails
         """
+        return await self.run_blocking(
+            self.execute_stored_procedure_sync,
+            procedure_name,
+            parameters,
+            database_name,
+            timeout_seconds,
+            refresh_metadata,
+        )
+
+    def execute_stored_procedure_sync(
+        self,
+        procedure_name: str,
+        parameters: Dict[str, Any],
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+        refresh_metadata: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Blocking implementation of :meth:`execute_stored_procedure`."""
         if not procedure_name or not procedure_name.strip():
             raise ValueError("Procedure name cannot be empty")
 
-        # Get parameter metadata first
-        param_metadata = await self.get_sp_parameters(procedure_name, database_name, timeout_seconds)
-
-        # Convert and validate parameters
-        param_values = convert_parameters_for_execution(parameters, param_metadata)
-
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        conn = self._get_connection(database_name, timeout_seconds)
 
         try:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
-
-            # Parse schema and procedure name
-            schema_name = "dbo"
-            proc_name_only = procedure_name
 
-            if "." in procedure_name:
-                parts = procedure_name.split(".", 1)
-                schema_name = parts[0].strip("[]")
-                proc_name_only = parts[1].strip("[]")
+            # Cached EXEC text and converters, validated on this connection
+            plan = self.get_procedure_plan_sync(
+                procedure_name, database_name, refresh_metadata, conn, timeout_seconds
+            )
 
-            # Build parameter placeholders (skip parameter_id=0 which is return value)
-            input_params = [p for p in param_metadata if p.parameter_id > 0 and not p.is_output]
-            param_placeholders = ", ".join(["?" for _ in input_params])
+            # Convert and validate parameters
+            param_values = plan.convert(parameters)
 
-            # Execute stored procedure
-            if param_placeholders:
-                query = f"EXEC [{schema_name}].[{proc_name_only}] {param_placeholders}"
-                cursor.execute(query, *param_values)
-            else:
-                query = f"EXEC [{schema_name}].[{proc_name_only}]"
-                cursor.execute(query)
+            # Execute stored procedure
+            cursor.execute(plan.exec_sql, *param_values)
 
             # Collect all result sets
-            all_results = []
+            all_results: List[Dict[str, Any]] = []
             while True:
                 # Get column names
                 columns = [column[0] for column in cursor.description] if cursor.description else []
 
                 # Fetch results from this result set
                 if columns:
-                    rows = cursor.fetchall()
-                    for row in rows:
-                        result = {}
-                        for i, value in enumerate(row):
-                            if isinstance(value, datetime):
-                                result[columns[i]] = value.isoformat()
-                            else:
-                                result[columns[i]] = value
-                        all_results.append(result)
+                    convert_row = compile_row_converter(cursor.description)
+                    all_results.extend(
+                        dict(zip(columns, convert_row(row), strict=True)) for row in cursor.fetchall()
+                    )
 
                 # Try to move to next result set
                 if not cursor.nextset():
@@ -458,6 +1381,86 @@ class DatabaseService:
         finally:
             conn.close()
 
+    async def get_procedure_plan(
+        self,
+        procedure_name: str,
+        database_name: Optional[str] = None,
+        refresh: bool = False,
+        timeout_seconds: Optional[int] = None,
+    ) -> ProcedurePlan:
+        """
+        Get the cached execution plan for a stored procedure.
+
+        Args:
+            procedure_name: Name of the stored procedure (with optional schema)
+            database_name: Optional database name
+            refresh: Rebuild the plan from the catalog even if it is cached
+            timeout_seconds: Optional timeout in seconds
+
+        Returns:
+            ProcedurePlan with parameter metadata, EXEC text and converters
+        """
+        return await self.run_blocking(
+            self.get_procedure_plan_sync,
+            procedure_name,
+            database_name,
+            refresh,
+            None,
+            timeout_seconds,
+        )
+
+    def get_procedure_plan_sync(
+        self,
+        procedure_name: str,
+        database_name: Optional[str] = None,
+        refresh: bool = False,
+        conn: Optional[PooledConnection] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> ProcedurePlan:
+        """
+        Blocking implementation of :meth:`get_procedure_plan`.
+
+        When conn is given, the modify_date check and any parameter lookup
+        run on that connection instead of borrowing another one.
+        """
+        if not procedure_name or not procedure_name.strip():
+            raise ValueError("Procedure name cannot be empty")
+
+        schema_name, proc_name_only = self._split_object_name(procedure_name)
+        qualified_name = (
+            f"[{schema_name.replace(']', ']]')}].[{proc_name_only.replace(']', ']]')}]"
+        )
+
+        with self._borrowed(conn, database_name, timeout_seconds) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT modify_date FROM sys.procedures WHERE object_id = OBJECT_ID(?)",
+                qualified_name,
+            )
+            row = cursor.fetchone()
+
+            if not row:
+                raise ValueError(
+                    f"Stored procedure '{schema_name}.{proc_name_only}' does not exist "
+                    "or you don't have permission to access it"
+                )
+
+            modify_date = row[0]
+            server, database = self._cache_scope(database_name)
+            key = (server, database, f"{schema_name}.{proc_name_only}".lower())
+
+            if not refresh:
+                plan = self.procedure_plans.get(key, modify_date)
+                if plan is not None:
+                    return plan
+            parameters = self.get_sp_parameters_sync(
+                procedure_name, database_name, timeout_seconds, conn, refresh=refresh
+            )
+
+        plan = ProcedurePlan.build(schema_name, proc_name_only, modify_date, parameters)
+        self.procedure_plans.put(key, plan)
+        return plan
+
     async def get_sp_parameters(
         self,
         procedure_name: str,
@@ -475,15 +1478,65 @@ class DatabaseService:
         Returns:
             List of StoredProcedureParameter objects
         """
+        return await self.run_coalesced(
+            "get_sp_parameters",
+            database_name,
+            (self._object_key(procedure_name),),
+            self.get_sp_parameters_sync,
+            procedure_name,
+            database_name,
+            timeout_seconds,
+        )
+
+    def get_sp_parameters_sync(
+        self,
+        procedure_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+        conn: Optional[PooledConnection] = None,
+        refresh: bool = False,
+    ) -> List[StoredProcedureParameter]:
+        """
+        Blocking implementation of :meth:`get_sp_parameters`.
+
+        When conn is given, catalog queries run on it instead of a pooled
+        connection. With refresh, the schema version is read again and the
+        cached parameters are reloaded, so the metadata cache, its file and
+        the catalog snapshot are all brought up to date.
+        """
+        if refresh:
+            self.metadata_cache.forget_version(*self._cache_scope(database_name))
+
+        if self.config.catalog_snapshot_enabled:
+            if not procedure_name or not procedure_name.strip():
+                raise ValueError("Procedure name cannot be empty")
+            snapshot = self.catalog_snapshot_sync(database_name, timeout_seconds, conn)
+            return snapshot.procedure_parameters(self._object_key(procedure_name))
+
+        return self._cached_metadata(
+            database_name,
+            "sp_parameters",
+            procedure_name,
+            lambda: self._load_sp_parameters(
+                procedure_name, database_name, timeout_seconds, conn
+            ),
+            conn,
+            refresh,
+        )
+
+    def _load_sp_parameters(
+        self,
+        procedure_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+        conn: Optional[PooledConnection] = None,
+    ) -> List[StoredProcedureParameter]:
+        """Read stored procedure parameter metadata from the catalog."""
         if not procedure_name or not procedure_name.strip():
             raise ValueError("Procedure name cannot be empty")
 
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
-
-        try:
+        with self._borrowed(conn, database_name, timeout_seconds) as conn:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
 
             # Parse schema and procedure name
             schema_name = "dbo"
@@ -534,8 +1587,6 @@ class DatabaseService:
                 parameters.append(param)
 
             return parameters
-        finally:
-            conn.close()
 
     async def get_table_indexes(
         self,
@@ -554,15 +1605,50 @@ class DatabaseService:
         Returns:
             List of TableIndex objects
         """
+        return await self.run_coalesced(
+            "get_table_indexes",
+            database_name,
+            (self._object_key(table_name),),
+            self.get_table_indexes_sync,
+            table_name,
+            database_name,
+            timeout_seconds,
+        )
+
+    def get_table_indexes_sync(
+        self,
+        table_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> List[TableIndex]:
+        """Blocking implementation of :meth:`get_table_indexes`."""
+        if self.config.catalog_snapshot_enabled:
+            if not table_name or not table_name.strip():
+                raise ValueError("Table name cannot be empty")
+            snapshot = self.catalog_snapshot_sync(database_name, timeout_seconds)
+            return snapshot.table_indexes(self._object_key(table_name))
+
+        return self._cached_metadata(
+            database_name,
+            "table_indexes",
+            table_name,
+            lambda: self._load_table_indexes(table_name, database_name, timeout_seconds),
+        )
+
+    def _load_table_indexes(
+        self,
+        table_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> List[TableIndex]:
+        """Read index metadata for a table from the catalog."""
         if not table_name or not table_name.strip():
             raise ValueError("Table name cannot be empty")
 
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        conn = self._get_connection(database_name, timeout_seconds)
 
         try:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
 
             # Parse schema and table name
             schema_name = "dbo"
@@ -639,15 +1725,50 @@ class DatabaseService:
         Returns:
             List of ForeignKey objects
         """
+        return await self.run_coalesced(
+            "get_table_foreign_keys",
+            database_name,
+            (self._object_key(table_name),),
+            self.get_table_foreign_keys_sync,
+            table_name,
+            database_name,
+            timeout_seconds,
+        )
+
+    def get_table_foreign_keys_sync(
+        self,
+        table_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> List[ForeignKey]:
+        """Blocking implementation of :meth:`get_table_foreign_keys`."""
+        if self.config.catalog_snapshot_enabled:
+            if not table_name or not table_name.strip():
+                raise ValueError("Table name cannot be empty")
+            snapshot = self.catalog_snapshot_sync(database_name, timeout_seconds)
+            return snapshot.table_foreign_keys(self._object_key(table_name))
+
+        return self._cached_metadata(
+            database_name,
+            "table_foreign_keys",
+            table_name,
+            lambda: self._load_table_foreign_keys(table_name, database_name, timeout_seconds),
+        )
+
+    def _load_table_foreign_keys(
+        self,
+        table_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> List[ForeignKey]:
+        """Read foreign key metadata for a table from the catalog."""
         if not table_name or not table_name.strip():
             raise ValueError("Table name cannot be empty")
 
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        conn = self._get_connection(database_name, timeout_seconds)
 
         try:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
 
             # Parse schema and table name
             schema_name = "dbo"
@@ -695,6 +1816,99 @@ class DatabaseService:
         finally:
             conn.close()
 
+    async def describe_tables(
+        self,
+        table_names: Optional[List[str]] = None,
+        pattern: Optional[str] = None,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> Tuple[List[TableDescription], List[str]]:
+        """
+        Get columns, indexes and foreign keys for many tables at once.
+
+        Args:
+            table_names: Names of the tables (with optional schema)
+            pattern: LIKE pattern matched against schema.table and table,
+                used when table_names is not given
+            database_name: Optional database name
+            timeout_seconds: Optional timeout in seconds
+
+        Returns:
+            Tuple of (descriptions in schema, name order, requested names
+            that were not found)
+        """
+        key = (
+            tuple(sorted(self._object_key(name) for name in table_names))
+            if table_names is not None
+            else pattern,
+        )
+        # Callers sharing the execution may spell the names differently, so
+        # each one works out its own missing names from the shared matches
+        descriptions, found = await self.run_coalesced(
+            "describe_tables",
+            database_name,
+            key,
+            self._describe_matched_tables,
+            table_names,
+            pattern,
+            database_name,
+            timeout_seconds,
+        )
+        return descriptions, self._missing_tables(table_names, found)
+
+    def describe_tables_sync(
+        self,
+        table_names: Optional[List[str]] = None,
+        pattern: Optional[str] = None,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> Tuple[List[TableDescription], List[str]]:
+        """Blocking implementation of :meth:`describe_tables`."""
+        descriptions, found = self._describe_matched_tables(
+            table_names, pattern, database_name, timeout_seconds
+        )
+        return descriptions, self._missing_tables(table_names, found)
+
+    def _describe_matched_tables(
+        self,
+        table_names: Optional[List[str]],
+        pattern: Optional[str],
+        database_name: Optional[str],
+        timeout_seconds: Optional[int],
+    ) -> Tuple[List[TableDescription], Set[str]]:
+        """Describe the matching tables; also returns the object keys that matched."""
+        if (table_names is None) == (not pattern):
+            raise ValueError("Provide either table names or a LIKE pattern")
+
+        object_keys = None
+        if table_names is not None:
+            if not table_names or any(not name or not name.strip() for name in table_names):
+                raise ValueError("Table names cannot be empty")
+            if len(table_names) > MAX_DESCRIBED_TABLES:
+                raise ValueError(f"At most {MAX_DESCRIBED_TABLES} tables can be described per call")
+            object_keys = [self._object_key(name) for name in table_names]
+
+        if self.config.catalog_snapshot_enabled:
+            snapshot = self.catalog_snapshot_sync(database_name, timeout_seconds)
+            matched = snapshot.match_tables(object_keys, pattern, MAX_DESCRIBED_TABLES)
+        else:
+            names = (
+                list(dict.fromkeys(self._split_object_name(name) for name in table_names))
+                if table_names is not None
+                else None
+            )
+            with self._borrowed(None, database_name, timeout_seconds) as conn:
+                matched = describe_tables(conn.cursor(), names, pattern)
+
+        return [describe_table(obj) for obj in matched], {obj.key for obj in matched}
+
+    @classmethod
+    def _missing_tables(cls, table_names: Optional[List[str]], found: Set[str]) -> List[str]:
+        """Requested names, as given, whose tables were not matched."""
+        if table_names is None:
+            return []
+        return [name for name in table_names if cls._object_key(name) not in found]
+
     async def get_table_statistics(
         self,
         table_name: str,
@@ -712,15 +1926,30 @@ class DatabaseService:
         Returns:
             TableStatistics object
         """
+        return await self.run_coalesced(
+            "get_table_statistics",
+            database_name,
+            (self._object_key(table_name),),
+            self.get_table_statistics_sync,
+            table_name,
+            database_name,
+            timeout_seconds,
+        )
+
+    def get_table_statistics_sync(
+        self,
+        table_name: str,
+        database_name: Optional[str] = None,
+        timeout_seconds: Optional[int] = None,
+    ) -> TableStatistics:
+        """Blocking implementation of :meth:`get_table_statistics`."""
         if not table_name or not table_name.strip():
             raise ValueError("Table name cannot be empty")
 
-        conn = self._get_connection(database_name)
-        timeout = timeout_seconds or self.config.default_command_timeout_seconds
+        conn = self._get_connection(database_name, timeout_seconds)
 
         try:
             cursor = conn.cursor()
-            # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
 
             # Parse schema and table name
             schema_name = "dbo"
@@ -774,6 +2003,12 @@ class DatabaseService:
 class SessionManager:
     """Manages background query and stored procedure execution sessions."""
 
+    # How often the watchdog looks for sessions past their timeout
+    WATCHDOG_INTERVAL_SECONDS = 1.0
+
+    # How often finished sessions are swept for age and result budget
+    CLEANUP_SWEEP_SECONDS = 60.0
+
     def __init__(self, database_service: DatabaseService, max_workers: int = 10):
         """
         Initialize the session manager.
@@ -787,13 +2022,46 @@ class SessionManager:
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
         self._lock = threading.Lock()
         self._max_sessions = max_workers
-        self._cleanup_interval_minutes = 15
+        # Admission state, updated on every status transition
+        self._running: Set[str] = set()
+        config = database_service.config
+        self._scheduler = SessionScheduler(
+            max_per_database=config.session_max_per_database,
+            aging_seconds=config.session_priority_aging_seconds,
+        )
+        self._cost_history = CostHistory()
+        self._queue_max_length = database_service.config.session_queue_max_length
+        self._queue_timeout_seconds = database_service.config.session_queue_timeout_seconds
+        self._cleanup_interval_minutes = database_service.config.session_cleanup_interval_minutes
+        self._results_max_bytes = database_service.config.session_results_max_bytes
+        # Bytes held by all result buffers, kept current as they grow and close
+        self._result_bytes = ByteCounter()
+        # Live driver handles and pending work, keyed by session id
+        self._live: Dict[str, Tuple[PooledConnection, pyodbc.Cursor]] = {}
+        self._futures: Dict[str, Future] = {}
+        self._cancel_started: Dict[str, float] = {}
+        self._cancelled = 0
+        self._cancel_latency_total_ms = 0.0
+        self._cancel_latency_max_ms = 0.0
+        self._timed_out = 0
+        self._expired_sessions = 0
+        self._evicted_sessions = 0
+        self._bytes_reclaimed = 0
+
+        # Cancels sessions that run past their timeout_seconds and
+        # periodically removes finished ones
+        self._stop = threading.Event()
+        self._watchdog = threading.Thread(
+            target=self._maintain, name="mssql-session-maintenance", daemon=True
+        )
+        self._watchdog.start()
 
     def start_query(
         self,
         query: str,
         database_name: Optional[str] = None,
         timeout_seconds: int = 30,
+        priority: Optional[SessionPriority] = None,
     ) -> str:
         """
         Start a query in the background.
@@ -802,40 +2070,96 @@ class SessionManager:
             query: SQL query to execute
             database_name: Optional database name
             timeout_seconds: Query timeout in seconds
+            priority: Scheduling class; inferred from past run time if None
 
         Returns:
             session_id: Unique session identifier
 
         Raises:
-            RuntimeError: If maximum concurrent sessions reached
+            RuntimeError: If maximum concurrent sessions reached and the wait queue is full
+        """
+        session = QuerySession(
+            session_id=str(uuid.uuid4()),
+            query=query,
+            session_type=SessionType.QUERY,
+            status=SessionStatus.QUEUED,
+            start_time=datetime.utcnow(),
+            database_name=database_name,
+            timeout_seconds=timeout_seconds,
+        )
+        self._admit(session, priority)
+        return session.session_id
+
+    def _admit(self, session: QuerySession, priority: Optional[SessionPriority]) -> None:
+        """
+        Queue the session with the scheduler and start whatever may run now.
+
+        Args:
+            session: The new session
+            priority: Explicit priority class, or None to infer it from the
+                statement's past run time
+
+        Raises:
+            RuntimeError: If no slot is free and the wait queue is full
         """
+        config = self.database_service.config
+        session.priority = priority or self._cost_history.classify(
+            self._cost_key(session),
+            config.session_interactive_max_seconds,
+            config.session_batch_min_seconds,
+        )
+        session.queued_time = session.start_time
+
         with self._lock:
-            # Check concurrent session limit
-            active_sessions = sum(
-                1 for s in self._sessions.values() if s.is_running()
-            )
-            if active_sessions >= self._max_sessions:
+            self._sessions[session.session_id] = session
+            self._scheduler.enqueue(session.session_id, session.priority, session.database_name)
+            self._dispatch_locked()
+
+            if session.status == SessionStatus.QUEUED and len(self._scheduler) > self._queue_max_length:
+                self._scheduler.remove(session.session_id)
+                del self._sessions[session.session_id]
+                if self._queue_max_length > 0:
+                    raise RuntimeError(
+                        f"Maximum concurrent sessions ({self._max_sessions}) reached "
+                        f"and the session queue is full ({self._queue_max_length} waiting)"
+                    )
                 raise RuntimeError(
                     f"Maximum concurrent sessions ({self._max_sessions}) reached"
                 )
 
-            # Create new session
-            session_id = str(uuid.uuid4())
-            session = QuerySession(
-                session_id=session_id,
-                query=query,
-                session_type=SessionType.QUERY,
-                status=SessionStatus.RUNNING,
-                start_time=datetime.utcnow(),
-                database_name=database_name,
-                timeout_seconds=timeout_seconds,
-            )
-            self._sessions[session_id] = session
+    @staticmethod
+    def _cost_key(session: QuerySession) -> str:
+        """Key under which the session's run time is remembered."""
+        return CostHistory.key(session.session_type.value, session.query)
+
+    def _dispatch_locked(self) -> None:
+        """Start queued sessions, in scheduler order, while slots are free."""
+        while len(self._running) < self._max_sessions:
+            session_id = self._scheduler.pop_next()
+            if session_id is None:
+                return
+            self._start_locked(self._sessions[session_id])
+
+    def _start_locked(self, session: QuerySession) -> None:
+        """Mark a session running and hand it to a worker thread."""
+        now = datetime.utcnow()
+        session.queue_wait_seconds = (now - session.start_time).total_seconds()
+        session.status = SessionStatus.RUNNING
+        session.start_time = now
+        self._running.add(session.session_id)
 
         # Launch background execution
-        self._executor.submit(self._execute_query_in_background, session)
-
-        return session_id
+        if session.session_type == SessionType.STORED_PROCEDURE:
+            worker = self._execute_sp_in_background
+        else:
+            worker = self._execute_query_in_background
+        self._futures[session.session_id] = self._executor.submit(worker, session)
+
+    def _release_slot_locked(self, session: QuerySession) -> None:
+        """Free a running session's slot and start the next queued session."""
+        self._running.discard(session.session_id)
+        self._scheduler.finished(session.database_name)
+        self._dispatch_locked()
 
     def _execute_query_in_background(self, session: QuerySession) -> None:
         """
@@ -845,12 +2169,19 @@ class SessionManager:
             session: The query session to execute
         """
         try:
+            if not session.is_running():
+                return
+
             # Get connection for this thread
-            conn = self.database_service._get_connection(session.database_name)
+            conn = self._session_connection(session)
 
             try:
                 cursor = conn.cursor()
-                # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
+                self._attach(session, conn, cursor)
+
+                _track_session_state(conn, session.query)
+                if not self._begin_statement(session):
+                    return
                 cursor.execute(session.query)
 
                 # Get column names
@@ -860,50 +2191,196 @@ class SessionManager:
                     else []
                 )
 
-                # Fetch results
-                rows = cursor.fetchall()
-                session.row_count = len(rows)
-
-                # Format results as tab-delimited string
-                result_lines = []
+                # Write results as tab-delimited lines
+                buffer = self._new_result_buffer(session)
                 if columns:
-                    result_lines.append("\t".join(columns))
-
-                for row in rows:
-                    row_data = []
-                    for value in row:
-                        if value is None:
-                            row_data.append("NULL")
-                        elif isinstance(value, datetime):
-                            row_data.append(value.isoformat())
-                        else:
-                            row_data.append(str(value))
-                    result_lines.append("\t".join(row_data))
-
-                session.results = "\n".join(result_lines)
-                session.status = SessionStatus.COMPLETED
+                    buffer.append_line("\t".join(columns))
+                    session.row_count = self._fetch_result_lines(session, cursor, buffer)
+
+                self._finish(session, SessionStatus.COMPLETED)
 
             finally:
+                self._detach(session)
                 conn.close()
 
         except Exception as e:
-            session.status = SessionStatus.FAILED
-            session.error = str(e)
+            self._finish_with_error(session, e)
         finally:
+            if session.status != SessionStatus.COMPLETED:
+                self._discard_results(session)
+            self._worker_exited(session)
+            self.enforce_result_budget()
+
+    def _session_connection(self, session: QuerySession) -> PooledConnection:
+        """Borrow a connection whose query timeout is the session's remaining time."""
+        timeout = None
+        if session.timeout_seconds and session.timeout_seconds > 0:
+            remaining = session.timeout_seconds - session.duration_seconds()
+            timeout = max(1, math.ceil(remaining))
+        return self.database_service._get_connection(
+            session.database_name, timeout, SESSION_LIMIT
+        )
+
+    def _finish_with_error(self, session: QuerySession, error: Exception) -> None:
+        """Record a worker failure, distinguishing session timeouts."""
+        if is_query_timeout(error):
+            timeout_error = QueryTimeoutError(SESSION_LIMIT, session.timeout_seconds)
+            if self._finish(session, SessionStatus.TIMED_OUT, error=str(timeout_error)):
+                with self._lock:
+                    self._timed_out += 1
+        else:
+            self._finish(session, SessionStatus.FAILED, error=str(error))
+
+    def _new_result_buffer(self, session: QuerySession) -> ResultBuffer:
+        """Attach an empty result buffer to the session."""
+        config = self.database_service.config
+        session.result_buffer = ResultBuffer(
+            spill_threshold_bytes=config.session_spill_threshold_bytes,
+            spill_directory=config.session_spill_directory,
+            usage=self._result_bytes,
+        )
+        return session.result_buffer
+
+    @staticmethod
+    def _discard_results(session: QuerySession) -> int:
+        """
+        Free a session's stored results, deleting any spill file.
+
+        Returns:
+            Number of result bytes released
+        """
+        buffer = session.result_buffer
+        session.result_buffer = None
+        if buffer is None:
+            return 0
+        size = buffer.size_bytes
+        buffer.close()
+        return size
+
+    def _fetch_result_lines(
+        self, session: QuerySession, cursor: pyodbc.Cursor, buffer: ResultBuffer
+    ) -> int:
+        """
+        Fetch the current result set into the buffer as tab-delimited lines.
+
+        Rows are read in batches so a cancelled session stops fetching between
+        batches even if the driver has already buffered the result. Each batch
+        is readable through the buffer as soon as it has been appended.
+
+        Returns:
+            Number of rows fetched
+        """
+        batch_size = self.database_service.config.query_fetch_batch_size
+        convert_text = compile_text_row_converter(cursor.description)
+        row_count = 0
+
+        while session.is_running():
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+
+            for row in rows:
+                buffer.append_line("\t".join(convert_text(row)))
+            row_count += len(rows)
+            session.rows_fetched += len(rows)
+
+        return row_count
+
+    def _attach(
+        self, session: QuerySession, conn: PooledConnection, cursor: pyodbc.Cursor
+    ) -> None:
+        """Register the live cursor so the session can be cancelled at the driver."""
+        with self._lock:
+            self._futures.pop(session.session_id, None)
+            self._live[session.session_id] = (conn, cursor)
+
+    def _begin_statement(self, session: QuerySession) -> bool:
+        """
+        Check, immediately before the session's statement is sent, that it
+        has not been cancelled.
+
+        A cancel arriving after this check finds the cursor registered by
+        :meth:`_attach`; one that reaches the driver before the statement
+        does is repeated by the watchdog until the worker exits.
+
+        Returns:
+            False if the session was cancelled and must not execute
+        """
+        with self._lock:
+            return session.is_running()
+
+    def _detach(self, session: QuerySession) -> None:
+        """Forget the live cursor once the worker is done with it."""
+        with self._lock:
+            self._live.pop(session.session_id, None)
+
+    def _finish(
+        self,
+        session: QuerySession,
+        status: SessionStatus,
+        error: Optional[str] = None,
+    ) -> bool:
+        """
+        Record the outcome unless the session has already been cancelled.
+
+        Returns:
+            True if the outcome was recorded
+        """
+        with self._lock:
+            if not session.is_running():
+                return False
+            session.error = error
+            session.status = status
             session.end_time = datetime.utcnow()
 
-    def get_session(self, session_id: str) -> Optional[QuerySession]:
+        if status == SessionStatus.COMPLETED:
+            # Feeds priority inference for the next run of the same statement
+            self._cost_history.record(self._cost_key(session), session.duration_seconds())
+        return True
+
+    def _worker_exited(self, session: QuerySession) -> None:
+        """
+        Free the session's slot once its worker thread is done.
+
+        The slot is held until then, including after a cancel, so a newly
+        started session never waits in the executor for a busy thread while
+        its own timeout is already running.
+        """
+        with self._lock:
+            if session.session_id in self._running:
+                self._release_slot_locked(session)
+        self._record_cancel_latency(session)
+
+    def _record_cancel_latency(self, session: QuerySession) -> None:
+        """Record the time from a cancel request to the worker releasing its slot."""
+        with self._lock:
+            self._futures.pop(session.session_id, None)
+            started = self._cancel_started.pop(session.session_id, None)
+            if started is None:
+                return
+            latency_ms = (time.monotonic() - started) * 1000
+            session.cancel_latency_ms = latency_ms
+            self._cancelled += 1
+            self._cancel_latency_total_ms += latency_ms
+            self._cancel_latency_max_ms = max(self._cancel_latency_max_ms, latency_ms)
+
+    def get_session(self, session_id: str, mark_read: bool = False) -> Optional[QuerySession]:
         """
         Get a session by ID.
 
         Args:
             session_id: The session identifier
+            mark_read: Record that the session's results are being read, which
+                keeps it from being evicted ahead of less recently read sessions
 
         Returns:
             QuerySession if found, None otherwise
         """
         with self._lock:
-            return self._sessions.get(session_id)
+            session = self._sessions.get(session_id)
+            if session is not None and mark_read:
+                session.last_read_time = datetime.utcnow()
+            return session
 
     def list_sessions(self) -> List[QuerySession]:
         """
@@ -919,27 +2396,203 @@ class SessionManager:
         """
         Cancel a running session.
 
+        Work that has not started yet is dropped; a statement in flight is
+        interrupted with cursor.cancel(), which sends a TDS attention to the
+        server. The session's concurrency slot is freed once its worker
+        thread has stopped.
+
         Args:
             session_id: The session identifier
 
         Returns:
             True if session was cancelled, False if not found or already completed
-
-        Note:
-            Due to pyodbc limitations, cancellation closes the connection but
-            the query may still complete on the server side.
         """
+        return self._cancel(session_id, SessionStatus.CANCELLED, "Cancelled by user")
+
+    def _cancel(self, session_id: str, status: SessionStatus, reason: str) -> bool:
+        """Stop a queued or running session, interrupting its statement at the driver."""
         with self._lock:
             session = self._sessions.get(session_id)
-            if not session or not session.is_running():
+            if not session or not session.is_active():
                 return False
 
-            session.status = SessionStatus.CANCELLED
+            session.status = status
             session.end_time = datetime.utcnow()
-            session.error = "Cancelled by user"
+            session.error = reason
+            if session_id not in self._running:
+                # Still waiting for a slot; nothing has run
+                self._scheduler.remove(session_id)
+                return True
+            self._cancel_started[session_id] = time.monotonic()
+            future = self._futures.pop(session_id, None)
+            live = self._live.get(session_id)
+
+        if future is not None and future.cancel():
+            # Never reached a worker thread
+            self._worker_exited(session)
+        elif live is not None:
+            self._cancel_cursor(*live)
 
         return True
 
+    @staticmethod
+    def _cancel_cursor(conn: PooledConnection, cursor: pyodbc.Cursor) -> None:
+        """Interrupt the cursor's statement at the driver."""
+        try:
+            cursor.cancel()
+        except pyodbc.Error:
+            # The connection state is unknown; do not hand it out again
+            conn.invalidate()
+
+    def repeat_pending_cancels(self) -> None:
+        """
+        Cancel again at the driver for cancelled sessions whose worker is still running.
+
+        A cancel that reaches the driver just before the statement is sent
+        has nothing to interrupt, so it is repeated on each watchdog tick
+        until the worker gives up its slot.
+        """
+        with self._lock:
+            live = [
+                self._live[session_id]
+                for session_id in self._cancel_started
+                if session_id in self._live
+            ]
+
+        for conn, cursor in live:
+            self._cancel_cursor(conn, cursor)
+
+    def enforce_deadlines(self) -> int:
+        """
+        Cancel running sessions that have exceeded their timeout_seconds.
+
+        Queued sessions that waited longer than SESSION_QUEUE_TIMEOUT_SECONDS
+        for a free slot are timed out as well.
+
+        Returns:
+            Number of sessions timed out
+        """
+        with self._lock:
+            running = [self._sessions[session_id] for session_id in self._running]
+            queued = [self._sessions[session_id] for session_id in self._scheduler.queued_ids()]
+
+        overdue = [
+            session
+            for session in running
+            if session.timeout_seconds
+            and session.timeout_seconds > 0
+            and session.duration_seconds() > session.timeout_seconds
+        ]
+        waited_too_long = [
+            session
+            for session in queued
+            if self._queue_timeout_seconds > 0
+            and session.duration_seconds() > self._queue_timeout_seconds
+        ]
+
+        timed_out = 0
+        for session in overdue:
+            reason = str(QueryTimeoutError(SESSION_LIMIT, session.timeout_seconds))
+            if self._cancel(session.session_id, SessionStatus.TIMED_OUT, reason):
+                timed_out += 1
+        for session in waited_too_long:
+            reason = (
+                f"Waited more than {self._queue_timeout_seconds}s for a free session slot "
+                f"(SESSION_QUEUE_TIMEOUT_SECONDS)"
+            )
+            if self._cancel(session.session_id, SessionStatus.TIMED_OUT, reason):
+                timed_out += 1
+
+        with self._lock:
+            self._timed_out += timed_out
+        return timed_out
+
+    def _maintain(self) -> None:
+        """Maintenance loop run on a daemon thread."""
+        next_sweep = time.monotonic() + self.CLEANUP_SWEEP_SECONDS
+        while not self._stop.wait(self.WATCHDOG_INTERVAL_SECONDS):
+            try:
+                self.enforce_deadlines()
+                self.repeat_pending_cancels()
+                if time.monotonic() >= next_sweep:
+                    next_sweep = time.monotonic() + self.CLEANUP_SWEEP_SECONDS
+                    self.cleanup_completed_sessions()
+                    self.enforce_result_budget()
+                    self.database_service.maintain()
+            except Exception as e:
+                print(f"Session maintenance error: {e}", file=sys.stderr)
+
+    def enforce_result_budget(self) -> int:
+        """
+        Evict finished sessions, least recently read first, while the results
+        held by all sessions exceed SESSION_RESULTS_MAX_BYTES.
+
+        Returns:
+            Number of sessions evicted
+        """
+        # Checked against the running total, so staying within budget is O(1)
+        if self._results_max_bytes <= 0 or self._result_bytes.total <= self._results_max_bytes:
+            return 0
+
+        evicted: List[QuerySession] = []
+        with self._lock:
+            total = self._result_bytes.total
+
+            candidates = sorted(
+                (
+                    s
+                    for s in self._sessions.values()
+                    if not s.is_active()
+                    and s.result_buffer is not None
+                    and s.session_id not in self._running
+                ),
+                key=lambda s: s.last_read_time or s.end_time or s.start_time,
+            )
+            for session in candidates:
+                if total <= self._results_max_bytes:
+                    break
+                if session.result_buffer is not None:
+                    total -= session.result_buffer.size_bytes
+                del self._sessions[session.session_id]
+                evicted.append(session)
+
+        reclaimed = sum(self._discard_results(session) for session in evicted)
+        with self._lock:
+            self._evicted_sessions += len(evicted)
+            self._bytes_reclaimed += reclaimed
+        return len(evicted)
+
+    def shutdown(self) -> None:
+        """Stop the maintenance thread and release the background worker threads."""
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return session and cancellation counters."""
+        with self._lock:
+            return {
+                "maxConcurrent": self._max_sessions,
+                "running": len(self._running),
+                "queued": len(self._scheduler),
+                "maxQueued": self._queue_max_length,
+                "scheduler": self._scheduler.stats(),
+                "tracked": len(self._sessions),
+                "cancelled": self._cancelled,
+                "timedOut": self._timed_out,
+                "cancelPending": len(self._cancel_started),
+                "avgCancelLatencyMs": (
+                    self._cancel_latency_total_ms / self._cancelled
+                    if self._cancelled
+                    else 0.0
+                ),
+                "maxCancelLatencyMs": self._cancel_latency_max_ms,
+                "resultBytes": self._result_bytes.total,
+                "resultMaxBytes": self._results_max_bytes,
+                "expiredSessions": self._expired_sessions,
+                "evictedSessions": self._evicted_sessions,
+                "bytesReclaimed": self._bytes_reclaimed,
+            }
+
     def cleanup_completed_sessions(self) -> int:
         """
         Remove completed sessions older than the cleanup interval.
@@ -957,13 +2610,20 @@ class SessionManager:
                 for session_id, session in self._sessions.items()
                 if session.end_time
                 and session.end_time < cutoff_time
-                and not session.is_running()
+                and not session.is_active()
+                # A cancelled session keeps its slot until the worker exits
+                and session_id not in self._running
             ]
 
-            for session_id in sessions_to_remove:
-                del self._sessions[session_id]
+            removed = [self._sessions.pop(session_id) for session_id in sessions_to_remove]
 
-            return len(sessions_to_remove)
+        # Deletes spill files along with the in-memory results
+        reclaimed = sum(self._discard_results(session) for session in removed)
+        with self._lock:
+            self._expired_sessions += len(removed)
+            self._bytes_reclaimed += reclaimed
+
+        return len(removed)
 
     def start_stored_procedure(
         self,
@@ -971,6 +2631,7 @@ class SessionManager:
         parameters: Dict[str, Any],
         database_name: Optional[str] = None,
         timeout_seconds: int = 30,
+        priority: Optional[SessionPriority] = None,
     ) -> str:
         """
         Start a stored procedure execution in the background.
@@ -980,41 +2641,26 @@ class SessionManager:
             parameters: Dictionary of parameter names -> values
             database_name: Optional database name
             timeout_seconds: Execution timeout in seconds
+            priority: Scheduling class; inferred from past run time if None
 
         Returns:
             session_id: Unique session identifier
 
         Raises:
-            RuntimeError: If maximum concurrent sessions reached
+            RuntimeError: If maximum concurrent sessions reached and the wait queue is full
         """
-        with self._lock:
-            # Check concurrent session limit
-            active_sessions = sum(
-                1 for s in self._sessions.values() if s.is_running()
-            )
-            if active_sessions >= self._max_sessions:
-                raise RuntimeError(
-                    f"Maximum concurrent sessions ({self._max_sessions}) reached"
-                )
-
-            # Create new session
-            session_id = str(uuid.uuid4())
-            session = QuerySession(
-                session_id=session_id,
-                query=procedure_name,  # Store procedure name in query field
-                session_type=SessionType.STORED_PROCEDURE,
-                status=SessionStatus.RUNNING,
-                start_time=datetime.utcnow(),
-                database_name=database_name,
-                parameters=parameters,  # Store parameters
-                timeout_seconds=timeout_seconds,
-            )
-            self._sessions[session_id] = session
-
-        # Launch background execution
-        self._executor.submit(self._execute_sp_in_background, session)
-
-        return session_id
+        session = QuerySession(
+            session_id=str(uuid.uuid4()),
+            query=procedure_name,  # Store procedure name in query field
+            session_type=SessionType.STORED_PROCEDURE,
+            status=SessionStatus.QUEUED,
+            start_time=datetime.utcnow(),
+            database_name=database_name,
+            parameters=parameters,  # Store parameters
+            timeout_seconds=timeout_seconds,
+        )
+        self._admit(session, priority)
+        return session.session_id
 
     def _execute_sp_in_background(self, session: QuerySession) -> None:
         """
@@ -1023,107 +2669,71 @@ class SessionManager:
         Args:
             session: The session with stored procedure info
         """
-        import asyncio
-
         try:
-            # Create a new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            if not session.is_running():
+                return
+
+            # Get connection for this thread
+            conn = self._session_connection(session)
 
             try:
-                # Get parameter metadata
-                param_metadata_future = self.database_service.get_sp_parameters(
+                cursor = conn.cursor()
+                self._attach(session, conn, cursor)
+
+                # Cached procedure plan, validated on the session's connection
+                plan = self.database_service.get_procedure_plan_sync(
                     session.query,  # procedure_name stored in query field
                     session.database_name,
-                    session.timeout_seconds
+                    conn=conn,
                 )
-                param_metadata = loop.run_until_complete(param_metadata_future)
 
                 # Convert and validate parameters
-                param_values = convert_parameters_for_execution(
-                    session.parameters or {},
-                    param_metadata
-                )
+                param_values = plan.convert(session.parameters or {})
 
-                # Get connection for this thread
-                conn = self.database_service._get_connection(session.database_name)
+                if not self._begin_statement(session):
+                    return
 
-                try:
-                    cursor = conn.cursor()
-                    # Note: pyodbc doesn't support cursor.timeout - using connection timeout instead
-
-                    # Parse schema and procedure name
-                    schema_name = "dbo"
-                    proc_name_only = session.query
-
-                    if "." in session.query:
-                        parts = session.query.split(".", 1)
-                        schema_name = parts[0].strip("[]")
-                        proc_name_only = parts[1].strip("[]")
-
-                    # Build parameter placeholders (skip parameter_id=0 and OUTPUT params)
-                    input_params = [p for p in param_metadata if p.parameter_id > 0 and not p.is_output]
-                    param_placeholders = ", ".join(["?" for _ in input_params])
-
-                    # Execute stored procedure
-                    if param_placeholders:
-                        query = f"EXEC [{schema_name}].[{proc_name_only}] {param_placeholders}"
-                        cursor.execute(query, *param_values)
-                    else:
-                        query = f"EXEC [{schema_name}].[{proc_name_only}]"
-                        cursor.execute(query)
-
-                    # Collect all result sets
-                    result_lines = []
-                    total_rows = 0
-
-                    while True:
-                        # Get column names
-                        columns = (
-                            [column[0] for column in cursor.description]
-                            if cursor.description
-                            else []
-                        )
-
-                        # Fetch results from this result set
-                        if columns:
-                            # Add header for this result set
-                            if result_lines:
-                                result_lines.append("")  # Separator between result sets
-                            result_lines.append("\t".join(columns))
-
-                            rows = cursor.fetchall()
-                            for row in rows:
-                                row_data = []
-                                for value in row:
-                                    if value is None:
-                                        row_data.append("NULL")
-                                    elif isinstance(value, datetime):
-                                        row_data.append(value.isoformat())
-                                    else:
-                                        row_data.append(str(value))
-                                result_lines.append("\t".join(row_data))
-                                total_rows += 1
-
-                        # Try to move to next result set
-                        if not cursor.nextset():
-                            break
-
-                    session.row_count = total_rows
-                    session.results = "\n".join(result_lines)
-                    session.status = SessionStatus.COMPLETED
-
-                finally:
-                    conn.close()
+                # Execute stored procedure
+                cursor.execute(plan.exec_sql, *param_values)
+
+                # Collect all result sets
+                buffer = self._new_result_buffer(session)
+                total_rows = 0
+
+                while session.is_running():
+                    # Get column names
+                    columns = (
+                        [column[0] for column in cursor.description]
+                        if cursor.description
+                        else []
+                    )
+
+                    # Fetch results from this result set
+                    if columns:
+                        # Add header for this result set
+                        if buffer.line_count:
+                            buffer.append_line("")  # Separator between result sets
+                        buffer.append_line("\t".join(columns))
+                        total_rows += self._fetch_result_lines(session, cursor, buffer)
+
+                    # Try to move to next result set
+                    if not cursor.nextset():
+                        break
+
+                session.row_count = total_rows
+                self._finish(session, SessionStatus.COMPLETED)
 
             finally:
-                loop.close()
+                self._detach(session)
+                conn.close()
 
         except Exception as e:
-            session.status = SessionStatus.FAILED
-            session.error = str(e)
+            self._finish_with_error(session, e)
         finally:
-            session.end_time = datetime.utcnow()
+            if session.status != SessionStatus.COMPLETED:
+                self._discard_results(session)
+            self._worker_exited(session)
+            self.enforce_result_budget()
 
 
 class CapabilityDetector:
@@ -1170,8 +2780,14 @@ class CapabilityDetector:
                 if age_minutes < self.CACHE_TTL_MINUTES:
                     return capability
 
-        # Detect capabilities
-        capability = await self._detect_capabilities(database_name)
+        # Detect capabilities, sharing a detection already running for this key
+        capability = await self.database_service.run_coalesced(
+            "get_server_capabilities",
+            database_name,
+            (cache_key,),
+            self._detect_capabilities,
+            database_name,
+        )
 
         # Update cache
         with self._lock:
@@ -1179,7 +2795,7 @@ class CapabilityDetector:
 
         return capability
 
-    async def _detect_capabilities(
+    def _detect_capabilities(
         self, database_name: Optional[str] = None
     ) -> ServerCapability:
         """
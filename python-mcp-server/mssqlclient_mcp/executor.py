@@ -0,0 +1,98 @@
+"""Bounded executor for running blocking database work off the event loop."""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class BlockingExecutor:
+    """
+    Dedicated thread pool for synchronous pyodbc calls made from async code.
+
+    Work beyond the worker count waits in a queue of limited depth; once the
+    queue is full new work is rejected instead of piling up behind slow
+    queries.
+    """
+
+    def __init__(self, max_workers: int = 8, max_queue_depth: int = 64):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of worker threads running driver calls
+            max_queue_depth: Maximum number of calls waiting for a worker
+        """
+        if max_workers < 1:
+            raise ValueError("Executor worker count must be at least 1")
+        if max_queue_depth < 0:
+            raise ValueError("Executor queue depth cannot be negative")
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mssql-db"
+        )
+        self._max_workers = max_workers
+        self._max_queue_depth = max_queue_depth
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on a worker thread and await its result.
+
+        Raises:
+            RuntimeError: If the executor queue is full
+        """
+        with self._lock:
+            if self._active + self._queued >= self._max_workers + self._max_queue_depth:
+                self._rejected += 1
+                raise RuntimeError(
+                    f"Database executor is saturated ({self._max_workers} active, "
+                    f"{self._max_queue_depth} queued); try again later"
+                )
+            self._queued += 1
+
+        # Carry context variables such as the tool call deadline to the worker
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, self._invoke, func, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _invoke(self, func: Callable[..., T], args: tuple, kwargs: Dict[str, Any]) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def _on_done(self, future: Future) -> None:
+        # Work cancelled before a worker picked it up never leaves the queue
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return queued and active work counters."""
+        with self._lock:
+            return {
+                "maxWorkers": self._max_workers,
+                "maxQueueDepth": self._max_queue_depth,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,38 +1,161 @@
 """Formatters for converting database results to readable formats."""
 
-from typing import List, Dict, Any
-from .models import TableInfo, TableSchemaInfo, DatabaseInfo, StoredProcedureInfo
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+from uuid import UUID
 
+from .models import (
+    EnhancedJSONEncoder,
+    TableInfo,
+    TableSchemaInfo,
+    TableDescription,
+    DatabaseInfo,
+    StoredProcedureInfo,
+    RowCountStrategy,
+    QueryResult,
+)
 
-def format_table_list(tables: List[TableInfo]) -> str:
+# Output formats accepted by the query tools
+QUERY_RESULT_FORMATS = ("markdown", "json-columnar", "tsv")
+
+# Layouts of the json-columnar format: row arrays or one array per column
+JSON_LAYOUTS = ("rows", "columns")
+
+# Longest cell shown in a markdown table before it is cut off with "..."
+MAX_CELL_WIDTH = 50
+
+
+ROW_COUNT_SOURCES = {
+    RowCountStrategy.CATALOG: "catalog (approximate, from sys.partitions)",
+    RowCountStrategy.EXACT: "exact (COUNT_BIG(*))",
+    RowCountStrategy.NONE: "not collected",
+}
+
+# Value types whose text is always short and free of separators, so their
+# columns skip both truncation and escaping
+_SHORT_TYPES = frozenset((int, float, bool, Decimal, UUID, datetime, date, time, type(None)))
+
+# Characters escaped in TSV cells
+_TSV_SPECIAL = ("\\", "\t", "\n", "\r")
+
+# Characters that would end a markdown table cell or row
+_MARKDOWN_SPECIAL = ("|", "\n", "\r")
+
+
+def _truncate_all(texts: Iterable[str]) -> List[str]:
+    """Cut every cell down to MAX_CELL_WIDTH characters."""
+    width = MAX_CELL_WIDTH
+    return [text if len(text) <= width else text[:width] + "..." for text in texts]
+
+
+def _markdown_escape(text: str) -> str:
+    """Escape pipes and flatten line breaks so a cell stays on its table row."""
+    return text.replace("|", "\\|").replace("\r\n", " ").replace("\n", " ").replace("\r", " ")
+
+
+def _markdown_column(values: Sequence[Any]) -> List[str]:
+    """Render one column of a markdown table, picking the conversion once for the column."""
+    types = set(map(type, values))
+    if types <= _SHORT_TYPES:
+        return list(map(str, values))
+    texts = _truncate_all(values if types == {str} else map(str, values))
+
+    # Escaped after truncation so "..." never splits an escape
+    joined = "".join(texts)
+    if any(special in joined for special in _MARKDOWN_SPECIAL):
+        return [_markdown_escape(text) for text in texts]
+    return texts
+
+
+def _tsv_escape(text: str) -> str:
+    """Escape characters that would break the TSV layout."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _tsv_column(values: Sequence[Any]) -> List[str]:
+    """Render one TSV column, picking the conversion once for the column."""
+    types = set(map(type, values))
+    if type(None) in types:
+        texts = ["NULL" if value is None else str(value) for value in values]
+    elif types == {str}:
+        texts = list(values)
+    else:
+        texts = list(map(str, values))
+
+    if types <= _SHORT_TYPES:
+        return texts
+
+    # One scan of the whole column decides whether any cell needs escaping
+    joined = "".join(texts)
+    if any(special in joined for special in _TSV_SPECIAL):
+        return [_tsv_escape(text) for text in texts]
+    return texts
+
+
+def _render_columns(
+    rows: Sequence[Sequence[Any]], render_column: Callable[[Sequence[Any]], List[str]]
+) -> Iterator[Tuple[str, ...]]:
+    """Render rows column by column and yield the cells of each row."""
+    return zip(*[render_column(values) for values in zip(*rows, strict=True)], strict=True)
+
+
+def format_table_list(
+    tables: List[TableInfo],
+    row_count_strategy: RowCountStrategy = RowCountStrategy.CATALOG,
+) -> str:
     """Format table list as markdown table."""
     if not tables:
         return "No tables found."
 
-    output = "Available Tables:\n\n"
-    output += "Schema | Table Name | Row Count\n"
-    output += "------ | ---------- | ---------\n"
-
-    for table in tables:
-        row_count = str(table.row_count) if table.row_count is not None else "N/A"
-        output += f"{table.schema} | {table.name} | {row_count}\n"
+    lines = [
+        "Available Tables:",
+        "",
+        f"Row counts: {ROW_COUNT_SOURCES[row_count_strategy]}",
+        "",
+        "Schema | Table Name | Row Count",
+        "------ | ---------- | ---------",
+    ]
+    missing = "not counted" if row_count_strategy == RowCountStrategy.EXACT else "N/A"
+    lines.extend(
+        f"{table.schema} | {table.name} | "
+        f"{table.row_count if table.row_count is not None else missing}"
+        for table in tables
+    )
 
-    return output
+    if row_count_strategy == RowCountStrategy.EXACT:
+        uncounted = sum(1 for table in tables if table.row_count is None)
+        if uncounted:
+            lines.append("")
+            lines.append(
+                f"{uncounted} of {len(tables)} tables were not counted: only the first "
+                "EXACT_ROW_COUNT_MAX_TABLES tables are counted, and tables that "
+                "could not be read are skipped."
+            )
+    lines.append("")
+    return "\n".join(lines)
 
 
 def format_table_schema(schema: TableSchemaInfo) -> str:
     """Format table schema as markdown table."""
-    output = f"Schema for table: {schema.table_name}\n"
+    lines = [f"Schema for table: {schema.table_name}"]
     if schema.description:
-        output += f"\nDescription: {schema.description}\n"
-
-    output += "\nColumn Name | Data Type | Max Length | Is Nullable\n"
-    output += "----------- | --------- | ---------- | -----------\n"
+        lines.append(f"\nDescription: {schema.description}")
 
-    for column in schema.columns:
-        output += f"{column.name} | {column.data_type} | {column.max_length} | {column.is_nullable}\n"
-
-    return output
+    lines.append("\nColumn Name | Data Type | Max Length | Is Nullable")
+    lines.append("----------- | --------- | ---------- | -----------")
+    lines.extend(
+        f"{column.name} | {column.data_type} | {column.max_length} | {column.is_nullable}"
+        for column in schema.columns
+    )
+    lines.append("")
+    return "\n".join(lines)
 
 
 def format_database_list(databases: List[DatabaseInfo]) -> str:
@@ -40,15 +163,19 @@ def format_database_list(databases: List[DatabaseInfo]) -> str:
     if not databases:
         return "No databases found."
 
-    output = "Available Databases:\n\n"
-    output += "Name | State | Size (MB)\n"
-    output += "---- | ----- | ---------\n"
-
-    for db in databases:
-        size = f"{db.size_mb:.2f}" if db.size_mb is not None else "N/A"
-        output += f"{db.name} | {db.state} | {size}\n"
-
-    return output
+    lines = [
+        "Available Databases:",
+        "",
+        "Name | State | Size (MB)",
+        "---- | ----- | ---------",
+    ]
+    lines.extend(
+        f"{db.name} | {db.state} | "
+        f"{f'{db.size_mb:.2f}' if db.size_mb is not None else 'N/A'}"
+        for db in databases
+    )
+    lines.append("")
+    return "\n".join(lines)
 
 
 def format_stored_procedure_list(procedures: List[StoredProcedureInfo]) -> str:
@@ -56,43 +183,206 @@ def format_stored_procedure_list(procedures: List[StoredProcedureInfo]) -> str:
     if not procedures:
         return "No stored procedures found."
 
-    output = "Available Stored Procedures:\n\n"
-    output += "Schema | Procedure Name | Parameters | Created\n"
-    output += "------ | -------------- | ---------- | -------\n"
+    lines = [
+        "Available Stored Procedures:",
+        "",
+        "Schema | Procedure Name | Parameters | Created",
+        "------ | -------------- | ---------- | -------",
+    ]
+    lines.extend(
+        f"{proc.schema_name} | {proc.name} | {len(proc.parameters)} | "
+        f"{proc.create_date.strftime('%Y-%m-%d')}"
+        for proc in procedures
+    )
+    lines.append("")
+    return "\n".join(lines)
 
-    for proc in procedures:
-        param_count = len(proc.parameters)
-        created = proc.create_date.strftime("%Y-%m-%d")
-        output += f"{proc.schema_name} | {proc.name} | {param_count} | {created}\n"
 
-    return output
+def format_table_descriptions_json(
+    descriptions: List[TableDescription], missing: List[str], truncated: bool = False
+) -> str:
+    """
+    Format describe_tables output as compact JSON.
 
+    Columns are arrays whose fields are named once in columnFields, and the
+    rows of a multi-column foreign key are merged into one entry.
+    """
+    tables = []
+    for description in descriptions:
+        indexes = []
+        for index in description.indexes:
+            entry: Dict[str, Any] = {
+                "name": index.index_name,
+                "type": index.index_type,
+                "columns": index.columns,
+            }
+            if index.included_columns:
+                entry["include"] = index.included_columns
+            if index.is_primary_key:
+                entry["primaryKey"] = True
+            if index.is_unique:
+                entry["unique"] = True
+            indexes.append(entry)
 
-def format_query_results(results: List[Dict[str, Any]], max_rows: int = 100) -> str:
+        foreign_keys: List[Dict[str, Any]] = []
+        for fk in description.foreign_keys:
+            if not foreign_keys or foreign_keys[-1]["name"] != fk.constraint_name:
+                foreign_keys.append({
+                    "name": fk.constraint_name,
+                    "columns": [],
+                    "references": fk.referenced_table,
+                    "referencedColumns": [],
+                    "onDelete": fk.delete_action,
+                    "onUpdate": fk.update_action,
+                })
+            foreign_keys[-1]["columns"].append(fk.column_name)
+            foreign_keys[-1]["referencedColumns"].append(fk.referenced_column)
+
+        tables.append({
+            "table": f"{description.schema_name}.{description.table_name}",
+            "columns": [
+                [
+                    column.name,
+                    column.data_type,
+                    None if column.max_length == "-1" else int(column.max_length),
+                    column.is_nullable == "YES",
+                ]
+                for column in description.columns
+            ],
+            "indexes": indexes,
+            "foreignKeys": foreign_keys,
+        })
+
+    payload: Dict[str, Any] = {
+        "columnFields": ["name", "dataType", "maxLength", "nullable"],
+        "tableCount": len(tables),
+        "tables": tables,
+    }
+    if missing:
+        payload["notFound"] = missing
+    if truncated:
+        payload["truncated"] = True
+    return json.dumps(payload, cls=EnhancedJSONEncoder, separators=(",", ":"))
+
+
+def format_query_results(result: QueryResult) -> str:
     """Format query results as markdown table."""
-    if not results:
+    if not result.rows:
         return "Query returned no results."
 
-    # Limit results
-    limited_results = results[:max_rows]
-    total_rows = len(results)
+    columns = result.columns
+
+    # Cells of a row are joined first; the outer pipes of every row are then
+    # added by a single join over all rows
+    rows = map(" | ".join, _render_columns(result.rows, _markdown_column))
+    return "".join([
+        "| " + " | ".join(columns) + " |\n",
+        "| " + " | ".join(["---"] * len(columns)) + " |\n",
+        "| " + " |\n| ".join(rows) + " |\n",
+        "\n",
+        _query_result_footer(result),
+    ])
+
 
-    # Get column names from first row
-    columns = list(limited_results[0].keys())
+def _query_result_footer(result: QueryResult) -> str:
+    """Describe truncation, pagination and cache state below a rendered result."""
+    footer = _query_result_state(result)
+    if result.cached:
+        footer += f"\n(Served from the result cache, {result.cache_age_seconds or 0:.0f}s old)"
+    return footer
 
-    # Build table
-    output = "| " + " | ".join(columns) + " |\n"
-    output += "| " + " | ".join(["---" for _ in columns]) + " |\n"
 
-    for row in limited_results:
-        values = [str(row.get(col, "")) for col in columns]
-        # Truncate long values
-        values = [v[:50] + "..." if len(v) > 50 else v for v in values]
-        output += "| " + " | ".join(values) + " |\n"
+def _query_result_state(result: QueryResult) -> str:
+    """Describe truncation or pagination state of a result."""
+    if result.continuation_token:
+        return (
+            f"(Showing {len(result.rows)} rows, more available. "
+            f"Continuation token: {result.continuation_token})"
+        )
+    if result.server_cap_hit:
+        return (
+            f"(Truncated at {len(result.rows)} rows by the server-side row cap "
+            f"(SET ROWCOUNT), more available)"
+        )
+    if result.truncated:
+        return f"(Truncated at {len(result.rows)} rows, more available)"
+    if result.page_number:
+        return f"(Page {result.page_number}: {len(result.rows)} rows, end of results)"
+    return f"Total rows: {len(result.rows)}"
 
-    if total_rows > max_rows:
-        output += f"\n(Showing first {max_rows} of {total_rows} rows)"
+
+def format_query_results_json(result: QueryResult, layout: str = "rows") -> str:
+    """
+    Format query results as compact JSON with the column names given once.
+
+    Args:
+        result: Query result
+        layout: "rows" for one array per row, "columns" for one array per column
+
+    Returns:
+        JSON text
+    """
+    payload: Dict[str, Any] = {"columns": result.columns}
+    if layout == "columns":
+        payload["columnValues"] = (
+            [list(values) for values in zip(*result.rows, strict=True)]
+            if result.rows
+            else [[] for _ in result.columns]
+        )
     else:
-        output += f"\nTotal rows: {total_rows}"
+        payload["rows"] = result.rows
+    payload["rowCount"] = len(result.rows)
+    payload["truncated"] = result.truncated
+    if result.server_row_cap is not None:
+        payload["serverRowCap"] = result.server_row_cap
+        payload["serverCapHit"] = result.server_cap_hit
+    if result.continuation_token:
+        payload["continuationToken"] = result.continuation_token
+    if result.page_number:
+        payload["page"] = result.page_number
+    if result.cached:
+        payload["cached"] = True
+        payload["cacheAgeSeconds"] = round(result.cache_age_seconds or 0, 3)
+
+    return json.dumps(payload, cls=EnhancedJSONEncoder, separators=(",", ":"))
+
+
+def format_query_results_tsv(result: QueryResult) -> str:
+    """Format query results as tab-separated values with a header line."""
+    if not result.columns:
+        return "Query returned no results."
+
+    lines = ["\t".join(result.columns)]
+    lines.extend(map("\t".join, _render_columns(result.rows, _tsv_column)))
+    lines.append("")
+    lines.append(_query_result_footer(result))
+    return "\n".join(lines)
+
+
+def render_query_results(
+    result: QueryResult, output_format: str = "markdown", json_layout: str = "rows"
+) -> str:
+    """
+    Render query results in the requested output format.
+
+    Args:
+        result: Query result
+        output_format: One of QUERY_RESULT_FORMATS
+        json_layout: Layout for json-columnar, one of JSON_LAYOUTS
 
-    return output
+    Raises:
+        ValueError: If the format or layout is unknown
+    """
+    if output_format == "markdown":
+        return format_query_results(result)
+    if output_format == "tsv":
+        return format_query_results_tsv(result)
+    if output_format == "json-columnar":
+        if json_layout not in JSON_LAYOUTS:
+            raise ValueError(
+                f"Unknown JSON layout '{json_layout}' (expected {', '.join(JSON_LAYOUTS)})"
+            )
+        return format_query_results_json(result, json_layout)
+    raise ValueError(
+        f"Unknown output format '{output_format}' (expected {', '.join(QUERY_RESULT_FORMATS)})"
+    )
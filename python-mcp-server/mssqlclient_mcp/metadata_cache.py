@@ -0,0 +1,142 @@
+"""In-process cache for catalog metadata with schema-version invalidation."""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Cheap fingerprint of a database's user objects. Any CREATE, ALTER or DROP
+# (including index changes, which bump the table's modify_date) changes it.
+SCHEMA_VERSION_QUERY = """
+    SELECT
+        COUNT_BIG(*) AS ObjectCount,
+        CONVERT(VARCHAR(33), MAX(modify_date), 126) AS LastModified,
+        CHECKSUM_AGG(CHECKSUM(object_id, modify_date)) AS ObjectChecksum
+    FROM sys.objects
+    WHERE is_ms_shipped = 0
+"""
+
+# (server, database, kind, object)
+CacheKey = Tuple[str, str, str, Hashable]
+
+
+@dataclass
+class _CacheEntry:
+    """A cached value stamped with the schema version it was read under."""
+
+    value: Any
+    schema_version: str
+    size: int
+
+
+class MetadataCache:
+    """
+    LRU cache of catalog metadata keyed by (server, database, kind, object).
+
+    Entries are valid only while the database's schema version matches the
+    version they were loaded under. The schema version itself is remembered
+    for a short validation interval so bursts of lookups skip even the
+    version query.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, validation_interval_seconds: float = 5.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Approximate memory bound for cached values
+            validation_interval_seconds: How long a checked schema version is trusted
+        """
+        self._max_bytes = max_bytes
+        self._validation_interval_seconds = validation_interval_seconds
+        self._entries: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self._versions: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    def known_version(self, server: str, database: str) -> Optional[str]:
+        """Return the schema version if it was checked within the validation interval."""
+        with self._lock:
+            known = self._versions.get((server, database))
+        if known and time.monotonic() - known[1] < self._validation_interval_seconds:
+            return known[0]
+        return None
+
+    def record_version(self, server: str, database: str, schema_version: str) -> None:
+        """Remember the schema version just read from the server."""
+        with self._lock:
+            self._versions[(server, database)] = (schema_version, time.monotonic())
+
+    def forget_version(self, server: str, database: str) -> None:
+        """Make the next lookup re-read the schema version from the server."""
+        with self._lock:
+            self._versions.pop((server, database), None)
+
+    def get(self, key: CacheKey, schema_version: str) -> Optional[Any]:
+        """
+        Look up a value loaded under the given schema version.
+
+        Returns:
+            The cached value, or None on a miss or a stale entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            if entry.schema_version != schema_version:
+                del self._entries[key]
+                self._bytes -= entry.size
+                self._invalidations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def put(self, key: CacheKey, value: Any, schema_version: str) -> None:
+        """Store a value, evicting least recently used entries past the memory bound."""
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self._max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+
+            self._entries[key] = _CacheEntry(value, schema_version, size)
+            self._bytes += size
+
+            while self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and remembered schema versions."""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and memory usage."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxBytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "evictions": self._evictions,
+            }
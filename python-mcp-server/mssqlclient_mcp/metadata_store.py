@@ -0,0 +1,278 @@
+"""On-disk copy of catalog metadata so restarts begin with a warm cache."""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .catalog_snapshot import CatalogObject, CatalogSnapshot
+from .models import (
+    ForeignKey,
+    StoredProcedureParameter,
+    TableColumnInfo,
+    TableIndex,
+    TableInfo,
+    TableSchemaInfo,
+)
+
+# Bumped when the stored models change shape; older files are discarded
+STORE_FORMAT = 2
+
+# Kind under which whole catalog snapshots are stored
+SNAPSHOT_KIND = "catalog_snapshot"
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS metadata (
+        server TEXT NOT NULL,
+        database TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        object TEXT NOT NULL,
+        schema_version TEXT NOT NULL,
+        value BLOB NOT NULL,
+        PRIMARY KEY (server, database, kind, object)
+    )
+"""
+
+# Models the file may hold, by the type tag written with them. Values are
+# rebuilt only from these, so the file can never name arbitrary classes.
+_MODELS = {
+    cls.__name__: cls
+    for cls in (
+        CatalogObject,
+        ForeignKey,
+        StoredProcedureParameter,
+        TableColumnInfo,
+        TableIndex,
+        TableInfo,
+        TableSchemaInfo,
+    )
+}
+
+
+def _encode(value: Any) -> Any:
+    """Convert a metadata value to JSON types, tagging models and datetimes."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime):
+        return {"__type__": "datetime", "value": value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, CatalogSnapshot):
+        return {
+            "__type__": "CatalogSnapshot",
+            "database_name": value.database_name,
+            "schema_version": value.schema_version,
+            "objects": [_encode(obj) for obj in value.objects.values()],
+        }
+    if is_dataclass(value) and _MODELS.get(type(value).__name__) is type(value):
+        encoded = {f.name: _encode(getattr(value, f.name)) for f in fields(value)}
+        encoded["__type__"] = type(value).__name__
+        return encoded
+    raise TypeError(f"{type(value).__name__} cannot be stored in the metadata cache file")
+
+
+def _decode(value: Any) -> Any:
+    """Rebuild a value written by :func:`_encode`."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    kind = value.get("__type__", "")
+    if kind == "datetime":
+        return datetime.fromisoformat(value["value"])
+    if kind == "CatalogSnapshot":
+        objects = [_decode(obj) for obj in value["objects"]]
+        return CatalogSnapshot(
+            value["database_name"],
+            value["schema_version"],
+            {obj.object_id: obj for obj in objects},
+        )
+    model = _MODELS.get(kind)
+    if model is None:
+        raise ValueError(f"Unknown stored type: {kind}")
+    return model(**{name: _decode(item) for name, item in value.items() if name != "__type__"})
+
+
+class PersistentMetadataStore:
+    """
+    SQLite file of metadata values keyed by (server, database, kind, object).
+
+    Each value is stamped with the schema version it was read under and is
+    only returned for that version, so the caller's usual schema version
+    check validates the whole file. The file is opened on first use. Disk
+    errors are logged and treated as misses; the store never fails a tool
+    call. Values are stored as JSON and only known models are rebuilt from
+    it. The file is created readable by its owner only, and a file owned
+    by another user is not used.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite file to use, created if missing
+        """
+        self._path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._disabled = False
+        # Schema version last written per (server, database)
+        self._versions: Dict[Tuple[str, str], str] = {}
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._errors = 0
+
+    def _open_locked(self) -> Optional[sqlite3.Connection]:
+        """Open the file on first use, discarding it when written by another format."""
+        if self._db is not None or self._disabled:
+            return self._db
+
+        try:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            self._check_file()
+            db = sqlite3.connect(self._path, timeout=5, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != STORE_FORMAT:
+                db.execute("DROP TABLE IF EXISTS metadata")
+                db.execute(f"PRAGMA user_version = {STORE_FORMAT}")
+            db.execute(_SCHEMA)
+            db.commit()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Metadata cache file {self._path} disabled: {e}", file=sys.stderr)
+            self._disabled = True
+            return None
+
+        self._db = db
+        return db
+
+    def _check_file(self) -> None:
+        """Create the file private to this user, refusing one owned by someone else."""
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if not hasattr(os, "getuid"):
+                return
+            info = os.fstat(fd)
+            if info.st_uid != os.getuid():
+                raise OSError(f"owned by uid {info.st_uid}, not the current user")
+            if info.st_mode & 0o077:
+                os.fchmod(fd, 0o600)
+        finally:
+            os.close(fd)
+
+    def _failed_locked(self, action: str, error: Exception) -> None:
+        self._errors += 1
+        print(f"Metadata cache file {action} failed: {error}", file=sys.stderr)
+
+    def get(
+        self, server: str, database: str, kind: str, obj: Hashable, schema_version: Optional[str]
+    ) -> Optional[Tuple[Any, str]]:
+        """
+        Read a stored value.
+
+        Args:
+            schema_version: Version the value must have been stored under,
+                or None to accept any version
+
+        Returns:
+            Tuple of (value, schema version it was stored under), or None
+        """
+        with self._lock:
+            db = self._open_locked()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    "SELECT schema_version, value FROM metadata "
+                    "WHERE server = ? AND database = ? AND kind = ? AND object = ?",
+                    (server, database, kind, str(obj)),
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._failed_locked("read", e)
+                return None
+
+            if row is None or (schema_version is not None and row[0] != schema_version):
+                self._misses += 1
+                return None
+
+            try:
+                value = _decode(json.loads(row[1]))
+            except (ValueError, TypeError, KeyError, AttributeError):
+                # Written by an incompatible version of the models
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            return value, row[0]
+
+    def put(
+        self, server: str, database: str, kind: str, obj: Hashable, value: Any, schema_version: str
+    ) -> None:
+        """
+        Store a value.
+
+        When the database's schema version changes, entries read under other
+        versions are dropped. The latest catalog snapshot is kept across
+        versions as the base for an incremental refresh.
+        """
+        try:
+            text = json.dumps(_encode(value), separators=(",", ":"))
+        except TypeError as e:
+            with self._lock:
+                self._failed_locked("write", e)
+            return
+
+        with self._lock:
+            db = self._open_locked()
+            if db is None:
+                return
+            scope = (server, database)
+            try:
+                with db:
+                    if self._versions.get(scope) != schema_version:
+                        db.execute(
+                            "DELETE FROM metadata WHERE server = ? AND database = ? "
+                            "AND schema_version <> ? AND kind <> ?",
+                            (server, database, schema_version, SNAPSHOT_KIND),
+                        )
+                    db.execute(
+                        "INSERT OR REPLACE INTO metadata "
+                        "(server, database, kind, object, schema_version, value) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (server, database, kind, str(obj), schema_version, text),
+                    )
+                self._versions[scope] = schema_version
+                self._writes += 1
+            except sqlite3.Error as e:
+                self._failed_locked("write", e)
+
+    def close(self) -> None:
+        """Close the file."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the file size."""
+        with self._lock:
+            try:
+                size = os.path.getsize(self._path)
+            except OSError:
+                size = 0
+            return {
+                "path": self._path,
+                "bytes": size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "errors": self._errors,
+            }
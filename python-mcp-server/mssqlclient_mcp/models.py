@@ -1,11 +1,15 @@
 """Data models for MSSQL MCP Server."""
 
 from dataclasses import dataclass, field, asdict
-from datetime import datetime
-from typing import Optional, List, Any
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Optional, List, Any, Tuple
 from enum import Enum
+from uuid import UUID
 import json
 
+from .result_store import ResultBuffer
+
 
 @dataclass
 class TableInfo:
@@ -43,6 +47,28 @@ class TableSchemaInfo:
     columns: List[TableColumnInfo]
 
 
+@dataclass
+class QueryResult:
+    """Rows returned by an ad-hoc query, possibly cut off at a row limit."""
+
+    columns: List[str]
+    rows: List[Tuple[Any, ...]]
+    truncated: bool = False
+    row_limit: Optional[int] = None
+    continuation_token: Optional[str] = None
+    page_number: Optional[int] = None
+    # Row cap enforced by the server (SET ROWCOUNT), None when not applied
+    server_row_cap: Optional[int] = None
+    # Served from the query result cache, and how old the cached result was
+    cached: bool = False
+    cache_age_seconds: Optional[float] = None
+
+    @property
+    def server_cap_hit(self) -> bool:
+        """Whether the server-side row cap cut the result short."""
+        return self.server_row_cap is not None and self.truncated
+
+
 @dataclass
 class DatabaseInfo:
     """Information about a database."""
@@ -92,10 +118,12 @@ class StoredProcedureInfo:
 
 class SessionStatus(Enum):
     """Status of a query session."""
+    QUEUED = "queued"
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
+    TIMED_OUT = "timed_out"
 
 
 class SessionType(Enum):
@@ -104,6 +132,20 @@ class SessionType(Enum):
     STORED_PROCEDURE = "stored_procedure"
 
 
+class SessionPriority(Enum):
+    """Scheduling class of a background session."""
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BATCH = "batch"
+
+
+class RowCountStrategy(Enum):
+    """How list_tables obtains table row counts."""
+    CATALOG = "catalog"
+    EXACT = "exact"
+    NONE = "none"
+
+
 @dataclass
 class QuerySession:
     """Represents a background query execution session."""
@@ -117,14 +159,32 @@ class QuerySession:
     parameters: Optional[dict[str, Any]] = None
     end_time: Optional[datetime] = None
     row_count: int = 0
-    results: Optional[str] = None
+    rows_fetched: int = 0
     error: Optional[str] = None
     timeout_seconds: int = 30
+    cancel_latency_ms: Optional[float] = None
+    last_read_time: Optional[datetime] = None
+    queued_time: Optional[datetime] = None
+    priority: SessionPriority = SessionPriority.NORMAL
+    queue_wait_seconds: float = 0.0
+    result_buffer: Optional[ResultBuffer] = field(default=None, repr=False)
+
+    @property
+    def results(self) -> Optional[str]:
+        """Tab-delimited result text, read back from the result buffer."""
+        buffer = self.result_buffer
+        if buffer is None or buffer.closed:
+            return None
+        return buffer.getvalue()
 
     def is_running(self) -> bool:
         """Check if session is still running."""
         return self.status == SessionStatus.RUNNING
 
+    def is_active(self) -> bool:
+        """Check if session is waiting for a slot or still running."""
+        return self.status in (SessionStatus.QUEUED, SessionStatus.RUNNING)
+
     def duration_seconds(self) -> float:
         """Calculate session duration in seconds."""
         end = self.end_time or datetime.utcnow()
@@ -238,6 +298,17 @@ class ForeignKey:
         return f"{self.table_name}.{self.column_name} -> {self.referenced_table}.{self.referenced_column}"
 
 
+@dataclass
+class TableDescription:
+    """Columns, indexes and foreign keys of one table, as returned by describe_tables."""
+
+    schema_name: str
+    table_name: str
+    columns: List[TableColumnInfo]
+    indexes: List[TableIndex]
+    foreign_keys: List[ForeignKey]
+
+
 @dataclass
 class TableStatistics:
     """Table size and row count statistics."""
@@ -271,11 +342,16 @@ class TableStatistics:
 # JSON Encoder for MCP responses
 
 class EnhancedJSONEncoder(json.JSONEncoder):
-    """JSON encoder that handles datetime and Enum types."""
+    """JSON encoder that handles datetime, Enum and SQL Server value types."""
 
     def default(self, obj):
-        if isinstance(obj, datetime):
+        if isinstance(obj, (datetime, date, time)):
             return obj.isoformat()
+        elif isinstance(obj, (Decimal, UUID)):
+            # Decimal as a string so no precision is lost
+            return str(obj)
+        elif isinstance(obj, (bytes, bytearray)):
+            return "0x" + obj.hex().upper()
         elif isinstance(obj, Enum):
             return obj.value
         elif hasattr(obj, '__dataclass_fields__'):
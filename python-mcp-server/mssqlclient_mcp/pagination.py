@@ -0,0 +1,311 @@
+"""Continuation-token pagination over open cursors and session results."""
+
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pyodbc
+
+from .connection_pool import PooledConnection
+from .result_store import ResultBuffer
+
+
+def _estimate_size(value: Any) -> int:
+    """Rough rendered size of a value in bytes."""
+    if value is None:
+        return 4
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return len(str(value))
+
+
+class PageSource(ABC):
+    """A result that can be read page by page."""
+
+    kind = "query"
+    columns: List[str] = []
+
+    @abstractmethod
+    def fetch(self, max_rows: int, max_bytes: Optional[int] = None) -> Tuple[List[Any], bool]:
+        """
+        Read the next page.
+
+        Args:
+            max_rows: Maximum rows in the page
+            max_bytes: Optional approximate byte budget for the page
+
+        Returns:
+            Tuple of (rows, exhausted) where exhausted means no rows remain
+        """
+
+    def bind_timeout(self, seconds: int) -> None:  # noqa: B027 - optional hook
+        """Apply the query timeout of the call reading the next page."""
+
+    def close(self) -> None:  # noqa: B027 - optional hook
+        """Release resources held by the source."""
+
+
+class CursorPageSource(PageSource):
+    """Reads pages from an open cursor that keeps its pooled connection."""
+
+    kind = "query"
+
+    def __init__(
+        self,
+        conn: PooledConnection,
+        cursor: pyodbc.Cursor,
+        columns: List[str],
+        convert_row: Callable[[Any], Any],
+        batch_size: int = 500,
+    ):
+        self.conn = conn
+        self.cursor = cursor
+        self.columns = columns
+        self._convert_row = convert_row
+        self._batch_size = max(1, batch_size)
+        self._pending: List[Any] = []
+        self._exhausted = False
+
+    def fetch(self, max_rows: int, max_bytes: Optional[int] = None) -> Tuple[List[Any], bool]:
+        rows: List[Any] = []
+        size = 0
+
+        while len(rows) < max_rows and (max_bytes is None or size < max_bytes):
+            if not self._pending:
+                batch = self.cursor.fetchmany(min(self._batch_size, max_rows - len(rows)))
+                if not batch:
+                    self._exhausted = True
+                    break
+                # Reversed so rows can be popped off the end in order
+                self._pending = list(reversed(batch))
+
+            row = self._convert_row(self._pending.pop())
+            rows.append(row)
+            if max_bytes is not None:
+                values = row.values() if isinstance(row, dict) else row
+                size += sum(_estimate_size(v) for v in values)
+
+        if not self._exhausted and not self._pending:
+            # Peek one row ahead so callers know whether another page exists
+            next_row = self.cursor.fetchone()
+            if next_row is None:
+                self._exhausted = True
+            else:
+                self._pending = [next_row]
+
+        return rows, self._exhausted
+
+    def bind_timeout(self, seconds: int) -> None:
+        self.conn.timeout = seconds
+
+    def close(self) -> None:
+        try:
+            if not self._exhausted:
+                # Tell the server to stop producing the remainder of the result
+                self.cursor.cancel()
+        except pyodbc.Error:
+            self.conn.invalidate()
+        finally:
+            self.conn.close()
+
+
+class LinePageSource(PageSource):
+    """Reads pages of lines from a finished session's result buffer."""
+
+    kind = "session"
+
+    def __init__(self, session_id: str, buffer: ResultBuffer):
+        self.session_id = session_id
+        self.columns = []
+        self._buffer = buffer
+        self._offset = 0
+
+    def fetch(self, max_rows: int, max_bytes: Optional[int] = None) -> Tuple[List[Any], bool]:
+        lines = self._buffer.read_lines(self._offset, max_rows)
+        rows: List[str] = []
+        size = 0
+        for line in lines:
+            if max_bytes is not None and rows and size >= max_bytes:
+                break
+            rows.append(line)
+            size += len(line) + 1
+        self._offset += len(rows)
+        return rows, self._offset >= self._buffer.line_count
+
+
+@dataclass
+class ResultPage:
+    """A single page of a paginated result."""
+
+    kind: str
+    columns: List[str]
+    rows: List[Any]
+    continuation_token: Optional[str]
+    page_number: int
+    session_id: Optional[str] = None
+
+
+@dataclass
+class _OpenResult:
+    """A registered source and its bookkeeping."""
+
+    source: PageSource
+    last_used: float
+    pages_served: int = 0
+
+
+class ResultPager:
+    """Registry of open, paginated results addressed by opaque continuation tokens."""
+
+    def __init__(
+        self,
+        page_max_rows: int = 100,
+        page_max_bytes: int = 1_000_000,
+        ttl_seconds: int = 300,
+        max_open: int = 10,
+    ):
+        """
+        Initialize the pager.
+
+        Args:
+            page_max_rows: Default maximum rows per page
+            page_max_bytes: Approximate maximum bytes per page
+            ttl_seconds: Idle time after which an open result is closed
+            max_open: Maximum open results; the least recently used is closed first
+        """
+        self.page_max_rows = page_max_rows
+        self.page_max_bytes = page_max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._max_open = max_open
+        self._open: OrderedDict[str, _OpenResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._expired = 0
+
+    def first_page(self, source: PageSource, max_rows: Optional[int] = None) -> ResultPage:
+        """
+        Read the first page of a source, registering it if more pages remain.
+
+        The source is closed right away when it fits in a single page.
+        """
+        try:
+            rows, exhausted = source.fetch(max_rows or self.page_max_rows, self.page_max_bytes)
+        except Exception:
+            source.close()
+            raise
+
+        token = None
+        if exhausted:
+            source.close()
+        else:
+            token = self._register(source)
+
+        return ResultPage(
+            kind=source.kind,
+            columns=source.columns,
+            rows=rows,
+            continuation_token=token,
+            page_number=1,
+            session_id=getattr(source, "session_id", None),
+        )
+
+    def next_page(
+        self, token: str, max_rows: Optional[int] = None, timeout_seconds: Optional[int] = None
+    ) -> ResultPage:
+        """
+        Continue a paginated result.
+
+        Args:
+            token: Continuation token of the result
+            max_rows: Optional page size
+            timeout_seconds: Query timeout for reading the page; otherwise
+                the timeout of the call that opened the result applies
+
+        Raises:
+            ValueError: If the token is unknown or has expired
+        """
+        self.expire_idle()
+
+        # Check the entry out so expiry cannot close it mid-fetch
+        with self._lock:
+            entry = self._open.pop(token, None)
+        if entry is None:
+            raise ValueError(
+                "Continuation token is unknown or has expired; re-run the query"
+            )
+
+        try:
+            if timeout_seconds is not None:
+                entry.source.bind_timeout(timeout_seconds)
+            rows, exhausted = entry.source.fetch(
+                max_rows or self.page_max_rows, self.page_max_bytes
+            )
+        except Exception:
+            entry.source.close()
+            raise
+
+        entry.pages_served += 1
+        next_token: Optional[str] = None
+        if exhausted:
+            entry.source.close()
+        else:
+            entry.last_used = time.monotonic()
+            with self._lock:
+                self._open[token] = entry
+            next_token = token
+
+        return ResultPage(
+            kind=entry.source.kind,
+            columns=entry.source.columns,
+            rows=rows,
+            continuation_token=next_token,
+            page_number=entry.pages_served + 1,
+            session_id=getattr(entry.source, "session_id", None),
+        )
+
+    def _register(self, source: PageSource) -> str:
+        token = uuid.uuid4().hex
+        evicted: List[PageSource] = []
+
+        with self._lock:
+            self._open[token] = _OpenResult(source=source, last_used=time.monotonic())
+            while len(self._open) > self._max_open:
+                _, oldest = self._open.popitem(last=False)
+                evicted.append(oldest.source)
+
+        for old in evicted:
+            old.close()
+        self.expire_idle()
+        return token
+
+    def expire_idle(self) -> int:
+        """
+        Close results idle for longer than the TTL.
+
+        Returns:
+            Number of results closed
+        """
+        cutoff = time.monotonic() - self._ttl_seconds
+        with self._lock:
+            expired = [
+                token for token, entry in self._open.items() if entry.last_used < cutoff
+            ]
+            sources = [self._open.pop(token).source for token in expired]
+            self._expired += len(sources)
+
+        for source in sources:
+            source.close()
+        return len(sources)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for open and expired results."""
+        with self._lock:
+            return {
+                "open": len(self._open),
+                "maxOpen": self._max_open,
+                "expired": self._expired,
+                "ttlSeconds": self._ttl_seconds,
+            }
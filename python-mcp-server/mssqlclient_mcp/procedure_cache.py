@@ -0,0 +1,112 @@
+"""Cache of prepared stored procedure execution plans."""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .models import StoredProcedureParameter
+from .type_mapper import apply_parameter_plan, compile_parameter_plan
+
+
+@dataclass
+class ProcedurePlan:
+    """Everything needed to execute a stored procedure without touching the catalog."""
+
+    schema_name: str
+    procedure_name: str
+    modify_date: datetime
+    parameters: List[StoredProcedureParameter]
+    exec_sql: str
+    converters: List[Callable[[Dict[str, Any]], Any]]
+
+    @classmethod
+    def build(
+        cls,
+        schema_name: str,
+        procedure_name: str,
+        modify_date: datetime,
+        parameters: List[StoredProcedureParameter],
+    ) -> "ProcedurePlan":
+        """Pre-build the EXEC statement and compile parameter converters."""
+        converters = compile_parameter_plan(parameters)
+        quoted = (
+            f"[{schema_name.replace(']', ']]')}]."
+            f"[{procedure_name.replace(']', ']]')}]"
+        )
+        exec_sql = f"EXEC {quoted}"
+        if converters:
+            exec_sql += " " + ", ".join("?" for _ in converters)
+
+        return cls(
+            schema_name=schema_name,
+            procedure_name=procedure_name,
+            modify_date=modify_date,
+            parameters=parameters,
+            exec_sql=exec_sql,
+            converters=converters,
+        )
+
+    def convert(self, parameters: Dict[str, Any]) -> List[Any]:
+        """
+        Convert and validate parameter values in placeholder order.
+
+        Raises:
+            ValueError: If required parameters missing or type conversion fails
+        """
+        return apply_parameter_plan(self.converters, parameters)
+
+
+class ProcedurePlanCache:
+    """LRU cache of procedure plans validated against sys.procedures.modify_date."""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached procedure plans
+        """
+        self._max_entries = max_entries
+        self._plans: OrderedDict[Tuple[str, str, str], ProcedurePlan] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, key: Tuple[str, str, str], modify_date: datetime) -> Optional[ProcedurePlan]:
+        """Return the cached plan if the procedure has not been altered since."""
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self._misses += 1
+                return None
+
+            if plan.modify_date != modify_date:
+                del self._plans[key]
+                self._invalidations += 1
+                self._misses += 1
+                return None
+
+            self._plans.move_to_end(key)
+            self._hits += 1
+            return plan
+
+    def put(self, key: Tuple[str, str, str], plan: ProcedurePlan) -> None:
+        """Store a plan, evicting the least recently used one when full."""
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self._max_entries:
+                self._plans.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._plans),
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+            }
@@ -0,0 +1,165 @@
+"""Opt-in cache of ad-hoc query results."""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from .models import QueryResult
+
+# Fingerprint of the tables a query reads. modify_date moves on DDL only,
+# so data changes are seen through the row counts in sys.partitions
+# (inserts and deletes), the last user update recorded in
+# sys.dm_db_index_usage_stats (any DML, needs VIEW SERVER STATE) and the
+# change tracking version (tracked tables only). TableCount and
+# TrackedCount tell the caller whether those signals cover every name:
+# views, functions, synonyms and other databases' objects are not counted.
+TABLE_VERSION_QUERY = """
+    SELECT
+        COUNT_BIG(*) AS NameCount,
+        COUNT_BIG(CASE WHEN o.type = 'U' AND PARSENAME(r.name, 3) IS NULL THEN 1 END) AS TableCount,
+        COUNT_BIG(ct.object_id) AS TrackedCount,
+        CONVERT(VARCHAR(33), MAX(o.modify_date), 126) AS LastModified,
+        SUM(rc.row_count) AS TotalRows,
+        {last_update} AS LastUpdate,
+        CHANGE_TRACKING_CURRENT_VERSION() AS ChangeVersion
+    FROM (VALUES {placeholders}) AS r(name)
+    LEFT JOIN sys.objects o ON o.object_id = OBJECT_ID(r.name)
+    LEFT JOIN sys.change_tracking_tables ct ON ct.object_id = o.object_id
+    OUTER APPLY (
+        SELECT SUM(p.rows) AS row_count
+        FROM sys.partitions p
+        WHERE p.object_id = o.object_id AND p.index_id IN (0, 1)
+    ) rc
+    {usage_join}
+"""
+
+# Pieces of TABLE_VERSION_QUERY that read the index usage DMV
+LAST_UPDATE_COLUMN = "CONVERT(VARCHAR(33), MAX(us.last_update), 126)"
+LAST_UPDATE_JOIN = """OUTER APPLY (
+        SELECT MAX(s.last_user_update) AS last_update
+        FROM sys.dm_db_index_usage_stats s
+        WHERE s.database_id = DB_ID() AND s.object_id = o.object_id
+    ) us"""
+
+# (server, database, normalized query, row limit, server row cap)
+ResultCacheKey = Tuple[str, str, str, int, bool]
+
+
+@dataclass
+class _CachedResult:
+    """A cached result with the table fingerprint it was read under."""
+
+    result: QueryResult
+    fingerprint: Optional[str]
+    stored_at: float
+    size: int
+
+
+class QueryResultCache:
+    """
+    LRU cache of query results bounded by TTL and an approximate byte budget.
+
+    The caller decides whether an entry is still current by comparing the
+    stored table fingerprint against a fresh one; entries without a
+    fingerprint (validation turned off) are trusted until they expire.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, ttl_seconds: float = 60.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Approximate memory bound for cached results
+            ttl_seconds: Age after which a result is no longer served
+        """
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[ResultCacheKey, _CachedResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    def get(self, key: ResultCacheKey) -> Optional[Tuple[QueryResult, Optional[str], float]]:
+        """
+        Look up a result younger than the TTL.
+
+        Returns:
+            Tuple of (result, fingerprint, age in seconds), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            age = time.monotonic() - entry.stored_at
+            if age > self._ttl_seconds:
+                self._remove_locked(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            return entry.result, entry.fingerprint, age
+
+    def record_hit(self) -> None:
+        """Count a lookup that was served from the cache."""
+        with self._lock:
+            self._hits += 1
+
+    def invalidate(self, key: ResultCacheKey) -> None:
+        """Drop an entry whose tables have changed since it was stored."""
+        with self._lock:
+            if self._remove_locked(key):
+                self._invalidations += 1
+                self._misses += 1
+
+    def put(self, key: ResultCacheKey, result: QueryResult, fingerprint: Optional[str]) -> None:
+        """Store a result, evicting least recently used entries past the byte budget."""
+        size = len(pickle.dumps(result.rows, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self._max_bytes:
+            return
+
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = _CachedResult(result, fingerprint, time.monotonic(), size)
+            self._bytes += size
+
+            while self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._evictions += 1
+
+    def _remove_locked(self, key: ResultCacheKey) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and memory usage."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxBytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "evictions": self._evictions,
+            }
@@ -0,0 +1,193 @@
+"""Line-oriented result storage that spills to a temporary file."""
+
+import mmap
+import os
+import tempfile
+import threading
+from array import array
+from typing import BinaryIO, List, Optional
+
+
+class ByteCounter:
+    """Thread-safe running total of the bytes held by a group of buffers."""
+
+    def __init__(self) -> None:
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        """Bytes currently held."""
+        return self._total
+
+    def add(self, delta: int) -> None:
+        """Adjust the total by delta bytes (negative when bytes are freed)."""
+        with self._lock:
+            self._total += delta
+
+
+class ResultBuffer:
+    """
+    Append-only store of tab-delimited result lines.
+
+    Lines are kept in memory until the buffer grows past the spill
+    threshold, after which everything is moved to a temporary file and
+    further lines are appended to it. An offset per line allows any slice
+    of lines to be read back without scanning; spilled slices are read
+    through an mmap that is kept between reads and only re-created when a
+    read reaches past it.
+    """
+
+    def __init__(
+        self,
+        spill_threshold_bytes: int = 8 * 1024 * 1024,
+        spill_directory: Optional[str] = None,
+        usage: Optional[ByteCounter] = None,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            spill_threshold_bytes: In-memory size after which lines go to disk
+            spill_directory: Directory for spill files (system temp dir if None)
+            usage: Optional counter kept up to date with the buffer's size
+        """
+        self._spill_threshold_bytes = spill_threshold_bytes
+        self._spill_directory = spill_directory
+        self._usage = usage
+        self._memory: Optional[bytearray] = bytearray()
+        self._file: Optional[BinaryIO] = None
+        self._path: Optional[str] = None
+        self._view: Optional[mmap.mmap] = None
+        # Start offset of every line; a line ends one byte before the next
+        self._offsets = array("q")
+        self._size = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines written."""
+        return len(self._offsets)
+
+    @property
+    def size_bytes(self) -> int:
+        """Encoded size of all lines, including separators."""
+        return self._size
+
+    @property
+    def closed(self) -> bool:
+        """Whether the buffer has been released."""
+        return self._closed
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the lines live in a spill file."""
+        return self._path is not None
+
+    def append_line(self, line: str) -> None:
+        """Append a single line (without its newline)."""
+        data = line.encode("utf-8") + b"\n"
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Session results are no longer available")
+
+            self._offsets.append(self._size)
+            self._size += len(data)
+            if self._usage is not None:
+                self._usage.add(len(data))
+            if self._memory is None:
+                self._spill_file().write(data)
+                return
+
+            self._memory.extend(data)
+            if len(self._memory) > self._spill_threshold_bytes:
+                self._spill_locked(self._memory)
+
+    def _spill_locked(self, memory: bytearray) -> None:
+        """Move the in-memory lines to a new spill file."""
+        fd, self._path = tempfile.mkstemp(
+            prefix="mssql-session-", suffix=".tsv", dir=self._spill_directory
+        )
+        self._file = os.fdopen(fd, "w+b")
+        self._file.write(memory)
+        self._memory = None
+
+    def _spill_file(self) -> BinaryIO:
+        """The spill file of an open buffer whose lines have moved to disk."""
+        if self._file is None:
+            raise RuntimeError("Session results are no longer available")
+        return self._file
+
+    def read_lines(self, start: int, count: int) -> List[str]:
+        """
+        Read up to count lines starting at line index start.
+
+        Returns:
+            The lines, without newlines
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Session results are no longer available")
+
+            end = min(start + count, len(self._offsets))
+            if start >= end:
+                return []
+
+            bounds = list(self._offsets[start:end])
+            bounds.append(self._offsets[end] if end < len(self._offsets) else self._size)
+            first, last = bounds[0], bounds[-1]
+
+            if self._memory is not None:
+                data = bytes(self._memory[first:last])
+            else:
+                data = self._mapped_locked()[first:last]
+
+        # Slice by offset rather than splitting, values may contain newlines
+        return [
+            data[begin - first : stop - first - 1].decode("utf-8")
+            for begin, stop in zip(bounds[:-1], bounds[1:], strict=True)
+        ]
+
+    def _mapped_locked(self) -> mmap.mmap:
+        """Map of the spill file covering every line written so far."""
+        if self._view is None or len(self._view) < self._size:
+            # Lines were appended since the last map (the session is still running)
+            spill = self._spill_file()
+            spill.flush()
+            if self._view is not None:
+                self._view.close()
+            self._view = mmap.mmap(spill.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._view
+
+    def getvalue(self) -> str:
+        """Return all lines joined with newlines."""
+        return "\n".join(self.read_lines(0, self.line_count))
+
+    def close(self) -> None:
+        """Release memory and delete the spill file, if any."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._usage is not None:
+                self._usage.add(-self._size)
+            self._memory = None
+            if self._view is not None:
+                self._view.close()
+                self._view = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._path is not None:
+                try:
+                    os.remove(self._path)
+                except OSError:
+                    pass
+
+    def __del__(self) -> None:
+        # Never leave spill files behind, even for sessions that were dropped
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,215 @@
+"""Priority and fairness scheduling for background sessions."""
+
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .models import SessionPriority
+
+# Highest priority first
+PRIORITY_ORDER: List[SessionPriority] = [
+    SessionPriority.INTERACTIVE,
+    SessionPriority.NORMAL,
+    SessionPriority.BATCH,
+]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class CostHistory:
+    """
+    Smoothed run time of recently executed statements.
+
+    Used as the cost estimate when a session does not state its priority:
+    statements that have run quickly before are treated as interactive,
+    slow ones as batch work.
+    """
+
+    # Weight of the newest observation in the moving average
+    SMOOTHING = 0.3
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the history.
+
+        Args:
+            max_entries: Maximum number of statements remembered
+        """
+        self._max_entries = max_entries
+        self._seconds: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, text: str) -> str:
+        """Normalize a statement or procedure name into a history key."""
+        return f"{kind}:{_WHITESPACE.sub(' ', text.strip()).lower()}"
+
+    def estimate(self, key: str) -> Optional[float]:
+        """Return the smoothed run time in seconds, or None if never seen."""
+        with self._lock:
+            return self._seconds.get(key)
+
+    def classify(
+        self, key: str, interactive_max_seconds: float, batch_min_seconds: float
+    ) -> SessionPriority:
+        """
+        Infer a priority class from the statement's past run time.
+
+        Statements never seen before are treated as normal priority.
+        """
+        estimate = self.estimate(key)
+        if estimate is None:
+            return SessionPriority.NORMAL
+        if estimate <= interactive_max_seconds:
+            return SessionPriority.INTERACTIVE
+        if estimate >= batch_min_seconds:
+            return SessionPriority.BATCH
+        return SessionPriority.NORMAL
+
+    def record(self, key: str, seconds: float) -> None:
+        """Fold a completed run into the moving average."""
+        with self._lock:
+            previous = self._seconds.pop(key, None)
+            if previous is not None:
+                seconds = previous + self.SMOOTHING * (seconds - previous)
+            self._seconds[key] = seconds
+            while len(self._seconds) > self._max_entries:
+                self._seconds.popitem(last=False)
+
+
+@dataclass
+class _QueuedSession:
+    """A session waiting in the scheduler."""
+
+    session_id: str
+    priority: SessionPriority
+    database_key: str
+    enqueued_at: float
+
+
+class SessionScheduler:
+    """
+    Orders queued sessions by priority class, fair across databases.
+
+    Each database has one FIFO queue per priority class. When a slot frees
+    up the highest effective priority wins; sessions gain one class for
+    every aging interval they wait so batch work is never starved. Ties go
+    to the database that was served least recently (round-robin), and a
+    database already running its per-database cap is skipped.
+
+    Not thread-safe; callers serialize access (SessionManager holds its lock).
+    """
+
+    def __init__(self, max_per_database: int = 0, aging_seconds: float = 30.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_per_database: Running sessions allowed per database (0 for no cap)
+            aging_seconds: Wait after which a queued session moves up one class
+        """
+        self._max_per_database = max_per_database
+        self._aging_seconds = aging_seconds
+        self._queues: Dict[str, Dict[SessionPriority, Deque[_QueuedSession]]] = {}
+        self._entries: Dict[str, _QueuedSession] = {}
+        self._running: Dict[str, int] = {}
+        # Databases in round-robin order; the most recently served goes last
+        self._rotation: OrderedDict[str, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def database_key(database_name: Optional[str]) -> str:
+        """Normalize a database name for per-database accounting."""
+        return (database_name or "").lower()
+
+    def enqueue(
+        self, session_id: str, priority: SessionPriority, database_name: Optional[str]
+    ) -> None:
+        """Add a session to its database's queue for its priority class."""
+        key = self.database_key(database_name)
+        entry = _QueuedSession(session_id, priority, key, time.monotonic())
+        queues = self._queues.setdefault(
+            key, {priority_class: deque() for priority_class in PRIORITY_ORDER}
+        )
+        queues[priority].append(entry)
+        self._entries[session_id] = entry
+        self._rotation.setdefault(key, None)
+
+    def remove(self, session_id: str) -> bool:
+        """Drop a queued session, returning False if it was not queued."""
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return False
+        self._queues[entry.database_key][entry.priority].remove(entry)
+        return True
+
+    def queued_ids(self) -> List[str]:
+        """Ids of all waiting sessions."""
+        return list(self._entries)
+
+    def pop_next(self) -> Optional[str]:
+        """
+        Take the next session to run and count it as running.
+
+        Returns:
+            Session id, or None if nothing queued may run right now
+        """
+        now = time.monotonic()
+        best: Optional[Tuple[int, int, float]] = None
+        chosen: Optional[_QueuedSession] = None
+
+        for order, key in enumerate(self._rotation):
+            if self._max_per_database and self._running.get(key, 0) >= self._max_per_database:
+                continue
+            for rank, priority_class in enumerate(PRIORITY_ORDER):
+                queue = self._queues[key][priority_class]
+                if not queue:
+                    continue
+                head = queue[0]
+                waited = now - head.enqueued_at
+                effective = rank
+                if self._aging_seconds > 0:
+                    effective = max(0, rank - int(waited // self._aging_seconds))
+                candidate = (effective, order, head.enqueued_at)
+                if best is None or candidate < best:
+                    best, chosen = candidate, head
+
+        if chosen is None:
+            return None
+
+        self._queues[chosen.database_key][chosen.priority].popleft()
+        del self._entries[chosen.session_id]
+        self._running[chosen.database_key] = self._running.get(chosen.database_key, 0) + 1
+        self._rotation.move_to_end(chosen.database_key)
+        return chosen.session_id
+
+    def finished(self, database_name: Optional[str]) -> None:
+        """Release a running session's per-database slot."""
+        key = self.database_key(database_name)
+        remaining = self._running.get(key, 0) - 1
+        if remaining > 0:
+            self._running[key] = remaining
+        else:
+            self._running.pop(key, None)
+            if not any(self._queues.get(key, {}).values()):
+                # Forget idle databases so the rotation stays small
+                self._queues.pop(key, None)
+                self._rotation.pop(key, None)
+
+    def stats(self) -> Dict[str, object]:
+        """Return queued counts per priority and running counts per database."""
+        queued = {priority_class.value: 0 for priority_class in PRIORITY_ORDER}
+        for entry in self._entries.values():
+            queued[entry.priority.value] += 1
+        return {
+            "maxPerDatabase": self._max_per_database,
+            "queuedByPriority": queued,
+            "runningByDatabase": {
+                key or "(default)": count for key, count in self._running.items()
+            },
+        }
@@ -2,26 +2,42 @@
 
 import asyncio
 import sys
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
 from .config import DatabaseConfiguration
 from .database_service import DatabaseService, SessionManager, CapabilityDetector
+from .catalog_snapshot import MAX_DESCRIBED_TABLES
 from .formatters import (
     format_table_list,
     format_table_schema,
     format_database_list,
     format_stored_procedure_list,
-    format_query_results,
+    format_table_descriptions_json,
+    render_query_results,
+)
+from .models import EnhancedJSONEncoder, QueryResult, RowCountStrategy, SessionPriority
+from .pagination import LinePageSource, ResultPage
+from .cost_guard import QueryCostExceededError
+from .timeouts import (
+    TOOL_CALL_LIMIT,
+    QueryTimeoutError,
+    reset_tool_call_deadline,
+    start_tool_call_deadline,
 )
-from .models import EnhancedJSONEncoder
 import json
 
 
-def create_server(config: DatabaseConfiguration) -> Server:
-    """Create and configure the MCP server."""
+def create_server(config: DatabaseConfiguration) -> Tuple[Server, DatabaseService]:
+    """
+    Create and configure the MCP server.
+
+    Returns:
+        Tuple of (server, database service); the caller closes the service
+        once the server stops
+    """
     server = Server("mssqlclient-mcp-server")
     db_service = DatabaseService(config)
     session_manager = SessionManager(
@@ -71,6 +87,11 @@ def create_server(config: DatabaseConfiguration) -> Server:
                                 "description": "Query timeout in seconds (default 30)",
                                 "default": 30,
                             },
+                            "priority": {
+                                "type": "string",
+                                "enum": ["interactive", "normal", "batch"],
+                                "description": "Scheduling class when sessions are queued (inferred from past run time if omitted)",
+                            },
                         },
                         "required": ["query"],
                     },
@@ -97,7 +118,7 @@ def create_server(config: DatabaseConfiguration) -> Server:
             tools.append(
                 Tool(
                     name="get_session_result",
-                    description="Get the result of a completed background query session",
+                    description="Get the result of a background query session, or the rows fetched so far while it is still running",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -105,6 +126,19 @@ def create_server(config: DatabaseConfiguration) -> Server:
                                 "type": "string",
                                 "description": "The session ID returned from start_query",
                             },
+                            "pageSize": {
+                                "type": "integer",
+                                "description": "Return the result in pages of this many lines with a continuation token",
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "First result line to return (line 0 is the column header)",
+                                "default": 0,
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum result lines to return (default from server configuration)",
+                            },
                         },
                         "required": ["sessionId"],
                     },
@@ -128,6 +162,45 @@ def create_server(config: DatabaseConfiguration) -> Server:
                 )
             )
 
+        # Pagination (continues execute_query and get_session_result pages)
+        if config.enable_execute_query or config.enable_start_query:
+            tools.append(
+                Tool(
+                    name="fetch_next_page",
+                    description="Fetch the next page of a paginated result using its continuation token",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "continuationToken": {
+                                "type": "string",
+                                "description": "The continuation token returned with the previous page",
+                            },
+                            "maxRows": {
+                                "type": "integer",
+                                "description": "Optional page size",
+                            },
+                            "timeoutSeconds": {
+                                "type": "integer",
+                                "description": "Optional timeout in seconds for reading the page",
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["markdown", "json-columnar", "tsv"],
+                                "description": "Output format (default markdown)",
+                                "default": "markdown",
+                            },
+                            "jsonLayout": {
+                                "type": "string",
+                                "enum": ["rows", "columns"],
+                                "description": "For json-columnar: one array per row or one array per column",
+                                "default": "rows",
+                            },
+                        },
+                        "required": ["continuationToken"],
+                    },
+                )
+            )
+
         # Stored procedure tools (available in both modes when enabled)
         tools.append(
             Tool(
@@ -174,6 +247,11 @@ def create_server(config: DatabaseConfiguration) -> Server:
                                 "type": "integer",
                                 "description": "Optional timeout in seconds",
                             },
+                            "refreshMetadata": {
+                                "type": "boolean",
+                                "description": "Reload cached parameter metadata before executing",
+                                "default": False,
+                            },
                         },
                         "required": ["procedureName"],
                     },
@@ -205,6 +283,11 @@ def create_server(config: DatabaseConfiguration) -> Server:
                                 "description": "Optional timeout in seconds (default 30)",
                                 "default": 30,
                             },
+                            "priority": {
+                                "type": "string",
+                                "enum": ["interactive", "normal", "batch"],
+                                "description": "Scheduling class when sessions are queued (inferred from past run time if omitted)",
+                            },
                         },
                         "required": ["procedureName"],
                     },
@@ -228,6 +311,18 @@ def create_server(config: DatabaseConfiguration) -> Server:
             )
         )
 
+        # Runtime statistics (always available)
+        tools.append(
+            Tool(
+                name="get_runtime_statistics",
+                description="Get connection pool, database executor, cache and request coalescing statistics",
+                inputSchema={
+                    "type": "object",
+                    "properties": {},
+                },
+            )
+        )
+
         # Advanced table metadata tools (available in both modes)
         tools.append(
             Tool(
@@ -271,6 +366,34 @@ def create_server(config: DatabaseConfiguration) -> Server:
             )
         )
 
+        tools.append(
+            Tool(
+                name="describe_tables",
+                description=(
+                    "Get columns, indexes and foreign keys for many tables in one call, "
+                    "by name list or LIKE pattern, as compact JSON"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "tableNames": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": f"Names of the tables (with optional schema), at most {MAX_DESCRIBED_TABLES}",
+                        },
+                        "pattern": {
+                            "type": "string",
+                            "description": "LIKE pattern matched against schema.table and table name (e.g. 'Sales.%'), used when tableNames is not given",
+                        },
+                        "databaseName": {
+                            "type": "string",
+                            "description": "Optional database name (server mode only)",
+                        },
+                    },
+                },
+            )
+        )
+
         tools.append(
             Tool(
                 name="get_table_statistics",
@@ -315,7 +438,12 @@ def create_server(config: DatabaseConfiguration) -> Server:
                             "databaseName": {
                                 "type": "string",
                                 "description": "The name of the database",
-                            }
+                            },
+                            "rowCountStrategy": {
+                                "type": "string",
+                                "enum": ["catalog", "exact", "none"],
+                                "description": "How to obtain row counts (default from server configuration)",
+                            },
                         },
                         "required": ["databaseName"],
                     },
@@ -363,6 +491,36 @@ def create_server(config: DatabaseConfiguration) -> Server:
                                     "type": "integer",
                                     "description": "Optional timeout in seconds",
                                 },
+                                "maxRows": {
+                                    "type": "integer",
+                                    "description": "Maximum rows to return (default from server configuration)",
+                                },
+                                "paginate": {
+                                    "type": "boolean",
+                                    "description": "Return a continuation token for fetch_next_page when more rows are available",
+                                    "default": False,
+                                },
+                                "serverRowCap": {
+                                    "type": "boolean",
+                                    "description": "Have the server stop producing rows past maxRows (single SELECT only, not with paginate; default from server configuration)",
+                                },
+                                "useResultCache": {
+                                    "type": "boolean",
+                                    "description": "Allow serving a cached result when the server's result cache is enabled",
+                                    "default": True,
+                                },
+                                "format": {
+                                    "type": "string",
+                                    "enum": ["markdown", "json-columnar", "tsv"],
+                                    "description": "Output format (default markdown)",
+                                    "default": "markdown",
+                                },
+                                "jsonLayout": {
+                                    "type": "string",
+                                    "enum": ["rows", "columns"],
+                                    "description": "For json-columnar: one array per row or one array per column",
+                                    "default": "rows",
+                                },
                             },
                             "required": ["databaseName", "query"],
                         },
@@ -415,7 +573,13 @@ def create_server(config: DatabaseConfiguration) -> Server:
                     description="List all tables in the connected database",
                     inputSchema={
                         "type": "object",
-                        "properties": {},
+                        "properties": {
+                            "rowCountStrategy": {
+                                "type": "string",
+                                "enum": ["catalog", "exact", "none"],
+                                "description": "How to obtain row counts (default from server configuration)",
+                            },
+                        },
                     },
                 )
             )
@@ -453,6 +617,36 @@ def create_server(config: DatabaseConfiguration) -> Server:
                                     "type": "integer",
                                     "description": "Optional timeout in seconds",
                                 },
+                                "maxRows": {
+                                    "type": "integer",
+                                    "description": "Maximum rows to return (default from server configuration)",
+                                },
+                                "paginate": {
+                                    "type": "boolean",
+                                    "description": "Return a continuation token for fetch_next_page when more rows are available",
+                                    "default": False,
+                                },
+                                "serverRowCap": {
+                                    "type": "boolean",
+                                    "description": "Have the server stop producing rows past maxRows (single SELECT only, not with paginate; default from server configuration)",
+                                },
+                                "useResultCache": {
+                                    "type": "boolean",
+                                    "description": "Allow serving a cached result when the server's result cache is enabled",
+                                    "default": True,
+                                },
+                                "format": {
+                                    "type": "string",
+                                    "enum": ["markdown", "json-columnar", "tsv"],
+                                    "description": "Output format (default markdown)",
+                                    "default": "markdown",
+                                },
+                                "jsonLayout": {
+                                    "type": "string",
+                                    "enum": ["rows", "columns"],
+                                    "description": "For json-columnar: one array per row or one array per column",
+                                    "default": "rows",
+                                },
                             },
                             "required": ["query"],
                         },
@@ -489,8 +683,174 @@ def create_server(config: DatabaseConfiguration) -> Server:
 
         return tools
 
+    def _row_count_strategy(arguments: Any) -> RowCountStrategy:
+        """Resolve the requested row count strategy, falling back to configuration."""
+        value = arguments.get("rowCountStrategy")
+        if value:
+            return RowCountStrategy(value.lower())
+        return db_service.default_row_count_strategy()
+
+    def _session_page_result(page: ResultPage) -> dict:
+        """Render a page of session result lines as a JSON-ready dict."""
+        return {
+            "sessionId": page.session_id,
+            "page": page.page_number,
+            "lineCount": len(page.rows),
+            "results": "\n".join(page.rows),
+            "continuationToken": page.continuation_token,
+        }
+
+    def _session_lines_result(session: Any, arguments: Any, default_limit: Optional[int]) -> dict:
+        """Render a slice of a session's result lines selected by offset/limit."""
+        offset = max(0, arguments.get("offset") or 0)
+        limit = arguments.get("limit") or default_limit
+        buffer = session.result_buffer
+        available = buffer.line_count
+        if limit is None:
+            limit = available - offset
+        lines = buffer.read_lines(offset, limit)
+        next_offset = offset + len(lines)
+        return {
+            "sessionId": session.session_id,
+            "status": session.status.value,
+            "rowCount": session.row_count,
+            "rowsFetched": session.rows_fetched,
+            "offset": offset,
+            "lineCount": len(lines),
+            "results": "\n".join(lines),
+            "nextOffset": next_offset if next_offset < available or session.is_active() else None,
+            "durationSeconds": session.duration_seconds(),
+        }
+
+    def _session_result(session: Any, arguments: Any) -> dict:
+        """Build the get_session_result response; blocking, reads the result buffer."""
+        buffer = session.result_buffer
+        if session.is_active():
+            if buffer is None or buffer.closed:
+                return {
+                    "sessionId": session.session_id,
+                    "status": session.status.value,
+                    "rowsFetched": session.rows_fetched,
+                    "message": f"Session is still {session.status.value}. No rows fetched yet.",
+                }
+            # Rows fetched so far; more follow from nextOffset
+            result = _session_lines_result(session, arguments, config.query_max_rows)
+            result["partial"] = True
+            return result
+
+        if session.status.value in ("failed", "timed_out"):
+            return {
+                "sessionId": session.session_id,
+                "status": session.status.value,
+                "error": session.error,
+            }
+
+        if arguments.get("pageSize") and buffer is not None:
+            source = LinePageSource(session.session_id, buffer)
+            page = db_service.pager.first_page(source, arguments["pageSize"])
+            result = _session_page_result(page)
+            result["status"] = session.status.value
+            result["rowCount"] = session.row_count
+            result["durationSeconds"] = session.duration_seconds()
+            return result
+
+        if buffer is not None:
+            # Never read a whole spilled result in one call; more follow from nextOffset
+            return _session_lines_result(session, arguments, config.query_max_rows)
+
+        return {
+            "sessionId": session.session_id,
+            "status": session.status.value,
+            "rowCount": session.row_count,
+            "results": session.results or "",
+            "durationSeconds": session.duration_seconds(),
+        }
+
+    def _render_query_result(result: QueryResult, arguments: Any) -> str:
+        """Render a query result in the format requested by the tool call."""
+        return render_query_results(
+            result,
+            arguments.get("format") or "markdown",
+            arguments.get("jsonLayout") or "rows",
+        )
+
+    async def _execute_query_tool(arguments: Any, database_name: Optional[str]) -> list[TextContent]:
+        """Run execute_query(_in_database), applying the estimated-plan cost guard first."""
+        try:
+            if config.query_cost_guard:
+                await db_service.check_query_cost(
+                    arguments["query"], database_name, arguments.get("timeoutSeconds")
+                )
+        except QueryCostExceededError as e:
+            if config.query_cost_action != "background" or not config.enable_start_query:
+                raise
+            session_id = session_manager.start_query(
+                query=arguments["query"],
+                database_name=database_name,
+                timeout_seconds=arguments.get("timeoutSeconds", 30),
+                priority=SessionPriority.BATCH,
+            )
+            operators = "; ".join(op.describe() for op in e.estimate.top_operators)
+            result = {
+                "sessionId": session_id,
+                "status": _start_status(session_id),
+                "message": (
+                    f"Diverted to a background session: {', '.join(e.reasons)}. "
+                    "Poll get_session_status and fetch rows with get_session_result."
+                ),
+                "topCostOperators": operators,
+            }
+            return [TextContent(type="text", text=json.dumps(result, cls=EnhancedJSONEncoder))]
+
+        results = await db_service.execute_query(
+            query=arguments["query"],
+            database_name=database_name,
+            timeout_seconds=arguments.get("timeoutSeconds"),
+            max_rows=arguments.get("maxRows"),
+            paginate=arguments.get("paginate", False),
+            server_row_cap=arguments.get("serverRowCap"),
+            use_result_cache=arguments.get("useResultCache", True),
+        )
+        return [TextContent(type="text", text=_render_query_result(results, arguments))]
+
+    def _start_status(session_id: str) -> str:
+        """Report whether a new session started right away or is waiting for a slot."""
+        session = session_manager.get_session(session_id)
+        if session is not None and session.status.value == "queued":
+            return "queued"
+        return "started"
+
+    def _session_priority(arguments: Any) -> Optional[SessionPriority]:
+        """Parse the optional priority argument of the start_* tools."""
+        priority = arguments.get("priority")
+        if priority is None:
+            return None
+        try:
+            return SessionPriority(priority)
+        except ValueError as e:
+            raise ValueError(
+                f"Invalid priority '{priority}' (expected interactive, normal or batch)"
+            ) from e
+
     @server.call_tool()
     async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+        """Handle tool calls within the TOTAL_TOOL_CALL_TIMEOUT_SECONDS budget."""
+        budget = config.total_tool_call_timeout_seconds
+        if not budget or budget <= 0:
+            return await _dispatch_tool(name, arguments)
+
+        # Statements issued by this call have their timeouts cut to the budget
+        token = start_tool_call_deadline(budget)
+        try:
+            return await asyncio.wait_for(_dispatch_tool(name, arguments), timeout=budget)
+        except asyncio.TimeoutError:
+            error_msg = f"Error executing {name}: {QueryTimeoutError(TOOL_CALL_LIMIT, budget)}"
+            print(error_msg, file=sys.stderr)
+            return [TextContent(type="text", text=error_msg)]
+        finally:
+            reset_tool_call_deadline(token)
+
+    async def _dispatch_tool(name: str, arguments: Any) -> list[TextContent]:
         """Handle tool calls."""
         try:
             if name == "server_capabilities":
@@ -506,12 +866,25 @@ def create_server(config: DatabaseConfiguration) -> Server:
 
             # Session management tools
             elif name == "start_query" and config.enable_start_query:
+                database_name = arguments.get("databaseName") if is_server_mode else None
+                priority = _session_priority(arguments)
+                try:
+                    if config.query_cost_guard:
+                        await db_service.check_query_cost(
+                            arguments["query"], database_name, arguments.get("timeoutSeconds")
+                        )
+                except QueryCostExceededError:
+                    if config.query_cost_action != "background":
+                        raise
+                    # Already a background session; just keep it out of the way
+                    priority = priority or SessionPriority.BATCH
                 session_id = session_manager.start_query(
                     query=arguments["query"],
-                    database_name=arguments.get("databaseName") if is_server_mode else None,
+                    database_name=database_name,
                     timeout_seconds=arguments.get("timeoutSeconds", 30),
+                    priority=priority,
                 )
-                result = {"sessionId": session_id, "status": "started"}
+                result: dict[str, Any] = {"sessionId": session_id, "status": _start_status(session_id)}
                 return [TextContent(type="text", text=json.dumps(result, cls=EnhancedJSONEncoder))]
 
             elif name == "get_session_status" and config.enable_start_query:
@@ -525,38 +898,43 @@ def create_server(config: DatabaseConfiguration) -> Server:
                     "startTime": session.start_time.isoformat(),
                     "endTime": session.end_time.isoformat() if session.end_time else None,
                     "rowCount": session.row_count,
+                    "rowsFetched": session.rows_fetched,
                     "durationSeconds": session.duration_seconds(),
                     "error": session.error,
+                    "cancelLatencyMs": session.cancel_latency_ms,
+                    "priority": session.priority.value,
+                    "queueWaitSeconds": session.queue_wait_seconds,
                 }
                 return [TextContent(type="text", text=json.dumps(result, cls=EnhancedJSONEncoder))]
 
             elif name == "get_session_result" and config.enable_start_query:
-                session = session_manager.get_session(arguments["sessionId"])
+                session = session_manager.get_session(arguments["sessionId"], mark_read=True)
                 if not session:
                     return [TextContent(type="text", text=json.dumps({"error": "Session not found"}))]
 
-                if session.is_running():
-                    result = {
-                        "sessionId": session.session_id,
-                        "status": "running",
-                        "message": "Session is still running. Check status first.",
-                    }
-                elif session.status.value == "failed":
-                    result = {
-                        "sessionId": session.session_id,
-                        "status": "failed",
-                        "error": session.error,
-                    }
-                else:
-                    result = {
-                        "sessionId": session.session_id,
-                        "status": session.status.value,
-                        "rowCount": session.row_count,
-                        "results": session.results or "",
-                        "durationSeconds": session.duration_seconds(),
-                    }
+                # Reading results may touch the spill file, so it runs off the event loop
+                result = await db_service.run_blocking(_session_result, session, arguments)
                 return [TextContent(type="text", text=json.dumps(result, cls=EnhancedJSONEncoder))]
 
+            elif name == "fetch_next_page" and (config.enable_execute_query or config.enable_start_query):
+                page = await db_service.fetch_next_page(
+                    continuation_token=arguments["continuationToken"],
+                    max_rows=arguments.get("maxRows"),
+                    timeout_seconds=arguments.get("timeoutSeconds"),
+                )
+                if page.kind == "session":
+                    result = _session_page_result(page)
+                    return [TextContent(type="text", text=json.dumps(result, cls=EnhancedJSONEncoder))]
+
+                page_result = QueryResult(
+                    columns=page.columns,
+                    rows=page.rows,
+                    truncated=page.continuation_token is not None,
+                    continuation_token=page.continuation_token,
+                    page_number=page.page_number,
+                )
+                return [TextContent(type="text", text=_render_query_result(page_result, arguments))]
+
             elif name == "cancel_session" and config.enable_start_query:
                 cancelled = session_manager.cancel_session(arguments["sessionId"])
                 result = {
@@ -597,6 +975,7 @@ def create_server(config: DatabaseConfiguration) -> Server:
                     parameters=arguments.get("parameters", {}),
                     database_name=arguments.get("databaseName") if is_server_mode else None,
                     timeout_seconds=arguments.get("timeoutSeconds"),
+                    refresh_metadata=arguments.get("refreshMetadata", False),
                 )
                 result = {
                     "rowCount": len(results),
@@ -610,8 +989,9 @@ def create_server(config: DatabaseConfiguration) -> Server:
                     parameters=arguments.get("parameters", {}),
                     database_name=arguments.get("databaseName") if is_server_mode else None,
                     timeout_seconds=arguments.get("timeoutSeconds", 30),
+                    priority=_session_priority(arguments),
                 )
-                result = {"sessionId": session_id, "status": "started"}
+                result = {"sessionId": session_id, "status": _start_status(session_id)}
                 return [TextContent(type="text", text=json.dumps(result, cls=EnhancedJSONEncoder))]
 
             # Server capability detection
@@ -642,6 +1022,17 @@ def create_server(config: DatabaseConfiguration) -> Server:
                 }
                 return [TextContent(type="text", text=json.dumps(result, cls=EnhancedJSONEncoder))]
 
+            elif name == "get_runtime_statistics":
+                result = {
+                    "executor": db_service.executor_stats(),
+                    "connectionPool": db_service.pool_stats(),
+                    "metadataCache": db_service.metadata_cache_stats(),
+                    "queryResultCache": db_service.result_cache.stats(),
+                    "coalescing": db_service.coalescing_stats(),
+                    "sessions": session_manager.stats(),
+                }
+                return [TextContent(type="text", text=json.dumps(result, cls=EnhancedJSONEncoder))]
+
             # Advanced table metadata tools
             elif name == "get_table_indexes":
                 indexes = await db_service.get_table_indexes(
@@ -691,6 +1082,20 @@ def create_server(config: DatabaseConfiguration) -> Server:
                 }
                 return [TextContent(type="text", text=json.dumps(result, cls=EnhancedJSONEncoder))]
 
+            elif name == "describe_tables":
+                table_names = arguments.get("tableNames")
+                pattern = arguments.get("pattern")
+                descriptions, missing = await db_service.describe_tables(
+                    table_names=table_names,
+                    pattern=None if table_names is not None else pattern,
+                    database_name=arguments.get("databaseName") if is_server_mode else None,
+                )
+                truncated = table_names is None and len(descriptions) >= MAX_DESCRIBED_TABLES
+                return [TextContent(
+                    type="text",
+                    text=format_table_descriptions_json(descriptions, missing, truncated),
+                )]
+
             elif name == "get_table_statistics":
                 stats = await db_service.get_table_statistics(
                     table_name=arguments["tableName"],
@@ -714,17 +1119,21 @@ def create_server(config: DatabaseConfiguration) -> Server:
                 return [TextContent(type="text", text=format_database_list(databases))]
 
             elif name == "list_tables_in_database" and is_server_mode:
+                strategy = _row_count_strategy(arguments)
                 tables = await db_service.list_tables(
                     database_name=arguments["databaseName"],
                     timeout_seconds=arguments.get("timeoutSeconds"),
+                    row_count_strategy=strategy,
                 )
-                return [TextContent(type="text", text=format_table_list(tables))]
+                return [TextContent(type="text", text=format_table_list(tables, strategy))]
 
             elif name == "list_tables" and not is_server_mode:
+                strategy = _row_count_strategy(arguments)
                 tables = await db_service.list_tables(
-                    timeout_seconds=arguments.get("timeoutSeconds")
+                    timeout_seconds=arguments.get("timeoutSeconds"),
+                    row_count_strategy=strategy,
                 )
-                return [TextContent(type="text", text=format_table_list(tables))]
+                return [TextContent(type="text", text=format_table_list(tables, strategy))]
 
             elif name == "get_table_schema_in_database" and is_server_mode:
                 schema = await db_service.get_table_schema(
@@ -742,19 +1151,10 @@ def create_server(config: DatabaseConfiguration) -> Server:
                 return [TextContent(type="text", text=format_table_schema(schema))]
 
             elif name == "execute_query_in_database" and is_server_mode and config.enable_execute_query:
-                results = await db_service.execute_query(
-                    query=arguments["query"],
-                    database_name=arguments["databaseName"],
-                    timeout_seconds=arguments.get("timeoutSeconds"),
-                )
-                return [TextContent(type="text", text=format_query_results(results))]
+                return await _execute_query_tool(arguments, arguments["databaseName"])
 
             elif name == "execute_query" and not is_server_mode and config.enable_execute_query:
-                results = await db_service.execute_query(
-                    query=arguments["query"],
-                    timeout_seconds=arguments.get("timeoutSeconds"),
-                )
-                return [TextContent(type="text", text=format_query_results(results))]
+                return await _execute_query_tool(arguments, None)
 
             elif name == "list_stored_procedures_in_database" and is_server_mode:
                 procedures = await db_service.list_stored_procedures(
@@ -805,7 +1205,7 @@ def create_server(config: DatabaseConfiguration) -> Server:
             print(error_msg, file=sys.stderr)
             return [TextContent(type="text", text=error_msg)]
 
-    return server
+    return server, db_service
 
 
 async def main():
@@ -830,14 +1230,18 @@ async def main():
         )
 
         # Create and run server
-        server = create_server(config)
+        server, db_service = create_server(config)
 
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                server.create_initialization_options(),
-            )
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    server.create_initialization_options(),
+                )
+        finally:
+            # Release pooled connections, executor threads and the metadata file
+            db_service.close()
 
     except Exception as e:
         print(f"Fatal error: {e}", file=sys.stderr)
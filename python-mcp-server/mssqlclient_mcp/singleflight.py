@@ -0,0 +1,77 @@
+"""Coalescing of identical concurrent requests into one execution."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Shares one in-flight execution between concurrent callers with the same key.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task and receive its result or exception.
+    The task runs in the first caller's context, so its tool call deadline
+    bounds the shared statements; settings that change how the work runs,
+    such as a statement timeout, belong in the key. Callers that are
+    cancelled, for example when their own tool call deadline passes, stop
+    waiting without cancelling the work the others share.
+
+    Keys are only tracked while their work is running; nothing is cached
+    once it finishes. All methods must be called from the event loop thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty set of in-flight calls."""
+        self._calls: Dict[Hashable, asyncio.Task[Any]] = {}
+        self._executions = 0
+        self._coalesced = 0
+        self._coalesced_by_operation: Dict[str, int] = {}
+
+    async def run(
+        self, operation: str, key: Tuple[Hashable, ...], func: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Await func() once for all concurrent callers with the same key.
+
+        Args:
+            operation: Name of the operation, used for statistics and as
+                part of the key
+            key: Arguments that identify identical calls of the operation
+            func: Starts the work when no identical call is in flight
+
+        Returns:
+            The result of the shared execution
+        """
+        call_key = (operation, key)
+        task = self._calls.get(call_key)
+        if task is not None:
+            self._coalesced += 1
+            self._coalesced_by_operation[operation] = (
+                self._coalesced_by_operation.get(operation, 0) + 1
+            )
+        else:
+            task = asyncio.ensure_future(func())
+            self._calls[call_key] = task
+            self._executions += 1
+            task.add_done_callback(lambda _: self._forget(call_key, task))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, call_key: Hashable, task: "asyncio.Task[Any]") -> None:
+        """Drop a finished call so the next caller starts a fresh execution."""
+        if self._calls.get(call_key) is task:
+            del self._calls[call_key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every caller stopped waiting
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return execution and coalescing counters."""
+        return {
+            "inFlight": len(self._calls),
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "coalescedByOperation": dict(self._coalesced_by_operation),
+        }
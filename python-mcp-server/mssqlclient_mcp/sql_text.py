@@ -0,0 +1,222 @@
+"""Lightweight inspection of ad-hoc T-SQL text."""
+
+import re
+from typing import List, Optional
+
+# Comments, string literals and quoted identifiers, in the order T-SQL reads them
+_OPAQUE = re.compile(
+    r"""
+      --[^\n]*                 # line comment
+    | /\*.*?\*/                # block comment (nesting not supported)
+    | N?'(?:[^']|'')*'         # string literal, '' escapes a quote
+    | \[(?:[^\]]|\]\])*\]      # [bracketed identifier]
+    | "(?:[^"]|"")*"           # "quoted identifier"
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# One part of a possibly multi-part object name
+_NAME_PART = r'(?:\[(?:[^\]]|\]\])*\]|"(?:[^"]|"")*"|[A-Za-z_@#][A-Za-z0-9_@#$]*)'
+
+# Object named after FROM or JOIN (derived tables start with "(" and are skipped)
+_TABLE_REFERENCE = re.compile(
+    r"\b(?:FROM|JOIN)\s+(" + _NAME_PART + r"(?:\s*\.\s*" + _NAME_PART + r"){0,3})",
+    re.IGNORECASE,
+)
+
+_WORD = re.compile(r"[A-Za-z_@#][A-Za-z0-9_@#$]*")
+
+# Sources that read tables without naming them after FROM or JOIN:
+# derived tables, APPLY and table-valued function calls
+_UNNAMED_SOURCE = re.compile(r"\b(?:FROM|JOIN)\s*\(|\bAPPLY\b", re.IGNORECASE)
+
+_FROM = re.compile(r"\bFROM\b", re.IGNORECASE)
+
+# Tokens that matter when scanning a FROM clause for a comma-separated list
+_FROM_TOKEN = re.compile(r"[(),;]|[A-Za-z_@#][A-Za-z0-9_@#$]*")
+
+# Keywords that end a FROM clause
+_FROM_CLAUSE_END = frozenset(
+    {
+        "WHERE", "GROUP", "HAVING", "ORDER", "UNION", "EXCEPT", "INTERSECT",
+        "OPTION", "FOR", "WINDOW", "SELECT",
+    }
+)
+
+# Built-ins whose value differs between two runs of the same query
+_NONDETERMINISTIC_FUNCTIONS = frozenset(
+    {
+        "GETDATE", "GETUTCDATE", "SYSDATETIME", "SYSUTCDATETIME", "SYSDATETIMEOFFSET",
+        "CURRENT_TIMESTAMP", "NEWID", "NEWSEQUENTIALID", "RAND", "CRYPT_GEN_RANDOM",
+        "TABLESAMPLE", "CURRENT_USER", "SESSION_USER", "SYSTEM_USER", "USER_NAME",
+        "SUSER_NAME", "SUSER_SNAME", "HOST_NAME", "APP_NAME", "CONTEXT_INFO",
+        "SESSION_CONTEXT",
+    }
+)
+
+# Table created by CREATE TABLE or SELECT ... INTO (also matches INSERT INTO)
+_CREATED_TABLE = re.compile(
+    r"\b(?:CREATE\s+TABLE|INTO)\s+(" + _NAME_PART + r")", re.IGNORECASE
+)
+
+# Keywords that make a batch more than a single read-only SELECT. INTO
+# covers SELECT ... INTO, which SET ROWCOUNT would silently truncate.
+_NOT_A_PLAIN_SELECT = frozenset(
+    {
+        "INSERT", "UPDATE", "DELETE", "MERGE", "INTO", "EXEC", "EXECUTE",
+        "DECLARE", "SET", "CREATE", "ALTER", "DROP", "TRUNCATE", "USE", "GO",
+        "BEGIN", "COMMIT", "ROLLBACK", "GRANT", "REVOKE", "DENY", "RETURN",
+        "IF", "WHILE", "PRINT", "RAISERROR", "THROW", "BACKUP", "RESTORE", "DBCC",
+    }
+)
+
+
+def mask_opaque_text(sql: str, keep_identifiers: bool = False) -> str:
+    """
+    Blank out comments, string literals and (optionally) quoted identifiers.
+
+    Keywords inside them can then no longer be mistaken for statements.
+    Literals and identifiers keep placeholder text so tokens stay separated.
+    """
+
+    def replace(match: "re.Match[str]") -> str:
+        text = match.group(0)
+        if text.startswith(("--", "/*")):
+            return " "
+        if text.endswith("'"):
+            return "''"
+        return text if keep_identifiers else "[x]"
+
+    return _OPAQUE.sub(replace, sql)
+
+
+def normalize_query_text(sql: str) -> str:
+    """
+    Normalize query text for use as a cache key.
+
+    Comments are dropped, whitespace outside literals is collapsed and
+    keywords and identifiers are upper-cased. String literals keep their
+    exact text, so queries that differ only in a literal stay distinct.
+    """
+    parts = []
+    position = 0
+    for match in _OPAQUE.finditer(sql):
+        parts.append(_WHITESPACE.sub(" ", sql[position:match.start()].upper()))
+        text = match.group(0)
+        parts.append(" " if text.startswith(("--", "/*")) else text)
+        position = match.end()
+    parts.append(_WHITESPACE.sub(" ", sql[position:].upper()))
+
+    normalized = ""
+    for part in parts:
+        # Literals never end in whitespace, so this only merges runs of spaces
+        if normalized.endswith(" ") and part.startswith(" "):
+            part = part[1:]
+        normalized += part
+    return normalized.strip().rstrip(";").rstrip()
+
+
+def is_single_select(sql: str) -> bool:
+    """
+    Whether a batch is exactly one SELECT statement (optionally with a CTE).
+
+    Such a batch can be capped with SET ROWCOUNT without affecting writes.
+    Anything else, including multiple statements, SELECT ... INTO and
+    procedure calls, returns False.
+    """
+    masked = mask_opaque_text(sql).strip().rstrip(";").strip()
+    if not masked or ";" in masked:
+        return False
+
+    words = [word.upper() for word in _WORD.findall(masked)]
+    if not words or words[0] not in ("SELECT", "WITH"):
+        return False
+    return not any(word in _NOT_A_PLAIN_SELECT for word in words)
+
+
+def uses_nondeterministic_functions(sql: str) -> bool:
+    """
+    Whether a query calls a built-in whose value changes between runs.
+
+    Covers the date/time, random, identity and session functions and every
+    @@ variable. Functions hidden inside views or user-defined functions
+    cannot be seen.
+    """
+    for word in _WORD.findall(mask_opaque_text(sql)):
+        if word.startswith("@@") or word.upper() in _NONDETERMINISTIC_FUNCTIONS:
+            return True
+    return False
+
+
+def created_temp_tables(sql: str) -> List[str]:
+    """
+    Local temp tables a batch may create on its connection.
+
+    Returns:
+        Distinct #names as written, without brackets. Global ##tables are
+        left out, they are not owned by the connection.
+    """
+    masked = mask_opaque_text(sql, keep_identifiers=True)
+    names: List[str] = []
+    for match in _CREATED_TABLE.finditer(masked):
+        name = match.group(1)
+        if name.startswith("["):
+            name = name[1:-1].replace("]]", "]")
+        if name.startswith("#") and not name.startswith("##") and name not in names:
+            names.append(name)
+    return names
+
+
+def _has_comma_join(masked: str, start: int) -> bool:
+    """Whether the FROM clause starting at start lists sources separated by commas."""
+    depth = 0
+    for token in _FROM_TOKEN.finditer(masked, start):
+        text = token.group(0)
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            if depth == 0:
+                # End of the subquery the FROM clause belongs to
+                return False
+            depth -= 1
+        elif depth == 0:
+            if text == ",":
+                return True
+            if text == ";" or text.upper() in _FROM_CLAUSE_END:
+                return False
+    return False
+
+
+def referenced_tables(sql: str) -> Optional[List[str]]:
+    """
+    Names of the objects a query reads after FROM and JOIN.
+
+    Returns:
+        Distinct names as written (usable with OBJECT_ID), or None when the
+        query reads a temp table or table variable, whose contents are
+        private to one connection, or reads through a derived table, APPLY,
+        a table-valued function or a comma-separated FROM list, where not
+        every table read is listed
+    """
+    # Quoted identifiers are blanked here so commas inside them are not seen
+    structure = mask_opaque_text(sql)
+    if _UNNAMED_SOURCE.search(structure):
+        return None
+    if any(_has_comma_join(structure, match.end()) for match in _FROM.finditer(structure)):
+        return None
+
+    masked = mask_opaque_text(sql, keep_identifiers=True)
+    names: List[str] = []
+    for match in _TABLE_REFERENCE.finditer(masked):
+        if masked[match.end():].lstrip().startswith("("):
+            # Table-valued function call
+            return None
+        name = re.sub(r"\s*\.\s*", ".", match.group(1))
+        last_part = name.rsplit(".", 1)[-1].lstrip('["')
+        if last_part.startswith(("#", "@")):
+            return None
+        if name not in names:
+            names.append(name)
+    return names
@@ -0,0 +1,107 @@
+"""Timeout budgets for statements, background sessions and tool calls."""
+
+import contextvars
+import math
+import time
+from typing import Optional, Tuple
+
+import pyodbc
+
+# SQLSTATE the ODBC driver reports when a statement's query timeout expires
+QUERY_TIMEOUT_SQLSTATE = "HYT00"
+
+# Which limit ended an operation
+STATEMENT_LIMIT = "statement"
+SESSION_LIMIT = "session"
+TOOL_CALL_LIMIT = "tool_call"
+
+_LIMIT_SETTINGS = {
+    STATEMENT_LIMIT: "timeoutSeconds / DEFAULT_COMMAND_TIMEOUT_SECONDS",
+    SESSION_LIMIT: "session timeoutSeconds",
+    TOOL_CALL_LIMIT: "TOTAL_TOOL_CALL_TIMEOUT_SECONDS",
+}
+
+# (monotonic deadline, total budget) of the tool call being served, if any
+_tool_call_deadline: contextvars.ContextVar[Optional[Tuple[float, float]]] = contextvars.ContextVar(
+    "tool_call_deadline", default=None
+)
+
+# (limit, seconds) governing the statement timeout last applied in this context
+_statement_limit: contextvars.ContextVar[Optional[Tuple[str, float]]] = contextvars.ContextVar(
+    "statement_limit", default=None
+)
+
+
+class QueryTimeoutError(RuntimeError):
+    """Raised when a statement, session or tool call runs past its time limit."""
+
+    def __init__(self, limit: str, seconds: float):
+        self.limit = limit
+        self.seconds = seconds
+        super().__init__(
+            f"{limit.replace('_', ' ').capitalize()} timeout of {seconds:g}s exceeded "
+            f"({_LIMIT_SETTINGS[limit]})"
+        )
+
+
+def start_tool_call_deadline(seconds: float) -> contextvars.Token:
+    """
+    Start the overall budget for the current tool call.
+
+    Returns:
+        Token to pass to :func:`reset_tool_call_deadline`
+    """
+    return _tool_call_deadline.set((time.monotonic() + seconds, seconds))
+
+
+def reset_tool_call_deadline(token: contextvars.Token) -> None:
+    """Clear the budget started by :func:`start_tool_call_deadline`."""
+    _tool_call_deadline.reset(token)
+
+
+def bind_statement_timeout(seconds: int, limit: str = STATEMENT_LIMIT) -> int:
+    """
+    Work out the driver query timeout for the next statements.
+
+    The requested timeout is shortened to what is left of the tool call
+    budget, and the limit that ends up governing is remembered so a driver
+    timeout can be reported against it.
+
+    Args:
+        seconds: Requested timeout (0 for none)
+        limit: Limit the requested timeout comes from
+
+    Returns:
+        Timeout in whole seconds for Connection.timeout
+
+    Raises:
+        QueryTimeoutError: If the tool call budget is already spent
+    """
+    governing: Tuple[str, float] = (limit, seconds)
+    current = _tool_call_deadline.get()
+    if current is not None:
+        deadline, budget = current
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise QueryTimeoutError(TOOL_CALL_LIMIT, budget)
+        if seconds <= 0 or remaining < seconds:
+            seconds = max(1, math.ceil(remaining))
+            governing = (TOOL_CALL_LIMIT, budget)
+
+    _statement_limit.set(governing)
+    return seconds
+
+
+def is_query_timeout(error: BaseException) -> bool:
+    """Whether a driver error is a query timeout (SQLSTATE HYT00)."""
+    return (
+        isinstance(error, pyodbc.Error)
+        and bool(error.args)
+        and str(error.args[0]) == QUERY_TIMEOUT_SQLSTATE
+    )
+
+
+def statement_timeout_error() -> QueryTimeoutError:
+    """Describe a driver query timeout in terms of the limit that set it."""
+    limit, seconds = _statement_limit.get() or (STATEMENT_LIMIT, 0)
+    return QueryTimeoutError(limit, seconds)
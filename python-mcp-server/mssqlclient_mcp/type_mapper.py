@@ -1,8 +1,9 @@
-"""Type mapping utilities for converting Python types to SQL Server types."""
+"""Type mapping utilities for converting between Python and SQL Server types."""
 
 from decimal import Decimal
 from datetime import datetime, date, time
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Sequence, Union
+import functools
 import uuid
 
 
@@ -242,6 +243,89 @@ def validate_parameter(
         )
 
 
+def compile_parameter_plan(param_metadata: list) -> list[Callable[[dict[str, Any]], Any]]:
+    """
+    Compile per-parameter converters for a stored procedure's input parameters.
+
+    Type compatibility and conversion arguments are resolved once here, so
+    executing the procedure again only runs the bound converters.
+
+    Args:
+        param_metadata: List of StoredProcedureParameter objects with metadata
+
+    Returns:
+        List of converters, each taking the parameter dict and returning the
+        SQL-compatible value for one placeholder, in placeholder order
+    """
+    return [
+        _compile_parameter_converter(meta)
+        for meta in param_metadata
+        if meta.parameter_id > 0 and not meta.is_output
+    ]
+
+
+def _compile_parameter_converter(meta: Any) -> Callable[[dict[str, Any]], Any]:
+    """Build the converter for a single parameter."""
+    param_name = meta.parameter_name
+    sql_type = meta.data_type
+    sql_type_lower = sql_type.lower()
+    is_required = meta.is_required()
+    allows_null = meta.is_nullable or meta.has_default_value
+    compatible_types = tuple(
+        python_type
+        for python_type, sql_types in TYPE_MAPPING.items()
+        if sql_type_lower in sql_types
+    )
+    convert = functools.partial(
+        convert_python_to_sql,
+        sql_type=sql_type,
+        max_length=meta.max_length,
+        precision=meta.precision,
+        scale=meta.scale,
+    )
+
+    def converter(parameters: dict[str, Any]) -> Any:
+        # Check if parameter provided
+        if param_name not in parameters:
+            if is_required:
+                raise ValueError(
+                    f"Required parameter '{param_name}' not provided"
+                )
+            # Use default or None for optional parameters
+            return None
+
+        value = parameters[param_name]
+        if value is None:
+            if not allows_null:
+                raise ValueError(
+                    f"Parameter '{param_name}' cannot be NULL (not nullable and no default)"
+                )
+            return None
+
+        if not isinstance(value, compatible_types):
+            raise ValueError(
+                f"Parameter '{param_name}': Type {type(value).__name__} is not compatible "
+                f"with SQL type {sql_type}"
+            )
+
+        return convert(value)
+
+    return converter
+
+
+def apply_parameter_plan(
+    plan: list[Callable[[dict[str, Any]], Any]],
+    parameters: dict[str, Any],
+) -> list[Any]:
+    """
+    Convert a parameter dict to placeholder values using a compiled plan.
+
+    Raises:
+        ValueError: If required parameter missing or conversion fails
+    """
+    return [converter(parameters) for converter in plan]
+
+
 def convert_parameters_for_execution(
     parameters: dict[str, Any],
     param_metadata: list
@@ -296,3 +380,93 @@ def convert_parameters_for_execution(
         converted.append(converted_value)
 
     return converted
+
+
+# Converter applied to a non-NULL result value
+ValueConverter = Callable[[Any], Any]
+
+
+def _isoformat(value: Union[date, time]) -> str:
+    return value.isoformat()
+
+
+def _binary_to_hex(value: Any) -> str:
+    return "0x" + bytes(value).hex().upper()
+
+
+# Result column type code (Python type reported in cursor.description) ->
+# converter to a JSON-safe value. Types not listed are passed through:
+# str, int, float and bool as-is, Decimal kept exact (serialized as a
+# string by EnhancedJSONEncoder).
+RESULT_VALUE_CONVERTERS: dict[type, ValueConverter] = {
+    datetime: _isoformat,
+    date: _isoformat,
+    time: _isoformat,
+    bytes: _binary_to_hex,
+    bytearray: _binary_to_hex,
+    uuid.UUID: str,
+}
+
+
+def compile_value_converters(description: Sequence[Sequence[Any]]) -> list[Optional[ValueConverter]]:
+    """
+    Pick a converter for each result column from its cursor.description type code.
+
+    Args:
+        description: cursor.description of the current result set
+
+    Returns:
+        One converter per column, None for columns passed through unchanged
+    """
+    return [RESULT_VALUE_CONVERTERS.get(column[1]) for column in description]
+
+
+def compile_row_converter(
+    description: Sequence[Sequence[Any]],
+) -> Callable[[Sequence[Any]], tuple[Any, ...]]:
+    """
+    Compile a converter from driver rows to tuples of JSON-safe values.
+
+    Only columns that need conversion are visited per row; when no column
+    does, rows are converted with a plain tuple() call.
+
+    Args:
+        description: cursor.description of the current result set
+
+    Returns:
+        Callable taking a driver row and returning a tuple
+    """
+    active = [
+        (index, converter)
+        for index, converter in enumerate(compile_value_converters(description))
+        if converter is not None
+    ]
+    if not active:
+        return tuple
+
+    def convert_row(row: Sequence[Any]) -> tuple[Any, ...]:
+        values = list(row)
+        for index, converter in active:
+            value = values[index]
+            if value is not None:
+                values[index] = converter(value)
+        return tuple(values)
+
+    return convert_row
+
+
+def compile_text_row_converter(
+    description: Sequence[Sequence[Any]],
+) -> Callable[[Sequence[Any]], list[str]]:
+    """
+    Compile a converter from driver rows to cell text, with NULL for None.
+
+    Uses the same value converters as :func:`compile_row_converter`, so
+    text and JSON output agree on how values are written.
+    """
+    convert_row = compile_row_converter(description)
+
+    def convert_text(row: Sequence[Any]) -> list[str]:
+        return ["NULL" if value is None else str(value) for value in convert_row(row)]
+
+    return convert_text
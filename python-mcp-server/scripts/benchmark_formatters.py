@@ -0,0 +1,83 @@
+"""Micro-benchmark of query result formatting at 10k and 100k rows.
+
+Compares the current formatters against the previous implementation, which
+built the markdown table with `output += ...` and converted and truncated
+every cell with str() and slicing.
+
+Usage: python scripts/benchmark_formatters.py
+"""
+import os
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mssqlclient_mcp.formatters import render_query_results  # noqa: E402
+from mssqlclient_mcp.models import QueryResult  # noqa: E402
+
+COLUMNS = ["Id", "Name", "Amount", "CreatedAt", "Notes"]
+ROW_COUNTS = [10_000, 100_000]
+REPEAT = 3
+
+
+def make_result(row_count):
+    created = datetime(2024, 1, 1).isoformat()
+    rows = [
+        (
+            i,
+            f"customer-{i}",
+            Decimal(i) / 100,
+            created,
+            None if i % 7 == 0 else "x" * (i % 80),
+        )
+        for i in range(row_count)
+    ]
+    return QueryResult(columns=COLUMNS, rows=rows)
+
+
+def legacy_markdown(result):
+    output = "| " + " | ".join(result.columns) + " |\n"
+    output += "| " + " | ".join(["---" for _ in result.columns]) + " |\n"
+    for row in result.rows:
+        values = [str(value) for value in row]
+        values = [v[:50] + "..." if len(v) > 50 else v for v in values]
+        output += "| " + " | ".join(values) + " |\n"
+    output += f"\nTotal rows: {len(result.rows)}"
+    return output
+
+
+def best_of(func, *args):
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        text = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(text)
+
+
+def main():
+    print(f"{'Rows':>8} {'Formatter':<22} {'Best of 3 (ms)':>15} {'us/row':>8} {'Output (KB)':>12}")
+    print("-" * 70)
+    for row_count in ROW_COUNTS:
+        result = make_result(row_count)
+        cases = [
+            ("markdown (legacy)", legacy_markdown, (result,)),
+            ("markdown", render_query_results, (result, "markdown")),
+            ("tsv", render_query_results, (result, "tsv")),
+            ("json-columnar rows", render_query_results, (result, "json-columnar", "rows")),
+            ("json-columnar columns", render_query_results, (result, "json-columnar", "columns")),
+        ]
+        for label, func, args in cases:
+            seconds, size = best_of(func, *args)
+            print(
+                f"{row_count:>8} {label:<22} {seconds * 1000:>15.1f} "
+                f"{seconds * 1e6 / row_count:>8.2f} {size / 1024:>12.0f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
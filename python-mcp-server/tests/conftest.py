@@ -0,0 +1,38 @@
+"""Shared fixtures for the unit tests; none of them need a database."""
+
+import sys
+import types
+
+import pytest
+
+try:
+    import pyodbc  # noqa: F401
+except ImportError:
+    # pyodbc needs the unixODBC library just to import. The tests never open
+    # a connection, so its exception types and class names are enough.
+    _pyodbc = types.ModuleType("pyodbc")
+    _pyodbc.Error = type("Error", (Exception,), {})
+    _pyodbc.OperationalError = type("OperationalError", (_pyodbc.Error,), {})
+    _pyodbc.ProgrammingError = type("ProgrammingError", (_pyodbc.Error,), {})
+    _pyodbc.Connection = type("Connection", (), {})
+    _pyodbc.Cursor = type("Cursor", (), {})
+    _pyodbc.pooling = True
+    sys.modules["pyodbc"] = _pyodbc
+
+
+class Clock:
+    """Stand-in for a module's ``time`` import with a manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
@@ -0,0 +1,105 @@
+"""In-memory stand-ins for pyodbc connections and cursors."""
+
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import pyodbc
+
+# Answers a statement with (column names, rows); None for no result set
+Responder = Callable[[str, Tuple[Any, ...]], Optional[Tuple[List[str], List[Any]]]]
+
+
+def default_responder(sql: str, params: Tuple[Any, ...]) -> Optional[Tuple[List[str], List[Any]]]:
+    """Answer the DB_NAME() probe the pool sends to every new connection."""
+    if "DB_NAME()" in sql:
+        return ["name"], [("testdb",)]
+    return None
+
+
+class FakeCursor:
+    """Cursor serving rows produced by its connection's responder."""
+
+    def __init__(self, connection: "FakeConnection"):
+        self.connection = connection
+        self.description: Optional[List[Tuple[Any, ...]]] = None
+        self.cancelled = False
+        self.closed = False
+        self._rows: List[Any] = []
+
+    def execute(self, sql: str, *params: Any) -> "FakeCursor":
+        self.connection.executed.append((sql, params))
+        if self.connection.fail:
+            raise pyodbc.OperationalError("08S01", "Communication link failure")
+        result = self.connection.responder(sql, params)
+        if result is None:
+            self.description, self._rows = None, []
+        else:
+            columns, rows = result
+            self.description = [(name, str, None, None, None, None, True) for name in columns]
+            self._rows = list(rows)
+        return self
+
+    def fetchone(self) -> Any:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size: int) -> List[Any]:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def nextset(self) -> bool:
+        return False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeConnection:
+    """Connection recording every statement run on it."""
+
+    def __init__(self, responder: Responder = default_responder):
+        self.responder = responder
+        self.executed: List[Tuple[str, Sequence[Any]]] = []
+        self.timeout = 0
+        self.fail = False
+        self.closed = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    @property
+    def statements(self) -> List[str]:
+        return [sql for sql, _ in self.executed]
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        if self.fail:
+            raise pyodbc.OperationalError("08S01", "Communication link failure")
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeConnector:
+    """Connection factory for ConnectionPool that keeps every connection it opened."""
+
+    def __init__(self, responder: Responder = default_responder):
+        self.responder = responder
+        self.opened: List[FakeConnection] = []
+        self.databases: List[Optional[str]] = []
+
+    def __call__(self, database_name: Optional[str] = None) -> FakeConnection:
+        connection = FakeConnection(self.responder)
+        self.opened.append(connection)
+        self.databases.append(database_name)
+        return connection
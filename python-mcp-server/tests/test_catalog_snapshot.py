@@ -0,0 +1,178 @@
+"""Tests for catalog snapshot loading and incremental refresh."""
+
+from collections import namedtuple
+from datetime import datetime
+
+from mssqlclient_mcp.catalog_snapshot import (
+    COLUMNS_QUERY,
+    FOREIGN_KEYS_QUERY,
+    INDEXES_QUERY,
+    OBJECTS_QUERY,
+    PARAMETERS_QUERY,
+    CatalogSnapshotStore,
+    load_catalog_snapshot,
+    refresh_catalog_snapshot,
+)
+from tests.fakes import FakeConnection
+
+ObjectRow = namedtuple(
+    "ObjectRow", "ObjectId SchemaName ObjectName ObjectType CreateDate ModifyDate Owner"
+)
+ColumnRow = namedtuple("ColumnRow", "ObjectId COLUMN_NAME DATA_TYPE MAX_LENGTH IS_NULLABLE")
+ForeignKeyRow = namedtuple(
+    "ForeignKeyRow",
+    "ObjectId ForeignKeyName TableName ColumnName ReferencedTable ReferencedColumn "
+    "DeleteAction UpdateAction",
+)
+ParameterRow = namedtuple(
+    "ParameterRow",
+    "ObjectId ParameterName ParameterId DataType MaxLength Precision Scale IsOutput "
+    "HasDefaultValue DefaultValue IsNullable",
+)
+
+CREATED = datetime(2024, 1, 1)
+
+
+class Catalog:
+    """A database catalog served through a fake connection."""
+
+    def __init__(self):
+        self.objects = {}
+        self.columns = []
+        self.foreign_keys = []
+        self.parameters = []
+        self.detail_params = []
+        self.connection = FakeConnection(self.respond)
+
+    def add(self, object_id, name, object_type="U", modified=CREATED, columns=("id",)):
+        self.objects[object_id] = ObjectRow(
+            object_id, "dbo", name, object_type, CREATED, modified, "dbo"
+        )
+        self.columns = [row for row in self.columns if row.ObjectId != object_id]
+        self.columns += [ColumnRow(object_id, column, "int", "-1", "NO") for column in columns]
+
+    def drop(self, object_id):
+        del self.objects[object_id]
+        self.columns = [row for row in self.columns if row.ObjectId != object_id]
+
+    def respond(self, sql, params):
+        if sql == OBJECTS_QUERY:
+            return [], list(self.objects.values())
+
+        details = {
+            COLUMNS_QUERY: self.columns,
+            INDEXES_QUERY: [],
+            FOREIGN_KEYS_QUERY: self.foreign_keys,
+            PARAMETERS_QUERY: self.parameters,
+        }
+        for query, rows in details.items():
+            if sql.startswith(query.split("{object_filter}")[0]):
+                self.detail_params.append(params)
+                return [], [row for row in rows if not params or row.ObjectId in params]
+        return None
+
+    def cursor(self):
+        return self.connection.cursor()
+
+
+def _catalog():
+    catalog = Catalog()
+    catalog.add(1, "Customers", columns=("id", "name"))
+    catalog.add(2, "Orders", columns=("id", "customer_id"))
+    catalog.add(3, "Regions")
+    catalog.add(4, "usp_report", object_type="P", columns=())
+    catalog.foreign_keys = [
+        ForeignKeyRow(2, "FK_Orders_Customers", "dbo.Orders", "customer_id",
+                      "dbo.Customers", "id", "NO_ACTION", "NO_ACTION"),
+    ]
+    catalog.parameters = [
+        ParameterRow(4, "@from", 1, "date", 3, 10, 0, 0, 0, None, 1),
+    ]
+    return catalog
+
+
+def test_full_load_reads_every_detail():
+    catalog = _catalog()
+
+    snapshot = load_catalog_snapshot(catalog.cursor(), "Sales", "v1")
+
+    assert [t.name for t in snapshot.list_tables()] == ["Customers", "Orders", "Regions"]
+    assert [c.name for c in snapshot.table_schema("dbo.Orders", "dbo.orders").columns] == [
+        "id",
+        "customer_id",
+    ]
+    assert snapshot.table_foreign_keys("dbo.orders")[0].referenced_table == "dbo.Customers"
+    assert snapshot.procedure_parameters("dbo.usp_report")[0].parameter_name == "@from"
+    assert catalog.detail_params == [()] * 4
+
+
+def test_refresh_reloads_only_changed_objects():
+    catalog = _catalog()
+    snapshot = load_catalog_snapshot(catalog.cursor(), "Sales", "v1")
+    catalog.detail_params.clear()
+
+    catalog.add(3, "Regions", modified=datetime(2024, 2, 1), columns=("id", "code"))
+    catalog.add(5, "Products")
+    refreshed, reloaded = refresh_catalog_snapshot(catalog.cursor(), snapshot, "v2")
+
+    assert reloaded == 2
+    assert refreshed.schema_version == "v2"
+    assert set(catalog.detail_params) == {(3, 5)}
+    assert [c.name for c in refreshed.objects[3].columns] == ["id", "code"]
+    assert refreshed.objects[1] is snapshot.objects[1]
+    assert refreshed.objects[4] is snapshot.objects[4]
+    # The old snapshot is left untouched for callers still holding it
+    assert [c.name for c in snapshot.objects[3].columns] == ["id"]
+    assert 5 not in snapshot.objects
+
+
+def test_refresh_reloads_tables_referencing_a_dropped_table():
+    catalog = _catalog()
+    snapshot = load_catalog_snapshot(catalog.cursor(), "Sales", "v1")
+    catalog.detail_params.clear()
+
+    catalog.drop(1)
+    catalog.foreign_keys = []
+    refreshed, reloaded = refresh_catalog_snapshot(catalog.cursor(), snapshot, "v2")
+
+    assert reloaded == 1
+    assert 1 not in refreshed.objects
+    assert refreshed.objects[2] is not snapshot.objects[2]
+    assert refreshed.objects[2].foreign_keys == []
+    assert refreshed.find("dbo.customers", ("U",)) is None
+
+
+def test_refresh_notices_renames():
+    catalog = _catalog()
+    snapshot = load_catalog_snapshot(catalog.cursor(), "Sales", "v1")
+
+    catalog.add(3, "Areas")
+    refreshed, reloaded = refresh_catalog_snapshot(catalog.cursor(), snapshot, "v2")
+
+    assert reloaded == 1
+    assert refreshed.find("dbo.areas", ("U",)) is not None
+    assert refreshed.find("dbo.regions", ("U",)) is None
+
+
+def test_store_serves_current_version_and_counts_refreshes():
+    catalog = _catalog()
+    store = CatalogSnapshotStore()
+    first = load_catalog_snapshot(catalog.cursor(), "Sales", "v1")
+    store.put("srv", "sales", first)
+
+    assert store.get("srv", "sales", "v1") is first
+    assert store.get("srv", "sales", "v2") is None
+    assert store.latest("srv", "sales") is first
+
+    second, reloaded = refresh_catalog_snapshot(catalog.cursor(), first, "v2")
+    store.put("srv", "sales", second, reloaded)
+    stats = store.stats()
+    assert stats["loads"] == 1
+    assert stats["refreshes"] == 1
+
+
+def test_refresh_locks_are_per_database():
+    store = CatalogSnapshotStore()
+
+    assert store.refresh_lock("srv", "a") is store.refresh_lock("srv", "a")
+    assert store.refresh_lock("srv", "a") is not store.refresh_lock("srv", "b")
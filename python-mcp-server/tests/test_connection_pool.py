@@ -0,0 +1,232 @@
+"""Tests for the connection pool's borrow, return, eviction and reset policy."""
+
+import threading
+import time
+
+import pyodbc
+import pytest
+
+from mssqlclient_mcp import connection_pool
+from mssqlclient_mcp.connection_pool import (
+    RESET_CONNECTION_SQL,
+    RESET_TIMEOUT_SECONDS,
+    ConnectionPool,
+)
+from tests.fakes import FakeConnector
+
+
+def test_returned_connection_is_reused():
+    connect = FakeConnector()
+    pool = ConnectionPool(connect)
+
+    first = pool.acquire("Sales")
+    raw = first.raw
+    first.close()
+    second = pool.acquire("sales")
+
+    assert second.raw is raw
+    assert connect.databases == ["Sales"]
+    stats = pool.stats()
+    assert stats["created"] == 1
+    assert stats["reused"] == 1
+    assert stats["databases"]["sales"] == {"idle": 0, "inUse": 1}
+
+
+def test_databases_are_pooled_separately():
+    connect = FakeConnector()
+    pool = ConnectionPool(connect)
+
+    pool.acquire("a").close()
+    pool.acquire("b").close()
+
+    assert len(connect.opened) == 2
+    assert set(pool.stats()["databases"]) == {"a", "b"}
+
+
+def test_clean_return_only_rolls_back():
+    pool = ConnectionPool(FakeConnector())
+    conn = pool.acquire()
+    conn.timeout = 120
+    conn.close()
+
+    raw = conn.raw
+    assert raw.rollbacks == 1
+    assert raw.statements == ["SELECT DB_NAME()"]
+    assert raw.timeout == RESET_TIMEOUT_SECONDS
+
+
+def test_changed_state_is_reset_in_one_batch():
+    pool = ConnectionPool(FakeConnector())
+    conn = pool.acquire()
+    conn.mark_state_changed(["#work", "#o'dd]name"])
+    conn.close()
+
+    batch = conn.raw.statements[-1]
+    assert len(conn.raw.statements) == 2
+    assert batch.startswith(RESET_CONNECTION_SQL)
+    assert "IF OBJECT_ID(N'tempdb..[#work]') IS NOT NULL DROP TABLE [#work];" in batch
+    assert "IF OBJECT_ID(N'tempdb..[#o''dd]]name]') IS NOT NULL DROP TABLE [#o'dd]]name];" in batch
+    assert batch.endswith("USE [testdb];")
+
+
+def test_reset_on_return_resets_every_connection():
+    pool = ConnectionPool(FakeConnector(), reset_on_return=True)
+    conn = pool.acquire()
+    conn.close()
+
+    assert RESET_CONNECTION_SQL in conn.raw.statements[-1]
+
+
+def test_failed_reset_discards_connection():
+    connect = FakeConnector()
+    pool = ConnectionPool(connect)
+    conn = pool.acquire()
+    conn.mark_state_changed()
+    conn.raw.fail = True
+    conn.close()
+
+    assert conn.raw.closed
+    assert pool.stats()["discarded"] == 1
+    assert pool.acquire().raw is not conn.raw
+
+
+def test_invalidated_connection_is_discarded():
+    pool = ConnectionPool(FakeConnector())
+    conn = pool.acquire()
+    conn.invalidate()
+    conn.close()
+
+    assert conn.raw.closed
+    assert pool.stats()["databases"]["(default)"] == {"idle": 0, "inUse": 0}
+
+
+def test_close_is_idempotent():
+    pool = ConnectionPool(FakeConnector())
+    conn = pool.acquire()
+    conn.close()
+    conn.close()
+
+    assert pool.stats()["databases"]["(default)"] == {"idle": 1, "inUse": 0}
+
+
+def test_exhausted_pool_times_out():
+    pool = ConnectionPool(FakeConnector(), max_size=1, acquire_timeout_seconds=0)
+    pool.acquire()
+
+    with pytest.raises(RuntimeError, match="exhausted"):
+        pool.acquire()
+
+
+def test_failed_connect_releases_its_slot():
+    def refuse(database_name):
+        raise pyodbc.Error("28000", "login failed")
+
+    pool = ConnectionPool(refuse, max_size=1, acquire_timeout_seconds=0)
+    for _ in range(2):
+        with pytest.raises(pyodbc.Error, match="login failed"):
+            pool.acquire()
+
+
+def test_idle_connections_are_evicted(monkeypatch, clock):
+    monkeypatch.setattr(connection_pool, "time", clock)
+    pool = ConnectionPool(FakeConnector(), idle_timeout_seconds=60)
+    conn = pool.acquire()
+    conn.close()
+
+    clock.advance(30)
+    pool.maintain()
+    assert pool.stats()["evicted"] == 0
+
+    clock.advance(31)
+    pool.maintain()
+    assert pool.stats()["evicted"] == 1
+    assert conn.raw.closed
+
+
+def test_eviction_keeps_min_size(monkeypatch, clock):
+    monkeypatch.setattr(connection_pool, "time", clock)
+    pool = ConnectionPool(FakeConnector(), min_size=1, idle_timeout_seconds=60)
+    conn = pool.acquire()
+    conn.close()
+
+    clock.advance(120)
+    pool.maintain()
+
+    assert not conn.raw.closed
+    assert pool.stats()["databases"]["(default)"]["idle"] == 1
+
+
+def test_first_use_fills_to_min_size():
+    connect = FakeConnector()
+    pool = ConnectionPool(connect, min_size=3)
+    conn = pool.acquire("db")
+
+    deadline = time.monotonic() + 5
+    while pool.stats()["databases"]["db"]["idle"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert pool.stats()["databases"]["db"] == {"idle": 2, "inUse": 1}
+    assert connect.databases == ["db"] * 3
+    conn.close()
+
+
+def test_closed_pool_rejects_and_discards():
+    pool = ConnectionPool(FakeConnector())
+    conn = pool.acquire()
+    pool.close()
+    conn.close()
+
+    assert conn.raw.closed
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.acquire()
+
+
+def test_invalid_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        ConnectionPool(FakeConnector(), max_size=0)
+    with pytest.raises(ValueError):
+        ConnectionPool(FakeConnector(), min_size=3, max_size=2)
+
+
+def test_refilled_connections_queue_behind_older_ones(monkeypatch, clock):
+    monkeypatch.setattr(connection_pool, "time", clock)
+    pool = ConnectionPool(FakeConnector(), min_size=2, idle_timeout_seconds=60)
+    kept = pool.acquire()
+    broken = pool.acquire()
+    kept.close()
+    broken.invalidate()
+    broken.close()
+
+    clock.advance(10)
+    pool.maintain()
+
+    # Eviction scans from the left and stops at the first fresh connection
+    idle = pool._pools[""].idle
+    assert [item.connection for item in idle][0] is kept.raw
+    assert [item.idle_since for item in idle] == sorted(item.idle_since for item in idle)
+
+
+def test_evicted_connections_are_closed_outside_the_lock(monkeypatch, clock):
+    monkeypatch.setattr(connection_pool, "time", clock)
+    pool = ConnectionPool(FakeConnector(), idle_timeout_seconds=60)
+    conn = pool.acquire()
+    conn.close()
+    lock_free = []
+
+    def probe():
+        acquired = pool._condition.acquire(timeout=1)
+        lock_free.append(acquired)
+        if acquired:
+            pool._condition.release()
+
+    def close():
+        # Another thread must be able to take the pool lock meanwhile
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+
+    conn.raw.close = close
+    clock.advance(61)
+    pool.acquire().close()
+
+    assert lock_free == [True]
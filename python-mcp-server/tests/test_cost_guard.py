@@ -0,0 +1,73 @@
+"""Tests for estimated plan parsing and cost limits."""
+
+import pytest
+
+from mssqlclient_mcp.cost_guard import (
+    PlanEstimate,
+    QueryCostExceededError,
+    check_limits,
+    parse_showplan,
+)
+
+PLAN = """<?xml version="1.0" encoding="utf-16"?>
+<ShowPlanXML xmlns="http://schemas.microsoft.com/sqlserver/2004/07/showplan">
+  <BatchSequence><Batch><Statements>
+    <StmtSimple StatementSubTreeCost="{cost}" StatementEstRows="{rows}">
+      <QueryPlan>
+        <RelOp PhysicalOp="Hash Match" EstimateRows="{rows}" EstimatedTotalSubtreeCost="{cost}">
+          <Hash>
+            <RelOp PhysicalOp="Clustered Index Scan" EstimateRows="50000" EstimatedTotalSubtreeCost="8">
+              <IndexScan>
+                <Object Database="[db]" Schema="[dbo]" Table="[Orders]" Index="[PK_Orders]" />
+              </IndexScan>
+            </RelOp>
+            <RelOp PhysicalOp="Table Scan" EstimateRows="10" EstimatedTotalSubtreeCost="0.5">
+              <TableScan>
+                <Object Database="[db]" Schema="[dbo]" Table="[Regions]" />
+              </TableScan>
+            </RelOp>
+          </Hash>
+        </RelOp>
+      </QueryPlan>
+    </StmtSimple>
+  </Statements></Batch></BatchSequence>
+</ShowPlanXML>"""
+
+
+def test_operator_cost_excludes_its_inputs():
+    estimate = parse_showplan([PLAN.format(cost=12, rows=400)])
+
+    assert estimate.subtree_cost == 12
+    assert estimate.estimated_rows == 400
+    assert [(op.physical_op, op.object_name, op.cost) for op in estimate.top_operators] == [
+        ("Clustered Index Scan", "[dbo].[Orders].[PK_Orders]", 8),
+        ("Hash Match", None, 3.5),
+        ("Table Scan", "[dbo].[Regions]", 0.5),
+    ]
+
+
+def test_statements_are_summed_and_rows_take_the_largest():
+    estimate = parse_showplan([PLAN.format(cost=12, rows=400), PLAN.format(cost=10, rows=900)])
+
+    assert estimate.subtree_cost == 22
+    assert estimate.estimated_rows == 900
+    assert len(estimate.top_operators) == 5
+
+
+def test_limits_report_every_exceeded_bound():
+    estimate = PlanEstimate(subtree_cost=50, estimated_rows=2_000_000)
+
+    assert check_limits(estimate, 0, 0) == []
+    assert check_limits(estimate, 50, 2_000_000) == []
+    reasons = check_limits(estimate, 10, 1_000_000)
+
+    assert len(reasons) == 2
+    assert "QUERY_COST_MAX_SUBTREE_COST" in reasons[0]
+    assert "QUERY_COST_MAX_ESTIMATED_ROWS" in reasons[1]
+
+
+def test_rejection_names_the_top_operators():
+    estimate = parse_showplan([PLAN.format(cost=12, rows=400)])
+
+    with pytest.raises(QueryCostExceededError, match=r"Clustered Index Scan \[dbo\]\.\[Orders\]"):
+        raise QueryCostExceededError(estimate, check_limits(estimate, 1, 0))
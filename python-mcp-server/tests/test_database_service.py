@@ -0,0 +1,345 @@
+"""Tests for DatabaseService against in-memory connections."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from mssqlclient_mcp import database_service
+from mssqlclient_mcp.config import DatabaseConfiguration
+from mssqlclient_mcp.database_service import DatabaseService, SessionManager
+from mssqlclient_mcp.models import SessionPriority, SessionStatus, TableInfo
+from mssqlclient_mcp.timeouts import QueryTimeoutError
+from tests.fakes import FakeConnector, default_responder
+
+
+def make_service(monkeypatch, responder, **settings):
+    """DatabaseService whose pool opens fake connections answered by responder."""
+    connector = FakeConnector(
+        lambda sql, params: default_responder(sql, params) or responder(sql, params)
+    )
+    monkeypatch.setattr(
+        DatabaseService, "_connect", lambda self, database_name=None: connector(database_name)
+    )
+    service = DatabaseService(
+        DatabaseConfiguration(connection_string="Server=test;Database=testdb", **settings)
+    )
+    return service, connector
+
+
+def tables(*names):
+    return [
+        TableInfo(schema="dbo", name=name, create_date=datetime.min, modify_date=datetime.min)
+        for name in names
+    ]
+
+
+def table_name(sql):
+    """Unquoted table name at the end of a COUNT_BIG statement."""
+    return sql.rsplit("[", 1)[1].rstrip("]")
+
+
+async def test_exact_counts_run_on_several_connections(monkeypatch):
+    # Both counts must be in flight at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def responder(sql, params):
+        if "COUNT_BIG" in sql:
+            barrier.wait()
+            return ["n"], [(len(table_name(sql)),)]
+        return None
+
+    service, connector = make_service(monkeypatch, responder, exact_row_count_parallelism=2)
+    listed = tables("a", "bb", "ccc", "dddd")
+
+    await service._count_rows_exact(listed, timeout_seconds=10)
+
+    assert [table.row_count for table in listed] == [1, 2, 3, 4]
+    assert len(connector.opened) == 2
+    service.close()
+
+
+async def test_uncountable_tables_keep_no_row_count(monkeypatch):
+    def responder(sql, params):
+        if "[secret]" in sql:
+            raise database_service.pyodbc.ProgrammingError("42000", "permission denied")
+        if "COUNT_BIG" in sql:
+            return ["n"], [(7,)]
+        return None
+
+    service, _ = make_service(monkeypatch, responder)
+    listed = tables("open", "secret")
+
+    await service._count_rows_exact(listed, timeout_seconds=10)
+
+    assert [table.row_count for table in listed] == [7, None]
+    service.close()
+
+
+async def test_exact_counts_share_one_deadline(monkeypatch, clock):
+    monkeypatch.setattr(database_service, "time", clock)
+
+    def responder(sql, params):
+        if "COUNT_BIG" in sql:
+            clock.advance(6)
+            return ["n"], [(1,)]
+        return None
+
+    service, _ = make_service(monkeypatch, responder, exact_row_count_parallelism=1)
+    granted = []
+    get_connection = service._get_connection
+
+    def recording_get_connection(database_name=None, timeout_seconds=None, *args):
+        granted.append(timeout_seconds)
+        return get_connection(database_name, timeout_seconds, *args)
+
+    monkeypatch.setattr(service, "_get_connection", recording_get_connection)
+    listed = tables("a", "b", "c")
+
+    with pytest.raises(QueryTimeoutError) as raised:
+        await service._count_rows_exact(listed, timeout_seconds=10)
+
+    assert granted == [10, 4]
+    assert raised.value.seconds == 10
+    assert listed[2].row_count is None
+    service.close()
+
+
+def _failing_plan(sqlstate):
+    def responder(sql, params):
+        if sql.startswith("SELECT * FROM big"):
+            raise database_service.pyodbc.OperationalError(sqlstate, "plan failed")
+        return None
+
+    return responder
+
+
+async def test_cost_guard_rejects_queries_it_cannot_plan_in_time(monkeypatch):
+    service, _ = make_service(monkeypatch, _failing_plan("HYT00"), query_cost_guard=True)
+
+    with pytest.raises(QueryTimeoutError):
+        await service.check_query_cost("SELECT * FROM big", timeout_seconds=5)
+    service.close()
+
+
+async def test_cost_guard_lets_unplannable_batches_run(monkeypatch):
+    service, connector = make_service(monkeypatch, _failing_plan("42S02"), query_cost_guard=True)
+
+    assert await service.check_query_cost("SELECT * FROM big") is None
+    # The session must not be left returning plans
+    assert connector.opened[0].statements[-1] == "SET SHOWPLAN_XML OFF"
+    service.close()
+
+
+async def test_coalesced_describe_reports_each_callers_own_missing_names(monkeypatch):
+    service, _ = make_service(monkeypatch, lambda sql, params: None)
+    release = threading.Event()
+    calls = []
+
+    def describe(table_names, pattern, database_name, timeout_seconds):
+        calls.append(table_names)
+        release.wait(5)
+        return [], {"dbo.orders"}
+
+    monkeypatch.setattr(service, "_describe_matched_tables", describe)
+    first = asyncio.ensure_future(service.describe_tables(["Orders", "Lines"]))
+    second = asyncio.ensure_future(service.describe_tables(["dbo.LINES", "dbo.orders"]))
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert (await first)[1] == ["Lines"]
+    assert (await second)[1] == ["dbo.LINES"]
+    assert len(calls) == 1
+    service.close()
+
+
+def numbers(count):
+    """Responder answering any SELECT with count rows of one column."""
+
+    def responder(sql, params):
+        if "SELECT n FROM" in sql:
+            return ["n"], [(n,) for n in range(count)]
+        return None
+
+    return responder
+
+
+def test_execute_query_stops_reading_at_the_row_limit(monkeypatch):
+    service, _ = make_service(monkeypatch, numbers(10))
+
+    result = service.execute_query_sync("SELECT n FROM t", max_rows=3)
+
+    assert result.columns == ["n"]
+    assert [row[0] for row in result.rows] == [0, 1, 2]
+    assert result.truncated
+    assert result.row_limit == 3
+    service.close()
+
+
+def test_execute_query_exact_fit_is_not_truncated(monkeypatch):
+    service, _ = make_service(monkeypatch, numbers(3))
+
+    result = service.execute_query_sync("SELECT n FROM t", max_rows=3)
+
+    assert len(result.rows) == 3
+    assert not result.truncated
+    service.close()
+
+
+def test_server_row_cap_asks_for_one_row_past_the_limit(monkeypatch):
+    service, connector = make_service(monkeypatch, numbers(4))
+
+    result = service.execute_query_sync("SELECT n FROM t", max_rows=3, server_row_cap=True)
+
+    assert "SET ROWCOUNT 4; SELECT n FROM t" in connector.opened[0].statements
+    assert result.truncated
+    assert result.server_row_cap == 3
+    service.close()
+
+
+def test_server_row_cap_skips_batches_and_pagination(monkeypatch):
+    service, connector = make_service(monkeypatch, numbers(4), query_server_row_cap=True)
+
+    service.execute_query_sync("UPDATE t SET n = 0; SELECT n FROM t", max_rows=3)
+    paged = service.execute_query_sync("SELECT n FROM t", max_rows=3, paginate=True)
+
+    assert not any("ROWCOUNT 4" in sql for conn in connector.opened for sql in conn.statements)
+    assert paged.server_row_cap is None
+    service.close()
+
+
+def test_paginated_query_continues_from_its_token(monkeypatch):
+    service, connector = make_service(monkeypatch, numbers(5))
+
+    first = service.execute_query_sync("SELECT n FROM t", max_rows=2, paginate=True)
+    second = service.fetch_next_page_sync(first.continuation_token, max_rows=2)
+    last = service.fetch_next_page_sync(first.continuation_token, max_rows=10)
+
+    assert first.truncated
+    assert [row[0] for row in first.rows] == [0, 1]
+    assert [row[0] for row in second.rows] == [2, 3]
+    assert [row[0] for row in last.rows] == [4]
+    assert last.continuation_token is None
+    # The query ran once; later pages read the cursor it left open
+    assert connector.opened[0].statements.count("SELECT n FROM t") == 1
+    assert service.pager.stats()["open"] == 0
+    service.close()
+
+
+def test_unpaginated_query_returns_no_token(monkeypatch):
+    service, _ = make_service(monkeypatch, numbers(5))
+
+    result = service.execute_query_sync("SELECT n FROM t", max_rows=2)
+
+    assert result.continuation_token is None
+    assert service.pager.stats()["open"] == 0
+    service.close()
+
+
+def wait_until(predicate, timeout=5.0):
+    """Poll until predicate() holds; background sessions finish on other threads."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+class GatedQueries:
+    """Responder holding statements that mention 'slow' until released, recording run order."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.ran = []
+
+    def __call__(self, sql, params):
+        self.ran.append(sql)
+        if "slow" in sql:
+            self.gate.wait(5)
+        return ["n"], [(1,)]
+
+
+def make_sessions(monkeypatch, queries, max_workers=1, **settings):
+    service, connector = make_service(monkeypatch, queries, **settings)
+    return service, SessionManager(service, max_workers=max_workers), connector
+
+
+def test_sessions_past_the_limit_wait_in_a_bounded_queue(monkeypatch):
+    queries = GatedQueries()
+    service, sessions, _ = make_sessions(monkeypatch, queries, session_queue_max_length=1)
+
+    running = sessions.start_query("SELECT 'slow'")
+    waiting = sessions.start_query("SELECT 'next'")
+    with pytest.raises(RuntimeError, match="queue is full"):
+        sessions.start_query("SELECT 'rejected'")
+
+    assert sessions.get_session(waiting).status == SessionStatus.QUEUED
+    assert sessions.stats()["running"] == 1
+    assert sessions.stats()["queued"] == 1
+    assert len(sessions.list_sessions()) == 2
+
+    queries.gate.set()
+    wait_until(lambda: sessions.get_session(waiting).status == SessionStatus.COMPLETED)
+    assert sessions.get_session(running).status == SessionStatus.COMPLETED
+    assert sessions.stats()["running"] == 0
+    sessions.shutdown()
+    service.close()
+
+
+def test_cancel_interrupts_the_running_statement_at_the_driver(monkeypatch):
+    queries = GatedQueries()
+    service, sessions, _ = make_sessions(monkeypatch, queries)
+    session_id = sessions.start_query("SELECT 'slow'")
+    wait_until(lambda: "SELECT 'slow'" in queries.ran)
+    _, cursor = sessions._live[session_id]
+
+    assert sessions.cancel_session(session_id)
+    assert cursor.cancelled
+    assert not sessions.cancel_session(session_id)
+
+    # The fake driver returns once released; the cancel still stands
+    queries.gate.set()
+    wait_until(lambda: sessions.stats()["running"] == 0)
+    session = sessions.get_session(session_id)
+    assert session.status == SessionStatus.CANCELLED
+    assert session.cancel_latency_ms is not None
+    assert sessions.stats()["cancelled"] == 1
+    sessions.shutdown()
+    service.close()
+
+
+def test_cancelled_queued_session_never_runs(monkeypatch):
+    queries = GatedQueries()
+    service, sessions, _ = make_sessions(monkeypatch, queries)
+    running = sessions.start_query("SELECT 'slow'")
+    waiting = sessions.start_query("SELECT 'never'")
+
+    assert sessions.cancel_session(waiting)
+    assert sessions.stats()["queued"] == 0
+
+    queries.gate.set()
+    wait_until(lambda: sessions.get_session(running).status == SessionStatus.COMPLETED)
+    wait_until(lambda: sessions.stats()["running"] == 0)
+    assert "SELECT 'never'" not in queries.ran
+    assert sessions.get_session(waiting).status == SessionStatus.CANCELLED
+    sessions.shutdown()
+    service.close()
+
+
+def test_queued_sessions_start_in_priority_order(monkeypatch):
+    queries = GatedQueries()
+    service, sessions, _ = make_sessions(monkeypatch, queries)
+    sessions.start_query("SELECT 'slow'")
+    batch = sessions.start_query("SELECT 'batch'", priority=SessionPriority.BATCH)
+    interactive = sessions.start_query("SELECT 'interactive'", priority=SessionPriority.INTERACTIVE)
+
+    queries.gate.set()
+    wait_until(lambda: sessions.get_session(batch).status == SessionStatus.COMPLETED)
+
+    ran = [sql for sql in queries.ran if sql.startswith("SELECT '")]
+    assert ran == ["SELECT 'slow'", "SELECT 'interactive'", "SELECT 'batch'"]
+    assert sessions.get_session(interactive).queue_wait_seconds is not None
+    sessions.shutdown()
+    service.close()
@@ -0,0 +1,65 @@
+"""Tests for the bounded blocking executor."""
+
+import asyncio
+import threading
+
+import pytest
+
+from mssqlclient_mcp.executor import BlockingExecutor
+
+
+async def test_runs_blocking_work_off_the_loop():
+    executor = BlockingExecutor(max_workers=2, max_queue_depth=0)
+    try:
+        name = await executor.run(lambda: threading.current_thread().name)
+    finally:
+        executor.shutdown()
+
+    assert name.startswith("mssql-db")
+    assert executor.stats()["completed"] == 1
+
+
+async def test_rejects_work_past_queue_depth():
+    executor = BlockingExecutor(max_workers=1, max_queue_depth=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(RuntimeError, match="saturated"):
+            await executor.run(lambda: "rejected")
+
+        stats = executor.stats()
+        assert stats["active"] + stats["queued"] == 2
+        assert stats["rejected"] == 1
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+        assert await executor.run(lambda: "accepted") == "accepted"
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+async def test_propagates_exceptions():
+    executor = BlockingExecutor(max_workers=1)
+
+    def fail():
+        raise ValueError("bad input")
+
+    try:
+        with pytest.raises(ValueError, match="bad input"):
+            await executor.run(fail)
+    finally:
+        executor.shutdown()
+
+    assert executor.stats()["active"] == 0
+
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError):
+        BlockingExecutor(max_workers=0)
+    with pytest.raises(ValueError):
+        BlockingExecutor(max_queue_depth=-1)
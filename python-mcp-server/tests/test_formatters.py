@@ -0,0 +1,97 @@
+"""Tests for query result rendering."""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from mssqlclient_mcp.formatters import render_query_results
+from mssqlclient_mcp.models import QueryResult
+
+RESULT = QueryResult(
+    columns=["id", "name", "price"],
+    rows=[(1, "widget", Decimal("2.50")), (2, None, Decimal("10"))],
+)
+
+
+def test_json_rows_layout_names_columns_once():
+    payload = json.loads(render_query_results(RESULT, "json-columnar"))
+
+    assert payload["columns"] == ["id", "name", "price"]
+    # Decimals keep their exact digits as strings
+    assert payload["rows"] == [[1, "widget", "2.50"], [2, None, "10"]]
+    assert payload["rowCount"] == 2
+    assert payload["truncated"] is False
+    assert "continuationToken" not in payload
+
+
+def test_json_columns_layout_transposes_rows():
+    payload = json.loads(render_query_results(RESULT, "json-columnar", "columns"))
+
+    assert payload["columnValues"] == [[1, 2], ["widget", None], ["2.50", "10"]]
+    assert "rows" not in payload
+
+
+def test_json_columns_layout_of_an_empty_result():
+    empty = QueryResult(columns=["a", "b"], rows=[])
+
+    payload = json.loads(render_query_results(empty, "json-columnar", "columns"))
+
+    assert payload["columnValues"] == [[], []]
+
+
+def test_json_reports_pagination_and_server_cap():
+    paged = QueryResult(
+        columns=["n"], rows=[(1,)], truncated=True, continuation_token="t1", server_row_cap=1
+    )
+
+    payload = json.loads(render_query_results(paged, "json-columnar"))
+
+    assert payload["continuationToken"] == "t1"
+    assert payload["serverCapHit"] is True
+
+
+def test_tsv_marks_nulls_and_escapes_separators():
+    result = QueryResult(
+        columns=["a", "b"], rows=[("tab\there", None), ("line\nbreak", "back\\slash")]
+    )
+
+    lines = render_query_results(result, "tsv").split("\n")
+
+    assert lines[:3] == ["a\tb", "tab\\there\tNULL", "line\\nbreak\tback\\\\slash"]
+    assert lines[-1] == "Total rows: 2"
+
+
+def test_unknown_format_or_layout_is_rejected():
+    with pytest.raises(ValueError, match="Unknown output format"):
+        render_query_results(RESULT, "csv")
+    with pytest.raises(ValueError, match="Unknown JSON layout"):
+        render_query_results(RESULT, "json-columnar", "cells")
+
+
+def test_markdown_table_with_footer():
+    text = render_query_results(RESULT)
+
+    assert text.split("\n")[:4] == [
+        "| id | name | price |",
+        "| --- | --- | --- |",
+        "| 1 | widget | 2.50 |",
+        "| 2 | None | 10 |",
+    ]
+    assert text.endswith("Total rows: 2")
+
+
+def test_markdown_cells_keep_the_table_intact():
+    result = QueryResult(columns=["note"], rows=[("a|b",), ("two\r\nlines",), ("x" * 60,)])
+
+    cells = render_query_results(result).split("\n")[2:5]
+
+    assert cells == ["| a\\|b |", "| two lines |", "| " + "x" * 50 + "... |"]
+
+
+def test_markdown_reports_truncation_and_continuation():
+    truncated = QueryResult(columns=["n"], rows=[(1,)], truncated=True)
+    paged = QueryResult(columns=["n"], rows=[(1,)], truncated=True, continuation_token="t1")
+
+    assert render_query_results(truncated).endswith("(Truncated at 1 rows, more available)")
+    assert "Continuation token: t1" in render_query_results(paged)
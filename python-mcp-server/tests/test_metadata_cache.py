@@ -0,0 +1,69 @@
+"""Tests for the in-process metadata cache."""
+
+from mssqlclient_mcp import metadata_cache
+from mssqlclient_mcp.metadata_cache import MetadataCache
+
+
+def _key(name):
+    return ("srv", "db", "table_schema", name)
+
+
+def test_entries_are_bound_to_their_schema_version():
+    cache = MetadataCache()
+    cache.put(_key("a"), ["columns"], "v1")
+
+    assert cache.get(_key("a"), "v1") == ["columns"]
+    assert cache.get(_key("a"), "v2") is None
+    assert cache.get(_key("a"), "v1") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_past_byte_budget():
+    cache = MetadataCache(max_bytes=2500)
+    for name in "abc":
+        cache.put(_key(name), "x" * 1000, "v1")
+
+    # Two values fit; reading "b" makes "c" the next eviction candidate
+    assert cache.get(_key("a"), "v1") is None
+    assert cache.get(_key("b"), "v1") is not None
+    cache.put(_key("d"), "x" * 1000, "v1")
+
+    assert cache.get(_key("c"), "v1") is None
+    assert cache.get(_key("b"), "v1") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= 2500
+
+
+def test_value_larger_than_budget_is_not_cached():
+    cache = MetadataCache(max_bytes=100)
+    cache.put(_key("a"), "x" * 1000, "v1")
+
+    assert cache.get(_key("a"), "v1") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_replacing_an_entry_keeps_byte_count_exact():
+    cache = MetadataCache()
+    cache.put(_key("a"), "x" * 1000, "v1")
+    cache.put(_key("a"), "x" * 10, "v2")
+    single = MetadataCache()
+    single.put(_key("a"), "x" * 10, "v2")
+
+    assert cache.stats()["bytes"] == single.stats()["bytes"]
+
+
+def test_schema_version_is_trusted_for_validation_interval(monkeypatch, clock):
+    monkeypatch.setattr(metadata_cache, "time", clock)
+    cache = MetadataCache(validation_interval_seconds=5)
+    cache.record_version("srv", "db", "v1")
+
+    clock.advance(4)
+    assert cache.known_version("srv", "db") == "v1"
+    clock.advance(2)
+    assert cache.known_version("srv", "db") is None
+
+    cache.record_version("srv", "db", "v2")
+    cache.forget_version("srv", "db")
+    assert cache.known_version("srv", "db") is None
@@ -0,0 +1,139 @@
+"""Tests for the on-disk metadata cache file."""
+
+import os
+import sqlite3
+import stat
+from datetime import datetime
+
+import pytest
+
+from mssqlclient_mcp.catalog_snapshot import CatalogObject, CatalogSnapshot
+from mssqlclient_mcp.metadata_store import SNAPSHOT_KIND, PersistentMetadataStore
+from mssqlclient_mcp.models import (
+    ForeignKey,
+    StoredProcedureParameter,
+    TableColumnInfo,
+    TableIndex,
+    TableSchemaInfo,
+)
+
+MODIFIED = datetime(2024, 5, 6, 7, 8, 9, 123000)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PersistentMetadataStore(str(tmp_path / "cache" / "metadata.db"))
+    yield store
+    store.close()
+
+
+def _reopen(store):
+    store.close()
+    return PersistentMetadataStore(store.stats()["path"])
+
+
+def _snapshot():
+    orders = CatalogObject(
+        object_id=7,
+        schema_name="dbo",
+        name="Orders",
+        object_type="U",
+        create_date=MODIFIED,
+        modify_date=MODIFIED,
+        owner="dbo",
+        columns=[TableColumnInfo("id", "int", "-1", "NO")],
+        indexes=[TableIndex("PK_Orders", "CLUSTERED", True, True, False, ["id"])],
+        foreign_keys=[
+            ForeignKey("FK_Orders_Customers", "dbo.Orders", "customer_id", "dbo.Customers",
+                       "id", "NO_ACTION", "CASCADE"),
+        ],
+    )
+    return CatalogSnapshot("Sales", "v1", {7: orders})
+
+
+def test_values_round_trip_through_the_file(store):
+    schema = TableSchemaInfo("dbo.Orders", "Sales", "", [TableColumnInfo("id", "int", "-1", "NO")])
+    parameters = [
+        StoredProcedureParameter("@from", 1, "date", 3, 10, 0, False, True, None, True),
+    ]
+    store.put("srv", "sales", "table_schema", "dbo.orders", schema, "v1")
+    store.put("srv", "sales", "sp_parameters", "dbo.report", parameters, "v1")
+    store.put("srv", "sales", SNAPSHOT_KIND, "", _snapshot(), "v1")
+
+    reopened = _reopen(store)
+    try:
+        assert reopened.get("srv", "sales", "table_schema", "dbo.orders", "v1") == (schema, "v1")
+        assert reopened.get("srv", "sales", "sp_parameters", "dbo.report", "v1") == (parameters, "v1")
+
+        snapshot, version = reopened.get("srv", "sales", SNAPSHOT_KIND, "", None)
+        assert version == "v1"
+        assert snapshot.objects == _snapshot().objects
+        assert snapshot.find("dbo.orders", ("U",)).modify_date == MODIFIED
+    finally:
+        reopened.close()
+
+
+def test_values_are_only_served_for_their_version(store):
+    store.put("srv", "sales", "table_indexes", "dbo.t", [], "v1")
+
+    assert store.get("srv", "sales", "table_indexes", "dbo.t", "v2") is None
+    assert store.get("srv", "sales", "table_indexes", "dbo.t", None) == ([], "v1")
+
+
+def test_version_change_drops_older_entries_but_keeps_snapshot(store):
+    store.put("srv", "sales", "table_indexes", "dbo.a", [], "v1")
+    store.put("srv", "sales", SNAPSHOT_KIND, "", _snapshot(), "v1")
+    store.put("srv", "other", "table_indexes", "dbo.a", [], "v1")
+
+    store.put("srv", "sales", "table_indexes", "dbo.b", [], "v2")
+
+    assert store.get("srv", "sales", "table_indexes", "dbo.a", None) is None
+    assert store.get("srv", "sales", SNAPSHOT_KIND, "", None) is not None
+    assert store.get("srv", "other", "table_indexes", "dbo.a", None) is not None
+
+
+def test_unknown_stored_types_read_as_misses(store):
+    store.put("srv", "sales", "table_indexes", "dbo.t", [], "v1")
+    path = store.stats()["path"]
+    with sqlite3.connect(path) as db:
+        db.execute("""UPDATE metadata SET value = '{"__type__": "Popen", "args": "id"}'""")
+
+    assert store.get("srv", "sales", "table_indexes", "dbo.t", None) is None
+
+
+def test_unsupported_values_are_not_written(store):
+    store.put("srv", "sales", "table_indexes", "dbo.t", object(), "v1")
+
+    assert store.stats()["errors"] == 1
+    assert store.get("srv", "sales", "table_indexes", "dbo.t", None) is None
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_file_is_private_to_its_owner(store):
+    store.put("srv", "sales", "table_indexes", "dbo.t", [], "v1")
+    path = store.stats()["path"]
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_loose_permissions_are_tightened(tmp_path):
+    path = tmp_path / "metadata.db"
+    path.touch(mode=0o666)
+    os.chmod(path, 0o666)
+    store = PersistentMetadataStore(str(path))
+    store.get("srv", "sales", "table_indexes", "dbo.t", None)
+    store.close()
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_file_owned_by_another_user_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(tmp_path).st_uid + 1)
+    store = PersistentMetadataStore(str(tmp_path / "metadata.db"))
+
+    store.put("srv", "sales", "table_indexes", "dbo.t", [], "v1")
+    assert store.get("srv", "sales", "table_indexes", "dbo.t", None) is None
+    assert store.stats()["writes"] == 0
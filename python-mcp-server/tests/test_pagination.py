@@ -0,0 +1,180 @@
+"""Tests for continuation-token pagination."""
+
+import pytest
+
+from mssqlclient_mcp import pagination
+from mssqlclient_mcp.connection_pool import ConnectionPool
+from mssqlclient_mcp.pagination import (
+    CursorPageSource,
+    LinePageSource,
+    PageSource,
+    ResultPager,
+)
+from mssqlclient_mcp.result_store import ResultBuffer
+from tests.fakes import FakeConnector
+
+
+class ListSource(PageSource):
+    """Source serving rows from a list."""
+
+    columns = ["n"]
+
+    def __init__(self, count):
+        self.rows = list(range(count))
+        self.closed = False
+        self.timeouts = []
+
+    def fetch(self, max_rows, max_bytes=None):
+        page, self.rows = self.rows[:max_rows], self.rows[max_rows:]
+        return page, not self.rows
+
+    def bind_timeout(self, seconds):
+        self.timeouts.append(seconds)
+
+    def close(self):
+        self.closed = True
+
+
+def test_page_source_requires_fetch():
+    with pytest.raises(TypeError):
+        PageSource()
+
+
+def test_single_page_result_is_closed_without_token():
+    pager = ResultPager(page_max_rows=10)
+    source = ListSource(3)
+
+    page = pager.first_page(source)
+
+    assert page.rows == [0, 1, 2]
+    assert page.continuation_token is None
+    assert source.closed
+    assert pager.stats()["open"] == 0
+
+
+def test_pages_continue_until_exhausted():
+    pager = ResultPager(page_max_rows=2)
+    source = ListSource(5)
+
+    first = pager.first_page(source)
+    second = pager.next_page(first.continuation_token)
+    last = pager.next_page(second.continuation_token, max_rows=10)
+
+    assert [first.rows, second.rows, last.rows] == [[0, 1], [2, 3], [4]]
+    assert [first.page_number, second.page_number, last.page_number] == [1, 2, 3]
+    assert second.continuation_token == first.continuation_token
+    assert last.continuation_token is None
+    assert source.closed
+    with pytest.raises(ValueError, match="unknown or has expired"):
+        pager.next_page(first.continuation_token)
+
+
+def test_next_page_binds_the_callers_timeout():
+    pager = ResultPager(page_max_rows=1)
+    source = ListSource(3)
+    token = pager.first_page(source).continuation_token
+
+    pager.next_page(token)
+    pager.next_page(token, timeout_seconds=7)
+
+    assert source.timeouts == [7]
+
+
+def test_idle_results_expire_after_ttl(monkeypatch, clock):
+    monkeypatch.setattr(pagination, "time", clock)
+    pager = ResultPager(page_max_rows=1, ttl_seconds=60)
+    source = ListSource(5)
+    token = pager.first_page(source).continuation_token
+
+    clock.advance(59)
+    pager.next_page(token)
+    clock.advance(59)
+    assert pager.expire_idle() == 0
+
+    clock.advance(2)
+    assert pager.expire_idle() == 1
+    assert source.closed
+    assert pager.stats()["expired"] == 1
+    with pytest.raises(ValueError):
+        pager.next_page(token)
+
+
+def test_oldest_result_is_closed_past_max_open():
+    pager = ResultPager(page_max_rows=1, max_open=2)
+    sources = [ListSource(3) for _ in range(3)]
+    tokens = [pager.first_page(source).continuation_token for source in sources]
+
+    assert [source.closed for source in sources] == [True, False, False]
+    with pytest.raises(ValueError):
+        pager.next_page(tokens[0])
+    assert pager.next_page(tokens[2]).rows == [1]
+
+
+def test_failed_fetch_closes_the_source():
+    class Failing(ListSource):
+        def fetch(self, max_rows, max_bytes=None):
+            if self.rows and self.rows[0] > 0:
+                raise RuntimeError("connection lost")
+            return super().fetch(max_rows, max_bytes)
+
+    pager = ResultPager(page_max_rows=1)
+    source = Failing(3)
+    token = pager.first_page(source).continuation_token
+
+    with pytest.raises(RuntimeError):
+        pager.next_page(token)
+    assert source.closed
+    assert pager.stats()["open"] == 0
+
+
+def _cursor_source(rows, batch_size=500):
+    connect = FakeConnector(lambda sql, params: (["n"], [(n,) for n in rows]))
+    conn = ConnectionPool(connect).acquire()
+    cursor = conn.cursor().execute("SELECT n FROM t")
+    return conn, cursor, CursorPageSource(conn, cursor, ["n"], lambda row: row[0], batch_size)
+
+
+def test_cursor_source_peeks_for_the_next_page():
+    conn, cursor, source = _cursor_source(range(4), batch_size=3)
+
+    assert source.fetch(2) == ([0, 1], False)
+    assert source.fetch(2) == ([2, 3], True)
+    source.close()
+
+    assert not cursor.cancelled
+
+
+def test_cursor_source_cancels_an_unread_result():
+    conn, cursor, source = _cursor_source(range(10))
+    source.fetch(2)
+    source.bind_timeout(9)
+    assert conn.raw.timeout == 9
+
+    source.close()
+    assert cursor.cancelled
+    assert not conn.raw.closed
+
+
+def test_cursor_source_respects_byte_budget():
+    conn, cursor, source = _cursor_source(["x" * 100] * 10)
+
+    rows, exhausted = source.fetch(10, max_bytes=250)
+
+    assert len(rows) == 3
+    assert not exhausted
+
+
+def test_line_source_reads_session_results():
+    buffer = ResultBuffer()
+    for n in range(5):
+        buffer.append_line(f"line {n}")
+    pager = ResultPager(page_max_rows=3)
+
+    first = pager.first_page(LinePageSource("s1", buffer))
+    last = pager.next_page(first.continuation_token)
+
+    assert first.kind == "session"
+    assert first.session_id == "s1"
+    assert first.rows == ["line 0", "line 1", "line 2"]
+    assert last.rows == ["line 3", "line 4"]
+    assert last.continuation_token is None
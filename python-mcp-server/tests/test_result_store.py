@@ -0,0 +1,81 @@
+"""Tests for session result buffers."""
+
+import os
+
+import pytest
+
+from mssqlclient_mcp.result_store import ByteCounter, ResultBuffer
+
+
+def test_lines_stay_in_memory_below_threshold():
+    buffer = ResultBuffer(spill_threshold_bytes=1024)
+    buffer.append_line("a\tb")
+    buffer.append_line("c\td")
+
+    assert not buffer.spilled
+    assert buffer.line_count == 2
+    assert buffer.size_bytes == 8
+    assert buffer.getvalue() == "a\tb\nc\td"
+
+
+def test_lines_spill_to_a_file_past_threshold(tmp_path):
+    buffer = ResultBuffer(spill_threshold_bytes=64, spill_directory=str(tmp_path))
+    lines = [f"row {n}\tvalue" for n in range(20)]
+    for line in lines:
+        buffer.append_line(line)
+
+    assert buffer.spilled
+    assert len(os.listdir(tmp_path)) == 1
+    assert buffer.read_lines(0, 3) == lines[:3]
+    assert buffer.read_lines(18, 10) == lines[18:]
+    assert buffer.read_lines(25, 5) == []
+
+    buffer.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_read_lines_keeps_embedded_newlines():
+    buffer = ResultBuffer(spill_threshold_bytes=0)
+    buffer.append_line("first\nsecond")
+    buffer.append_line("café")
+
+    assert buffer.read_lines(0, 2) == ["first\nsecond", "café"]
+    assert buffer.read_lines(1, 1) == ["café"]
+
+
+def test_reads_see_lines_appended_after_spill(tmp_path):
+    buffer = ResultBuffer(spill_threshold_bytes=0, spill_directory=str(tmp_path))
+    buffer.append_line("one")
+    assert buffer.read_lines(0, 1) == ["one"]
+
+    buffer.append_line("two")
+    assert buffer.read_lines(0, 2) == ["one", "two"]
+    buffer.close()
+
+
+def test_closed_buffer_rejects_access():
+    buffer = ResultBuffer()
+    buffer.append_line("x")
+    buffer.close()
+    buffer.close()
+
+    assert buffer.closed
+    with pytest.raises(RuntimeError):
+        buffer.read_lines(0, 1)
+    with pytest.raises(RuntimeError):
+        buffer.append_line("y")
+
+
+def test_usage_counter_tracks_open_buffers():
+    usage = ByteCounter()
+    first = ResultBuffer(usage=usage)
+    second = ResultBuffer(spill_threshold_bytes=0, usage=usage)
+    first.append_line("abc")
+    second.append_line("defgh")
+
+    assert usage.total == 10
+
+    second.close()
+    assert usage.total == 4
+    first.close()
+    assert usage.total == 0
@@ -0,0 +1,94 @@
+"""Tests for background session scheduling."""
+
+from mssqlclient_mcp import scheduler
+from mssqlclient_mcp.models import SessionPriority
+from mssqlclient_mcp.scheduler import CostHistory, SessionScheduler
+
+INTERACTIVE = SessionPriority.INTERACTIVE
+NORMAL = SessionPriority.NORMAL
+BATCH = SessionPriority.BATCH
+
+
+def test_higher_priority_runs_first(monkeypatch, clock):
+    monkeypatch.setattr(scheduler, "time", clock)
+    sessions = SessionScheduler()
+    sessions.enqueue("batch", BATCH, "db")
+    sessions.enqueue("normal", NORMAL, "db")
+    sessions.enqueue("interactive", INTERACTIVE, "db")
+
+    assert [sessions.pop_next() for _ in range(3)] == ["interactive", "normal", "batch"]
+    assert sessions.pop_next() is None
+
+
+def test_waiting_sessions_age_into_higher_classes(monkeypatch, clock):
+    monkeypatch.setattr(scheduler, "time", clock)
+    sessions = SessionScheduler(aging_seconds=30)
+    sessions.enqueue("batch", BATCH, "db")
+    clock.advance(61)
+    sessions.enqueue("interactive", INTERACTIVE, "db")
+
+    # Two aging intervals lift batch to interactive; it was queued first
+    assert sessions.pop_next() == "batch"
+
+
+def test_aging_below_one_interval_does_not_promote(monkeypatch, clock):
+    monkeypatch.setattr(scheduler, "time", clock)
+    sessions = SessionScheduler(aging_seconds=30)
+    sessions.enqueue("batch", BATCH, "db")
+    clock.advance(29)
+    sessions.enqueue("normal", NORMAL, "db")
+
+    assert sessions.pop_next() == "normal"
+
+
+def test_databases_take_turns(monkeypatch, clock):
+    monkeypatch.setattr(scheduler, "time", clock)
+    sessions = SessionScheduler(aging_seconds=0)
+    for n in range(3):
+        sessions.enqueue(f"a{n}", NORMAL, "A")
+        clock.advance(1)
+    sessions.enqueue("b0", NORMAL, "B")
+
+    assert [sessions.pop_next() for _ in range(3)] == ["a0", "b0", "a1"]
+
+
+def test_per_database_cap_skips_busy_database(monkeypatch, clock):
+    monkeypatch.setattr(scheduler, "time", clock)
+    sessions = SessionScheduler(max_per_database=1)
+    sessions.enqueue("a0", INTERACTIVE, "A")
+    sessions.enqueue("a1", INTERACTIVE, "a")
+    sessions.enqueue("b0", BATCH, "B")
+
+    assert sessions.pop_next() == "a0"
+    assert sessions.pop_next() == "b0"
+    assert sessions.pop_next() is None
+    assert sessions.stats()["runningByDatabase"] == {"a": 1, "b": 1}
+
+    sessions.finished("A")
+    assert sessions.pop_next() == "a1"
+
+
+def test_removed_session_is_not_scheduled():
+    sessions = SessionScheduler()
+    sessions.enqueue("a", NORMAL, None)
+    sessions.enqueue("b", NORMAL, None)
+
+    assert sessions.remove("a")
+    assert not sessions.remove("a")
+    assert len(sessions) == 1
+    assert sessions.pop_next() == "b"
+
+
+def test_cost_history_classifies_by_smoothed_run_time():
+    history = CostHistory()
+    key = CostHistory.key("query", "SELECT  *\nFROM t")
+
+    assert key == CostHistory.key("query", "select * from t")
+    assert history.classify(key, 1.0, 60.0) == NORMAL
+
+    history.record(key, 0.5)
+    assert history.classify(key, 1.0, 60.0) == INTERACTIVE
+
+    history.record(key, 200.0)
+    assert history.estimate(key) == 0.5 + CostHistory.SMOOTHING * 199.5
+    assert history.classify(key, 1.0, 60.0) == BATCH
@@ -0,0 +1,98 @@
+"""Tests for coalescing of identical concurrent calls."""
+
+import asyncio
+
+import pytest
+
+from mssqlclient_mcp.singleflight import SingleFlight
+
+
+async def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "rows"
+
+    waiters = [asyncio.ensure_future(flight.run("query", ("q",), work)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["rows"] * 3
+    assert calls == 1
+    stats = flight.stats()
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 2
+    assert stats["coalescedByOperation"] == {"query": 2}
+    assert stats["inFlight"] == 0
+
+
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def work(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        flight.run("query", ("q", 30), lambda: work(1)),
+        flight.run("query", ("q", 60), lambda: work(2)),
+        flight.run("schema", ("q", 30), lambda: work(3)),
+    )
+
+    assert results == [1, 2, 3]
+    assert flight.stats()["coalesced"] == 0
+
+
+async def test_finished_calls_are_not_cached():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.run("query", ("q",), work) == 1
+    assert await flight.run("query", ("q",), work) == 2
+
+
+async def test_errors_reach_every_caller():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        raise RuntimeError("deadlock victim")
+
+    waiters = [asyncio.ensure_future(flight.run("query", ("q",), work)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+
+    for waiter in waiters:
+        with pytest.raises(RuntimeError, match="deadlock victim"):
+            await waiter
+
+
+async def test_cancelled_caller_leaves_shared_work_running():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "done"
+
+    impatient = asyncio.ensure_future(flight.run("query", ("q",), work))
+    patient = asyncio.ensure_future(flight.run("query", ("q",), work))
+    await asyncio.sleep(0)
+
+    impatient.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await impatient
+
+    release.set()
+    assert await patient == "done"
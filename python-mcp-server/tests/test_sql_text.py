@@ -0,0 +1,98 @@
+"""Tests for ad-hoc T-SQL inspection."""
+
+from mssqlclient_mcp.sql_text import (
+    created_temp_tables,
+    is_single_select,
+    normalize_query_text,
+    referenced_tables,
+    uses_nondeterministic_functions,
+)
+
+
+def test_normalize_collapses_layout_and_case():
+    assert normalize_query_text("select *\n  from  dbo.t -- note\n;") == "SELECT * FROM DBO.T"
+    assert normalize_query_text("SELECT /* a */ 1") == normalize_query_text("select 1")
+
+
+def test_normalize_keeps_literals_and_quoted_names_exact():
+    assert normalize_query_text("select 'a  b' from [My  Table]") == "SELECT 'a  b' FROM [My  Table]"
+    assert normalize_query_text("select 'x'") != normalize_query_text("select 'X'")
+
+
+def test_normalize_ignores_keywords_in_comments_and_literals():
+    assert normalize_query_text("select '--not a comment' as c") == "SELECT '--not a comment' AS C"
+
+
+def test_referenced_tables_lists_from_and_join_targets():
+    sql = """
+        SELECT o.id
+        FROM dbo.Orders o
+        JOIN [Sales] . [dbo].[Order Lines] l ON l.order_id = o.id
+        LEFT JOIN dbo.Regions r WITH (NOLOCK) ON r.id IN (o.region_id, 0)
+        WHERE o.note <> 'FROM a, b' AND o.id IN (SELECT order_id FROM dbo.Flags)
+        ORDER BY o.id, l.line
+    """
+
+    assert referenced_tables(sql) == [
+        "dbo.Orders",
+        "[Sales].[dbo].[Order Lines]",
+        "dbo.Regions",
+        "dbo.Flags",
+    ]
+
+
+def test_referenced_tables_are_distinct():
+    assert referenced_tables("SELECT * FROM t JOIN t t2 ON 1 = 1") == ["t"]
+
+
+def test_referenced_tables_refuse_private_tables():
+    assert referenced_tables("SELECT * FROM #work") is None
+    assert referenced_tables("SELECT * FROM t JOIN @ids i ON i.id = t.id") is None
+    assert referenced_tables("SELECT * FROM [#work]") is None
+
+
+def test_referenced_tables_refuse_comma_joins():
+    assert referenced_tables("SELECT * FROM dbo.a, dbo.b") is None
+    assert referenced_tables("SELECT * FROM dbo.a x WITH (NOLOCK), dbo.b y WHERE x.id = y.id") is None
+    assert referenced_tables("SELECT (SELECT MAX(id) FROM c, d) AS m FROM a") is None
+    assert referenced_tables("SELECT a, b FROM [x, y]") == ["[x, y]"]
+
+
+def test_referenced_tables_refuse_apply_and_functions():
+    assert referenced_tables("SELECT * FROM a x CROSS APPLY dbo.fn(x.id)") is None
+    assert referenced_tables("SELECT * FROM a x OUTER APPLY (SELECT * FROM b) y") is None
+    assert referenced_tables("SELECT * FROM dbo.fn(1)") is None
+    assert referenced_tables("SELECT * FROM a JOIN OPENJSON(@j) j ON 1 = 1") is None
+
+
+def test_referenced_tables_refuse_derived_tables():
+    assert referenced_tables("SELECT * FROM (SELECT id FROM dbo.a) d") is None
+    assert referenced_tables("SELECT * FROM a LEFT JOIN (SELECT id FROM b) d ON d.id = a.id") is None
+
+
+def test_single_select_detection():
+    assert is_single_select("WITH x AS (SELECT 1 AS a) SELECT a FROM x;")
+    assert is_single_select("SELECT 'DELETE FROM t' AS text")
+    assert not is_single_select("SELECT * INTO #copy FROM t")
+    assert not is_single_select("SELECT 1; SELECT 2")
+    assert not is_single_select("EXEC dbo.report")
+
+
+def test_nondeterministic_functions_are_detected():
+    assert uses_nondeterministic_functions("SELECT GETDATE()")
+    assert uses_nondeterministic_functions("SELECT @@SPID")
+    assert uses_nondeterministic_functions("SELECT TOP 1 * FROM t ORDER BY newid()")
+    assert not uses_nondeterministic_functions("SELECT 'GETDATE()' FROM t")
+    assert not uses_nondeterministic_functions("SELECT created_date FROM t")
+
+
+def test_created_temp_tables():
+    sql = """
+        CREATE TABLE #a (id INT);
+        SELECT * INTO [#b] FROM t;
+        INSERT INTO #a VALUES (1);
+        CREATE TABLE ##shared (id INT);
+        INSERT INTO dbo.log VALUES ('CREATE TABLE #c')
+    """
+
+    assert created_temp_tables(sql) == ["#a", "#b"]